@@ -7,164 +7,548 @@ The Cable Orientation is calculate from North azimuth (NAz) - clockwise directio
 """
 
 import os
+import sys
+import multiprocessing
+from functools import partial
 import arcpy
-import zipfile
+import numpy as np
 import pandas as pd
-from arcpy import metadata as md
-
-#------------ Inputs
-# Define input parameters fetched from the user or other sources
-points_layer = arcpy.GetParameterAsText(0)
-wtg_name = arcpy.GetParameterAsText(1)
-x = arcpy.GetParameterAsText(2)
-y = arcpy.GetParameterAsText(3)
-cable_layer = arcpy.GetParameterAsText(4)
-buffer_size = arcpy.GetParameterAsText(5)
-output_folder = arcpy.GetParameterAsText(6)
-temp_geodatabase_name = "temp.gdb"
-
-arcpy.AddMessage(output_folder)
-
-# Create the in-memory geodatabase
-arcpy.CreateFileGDB_management(output_folder, temp_geodatabase_name)
-
-# Set workspace to the in-memory geodatabase
-arcpy.env.workspace = output_folder + "\\" + temp_geodatabase_name
-
-# -----Check Inputs
-if not os.path.exists(output_folder):
-     arcpy.AddMessage("Output Folder Does not Exit, please create a folder.")
-if arcpy.Exists(points_layer):
-    arcpy.AddMessage("WTG Feature layer exists.")
-else:
-    arcpy.AddMessage("WTGFeature layer does not exist.")
-if arcpy.Exists(cable_layer):
-    arcpy.AddMessage("Cable Feature layer exists.")
-else:
-    arcpy.AddMessage("Cable Feature layer does not exist.")
-    
-#----- 1) Create a buffer around the WTG points
-buffer_size_meters =  buffer_size + " Meters"
-buffer_output= "Buffer_"+ buffer_size.replace(" ", "_")
-arcpy.AddMessage("1) Establishing buffer zones around the WTG points")
-arcpy.Buffer_analysis(points_layer, buffer_output, buffer_size_meters)
-
-#----- 2) Set up field mapping for spatial join between Cables and WTG
-arcpy.AddMessage("2) Spatial join between Cables and WTG buffer zones")
-# Add a new text field with 255 characters
-new_field_name = "FromTo"
-# Check if the field already exists and delete it if found
-existing_fields = [field.name for field in arcpy.ListFields(buffer_output)]
-if new_field_name in existing_fields:
-     arcpy.DeleteField_management(buffer_output, new_field_name)
+from cable_angles import JTUBE_MIN_SEPARATION, angle_statistics, first_last_vertices, orientation_kernel
+from instrumentation import RunReport, report_path, span
+from layout_store import LayoutStore, is_layout_store, read_points
+from layout_diff import changed_keys
+from orientation_cache import CACHE_FOLDER, OrientationCache, orientation_key
+from orientation_engine import orient_cables_sweep
+from scratch_workspace import AUTO, ScratchWorkspace, is_out_of_memory
+from spatial_index import GridIndex
+from tiled_orientation import orient_cables_tiled
+
+# Fields of the Angle feature class after Start, End and the WTG X/Y fields
+ANGLE_FIELDS = ["X1", "Y1", "X2", "Y2", "AngleFromNorth", "Radius"]
+
+# Names of the Angle fields in the exported shapefile
+SHAPEFILE_FIELD_NAMES = {"AngleFromNorth": "AngleFromN"}
+
+# Rough size of the intermediates (buffer, join, intersect) per input feature, to decide memory or disk
+SCRATCH_BYTES_PER_FEATURE = 8192
+
+# Engines of cable_orientation
+ENGINES = ("GEOPROCESSING", "SPATIAL_INDEX", "TILED")
+
+def parse_radii(buffer_size):
+    # "50", "50 Meters" or a list "10;20;50;100" -> [10.0, 20.0, 50.0, 100.0]
+    radii = [float(item.split()[0]) for item in buffer_size.replace(",", ";").split(";") if item.strip()]
+    if not radii:
+        raise ValueError("No buffer size given")
+    return sorted(set(radii))
+
+
+def read_wtg_points(points_layer, wtg_name, x, y, spatial_reference):
+    # Name, position (in spatial_reference) and X/Y fields of the WTGs; a layout store is read as its memory maps
+    if is_layout_store(points_layer):
+        return read_points(points_layer, [wtg_name, x, y], spatial_reference)
+    return arcpy.da.FeatureClassToNumPyArray(points_layer, [wtg_name, "SHAPE@X", "SHAPE@Y", x, y],
+                                             spatial_reference=spatial_reference, null_value={x: np.nan, y: np.nan})
+
+
+def count_features(layer):
+    return len(LayoutStore(layer)) if is_layout_store(layer) else int(arcpy.management.GetCount(layer)[0])
+
+
+def shapefile_field_name(name):
+    # Name of a field in the exported shapefile, dBASE keeps 10 characters of it
+    return SHAPEFILE_FIELD_NAMES.get(name, name[:10])
+
+
+def add_radius(feature_class, radius):
+    arcpy.AddField_management(feature_class, "Radius", "DOUBLE")
+    with arcpy.da.UpdateCursor(feature_class, ["Radius"]) as cursor:
+        for row in cursor:
+            cursor.updateRow([radius])
+
+
+#------------ Engine 1: Buffer + SpatialJoin + Intersect in the scratch workspace
+def orientation_with_geoprocessing(points_layer, wtg_name, x, y, cable_layer, buffer_size, output_feature_class, scratch):
+    #----- 1) Create a buffer around the WTG points
+    buffer_size_meters =  buffer_size + " Meters"
+    # Every buffer size gets its own intermediates, a sweep over several sizes never reuses a dataset
+    size_name = buffer_size.replace(" ", "_").replace(".", "_")
+    buffer_output= scratch.name("Buffer_"+ size_name)
+    spatial_join_output = scratch.name("Spatial_Join_" + size_name)
+    arcpy.AddMessage("1) Establishing buffer zones around the WTG points")
+    with span("Buffer"):
+        arcpy.Buffer_analysis(points_layer, buffer_output, buffer_size_meters)
+
+    #----- 2) Set up field mapping for spatial join between Cables and WTG
+    arcpy.AddMessage("2) Spatial join between Cables and WTG buffer zones")
+    # Add a new text field with 255 characters
+    new_field_name = "FromTo"
+    # Check if the field already exists and delete it if found
+    existing_fields = [field.name for field in arcpy.ListFields(buffer_output)]
+    if new_field_name in existing_fields:
+         arcpy.DeleteField_management(buffer_output, new_field_name)
     
-# Calculate the new field using values from an existing field
-arcpy.CalculateField_management(buffer_output, new_field_name, "!" + wtg_name + "!", "PYTHON")
-# Set up field mapping for spatial join
-field_mappings = arcpy.FieldMappings()
-field_mappings.addTable(buffer_output)
-# Set the merge rule for the 'Angle_between' field
-arcpy.AddMessage("3) Identifying WTG names beetween the angle will be measured")
-for field in field_mappings.fields:
-    if field.name == new_field_name:
-        field_index = field_mappings.findFieldMapIndex(field.name)
-        if field_index != -1:
-            field_map = field_mappings.getFieldMap(field_index)
-            field_map.mergeRule = 'Join'
-            field_map.joinDelimiter = ' - '
-            field_mappings.replaceFieldMap(field_index, field_map)
+    # Calculate the new field using values from an existing field
+    with span("CalculateField"):
+        arcpy.CalculateField_management(buffer_output, new_field_name, "!" + wtg_name + "!", "PYTHON")
+    # Set up field mapping for spatial join
+    field_mappings = arcpy.FieldMappings()
+    field_mappings.addTable(buffer_output)
+    # Set the merge rule for the 'Angle_between' field
+    arcpy.AddMessage("3) Identifying WTG names beetween the angle will be measured")
+    for field in field_mappings.fields:
+        if field.name == new_field_name:
+            field_index = field_mappings.findFieldMapIndex(field.name)
+            if field_index != -1:
+                field_map = field_mappings.getFieldMap(field_index)
+                field_map.mergeRule = 'Join'
+                field_map.joinDelimiter = ' - '
+                field_mappings.replaceFieldMap(field_index, field_map)
             
-# Perform spatial join
-arcpy.analysis.SpatialJoin(
-    cable_layer,
-    buffer_output,
-    "Spatial_Join",
-    join_operation="JOIN_ONE_TO_ONE",
-    join_type="KEEP_ALL",
-    field_mapping=field_mappings,
-    match_option="WITHIN_A_DISTANCE",
-    search_radius="20 Meters"
-)
-# Perform intersect analysis
-arcpy.AddMessage("4) Perform the intersect analysis between buffer zones and cable lines")
-intersections_output = "Intersect"
-arcpy.analysis.Intersect([buffer_output, "Spatial_Join"], intersections_output, "ALL", None, output_type="INPUT")
-arcpy.AddMessage("5) Iterate through each row in the feature class to identify the names of the Start (From) and End (To) WTGs.")
-new_name_start = "Start"
-if not arcpy.ListFields(intersections_output, new_name_start):
-    arcpy.AlterField_management(intersections_output, wtg_name, new_name_start ,new_name_start)
+    # Perform spatial join
+    with span("SpatialJoin"):
+        arcpy.analysis.SpatialJoin(
+            cable_layer,
+            buffer_output,
+            spatial_join_output,
+            join_operation="JOIN_ONE_TO_ONE",
+            join_type="KEEP_ALL",
+            field_mapping=field_mappings,
+            match_option="WITHIN_A_DISTANCE",
+            search_radius="20 Meters"
+        )
+    # Perform intersect analysis
+    arcpy.AddMessage("4) Perform the intersect analysis between buffer zones and cable lines")
+    intersections_output = scratch.name("Intersect_" + size_name)
+    with span("Intersect"):
+        arcpy.analysis.Intersect([buffer_output, spatial_join_output], intersections_output, "ALL", None,
+                                 output_type="INPUT")
+    arcpy.AddMessage("5) Iterate through each row in the feature class to identify the names of the Start (From) and End (To) WTGs.")
+    new_name_start = "Start"
+    if not arcpy.ListFields(intersections_output, new_name_start):
+        arcpy.AlterField_management(intersections_output, wtg_name, new_name_start ,new_name_start)
     
-new_name_end = "End"    
-if not arcpy.ListFields(intersections_output, new_name_end):
-    arcpy.AlterField_management(intersections_output, "FromTo_1", new_name_end, new_name_end )
+    new_name_end = "End"    
+    if not arcpy.ListFields(intersections_output, new_name_end):
+        arcpy.AlterField_management(intersections_output, "FromTo_1", new_name_end, new_name_end )
 
     
-# Iterate through each row in the feature class using an update cursor
-with arcpy.da.UpdateCursor(intersections_output, ["Start",  "End"]) as cursor:
-    for row in cursor:
-        split_values = row[1].split(' - ')
-        if len(split_values) >= 2:
-            if split_values[0] == row[0]:
-                row[1] = split_values[1].strip()
-                cursor.updateRow(row)
-            if split_values[1] == row[0]:
-                row[1] = split_values[0].strip()
-                cursor.updateRow(row)
+    # Iterate through each row in the feature class using an update cursor
+    with span("Start/End cursor") as measured, arcpy.da.UpdateCursor(intersections_output, ["Start",  "End"]) as cursor:
+        measured.rows = 0
+        for row in cursor:
+            measured.rows += 1
+            split_values = row[1].split(' - ')
+            if len(split_values) >= 2:
+                if split_values[0] == row[0]:
+                    row[1] = split_values[1].strip()
+                    cursor.updateRow(row)
+                if split_values[1] == row[0]:
+                    row[1] = split_values[0].strip()
+                    cursor.updateRow(row)
                 
-# List of fields to keep
-fields_to_keep = [new_name_start, new_name_end, x, y]
-# Create field mappings object for FeatureClassToFeatureClass_conversion
-field_mappings = arcpy.FieldMappings()
-# Iterate through all fields in the input feature class
-for field in arcpy.ListFields(intersections_output):
-    if field.name in fields_to_keep:
-        field_map = arcpy.FieldMap()
-        field_map.addInputField(intersections_output, field.name)
-        output_field = field_map.outputField
-        output_field.name = field.name
-        field_map.outputField = output_field
-        field_mappings.addFieldMap(field_map)
-# Copy selected fields to a new feature class
-output_feature_class = "Angle"
-arcpy.FeatureClassToFeatureClass_conversion(intersections_output, arcpy.env.workspace,
-                                           arcpy.ValidateTableName(output_feature_class, arcpy.env.workspace),
-                                           field_mapping=field_mappings)
-# Add new float fields to the feature class
-arcpy.AddField_management(output_feature_class, "X1", "Text")
-arcpy.AddField_management(output_feature_class, "Y1", "Text")
-arcpy.AddField_management(output_feature_class, "X2", "Text")
-arcpy.AddField_management(output_feature_class, "Y2", "Text")
-arcpy.AddField_management(output_feature_class, "AngleFromNorth", "Double")
-# Create an update cursor for the feature class
-with arcpy.da.UpdateCursor(output_feature_class, ["SHAPE@", "X1", "Y1", "X2", "Y2", "AngleFromNorth", x, y]) as cursor:
-    for row in cursor:
-        line_geometry = row[0]
-        start_point = line_geometry.firstPoint
-        end_point = line_geometry.lastPoint
-        if abs(start_point.X - row[6]) <= 5.0 and abs(start_point.Y - row[7]) <= 5.0:
-            row[1] = round(start_point.X, 0)
-            row[2] = round(start_point.Y, 0)
-            row[3] = round(end_point.X, 0)
-            row[4] = round(end_point.Y, 0)
-            angle_from_north = math.degrees(math.atan2(end_point.X - start_point.X, end_point.Y - start_point.Y))
-            angle_from_north = (angle_from_north + 360) % 360
-            row[5] = angle_from_north
-            cursor.updateRow(row)
+    # List of fields to keep
+    fields_to_keep = [new_name_start, new_name_end, x, y]
+    # Create field mappings object for FeatureClassToFeatureClass_conversion
+    field_mappings = arcpy.FieldMappings()
+    # Iterate through all fields in the input feature class
+    for field in arcpy.ListFields(intersections_output):
+        if field.name in fields_to_keep:
+            field_map = arcpy.FieldMap()
+            field_map.addInputField(intersections_output, field.name)
+            output_field = field_map.outputField
+            output_field.name = field.name
+            field_map.outputField = output_field
+            field_mappings.addFieldMap(field_map)
+    # Copy selected fields to a new feature class
+    with span("FeatureClassToFeatureClass"):
+        arcpy.FeatureClassToFeatureClass_conversion(intersections_output, arcpy.env.workspace,
+                                                   arcpy.ValidateTableName(output_feature_class, arcpy.env.workspace),
+                                                   field_mapping=field_mappings)
+    # Add new float fields to the feature class
+    arcpy.AddField_management(output_feature_class, "X1", "Text")
+    arcpy.AddField_management(output_feature_class, "Y1", "Text")
+    arcpy.AddField_management(output_feature_class, "X2", "Text")
+    arcpy.AddField_management(output_feature_class, "Y2", "Text")
+    arcpy.AddField_management(output_feature_class, "AngleFromNorth", "Double")
+    # Read the vertices of all segments in one go (one row per vertex) together with the WTG X/Y
+    with span("Read vertices") as measured:
+        vertices = arcpy.da.FeatureClassToNumPyArray(output_feature_class, ["OID@", "SHAPE@X", "SHAPE@Y", x, y],
+                                                     explode_to_points=True, null_value=np.nan)
+        measured.rows = len(vertices)
+    oids, first, last = first_last_vertices(vertices["OID@"])
+    vertex_x = vertices["SHAPE@X"]
+    vertex_y = vertices["SHAPE@Y"]
+
+    # Compute X1/Y1/X2/Y2 and the angle from North for all segments at once
+    x1, y1, x2, y2, angles = orientation_kernel(vertex_x[first], vertex_y[first], vertex_x[last], vertex_y[last],
+                                                vertices[x][first].astype("float64"), vertices[y][first].astype("float64"))
+    results = dict(zip(oids.tolist(), zip(x1.tolist(), y1.tolist(), x2.tolist(), y2.tolist(), angles.tolist())))
+
+    # Write the results back in one pass of an update cursor
+    with span("Angle cursor", len(results)), \
+            arcpy.da.UpdateCursor(output_feature_class, ["OID@", "X1", "Y1", "X2", "Y2", "AngleFromNorth"]) as cursor:
+        for row in cursor:
+            if row[0] in results:
+                cursor.updateRow([row[0], *results[row[0]]])
+
+
+def orientation_sweep_with_geoprocessing(points_layer, wtg_name, x, y, cable_layer, buffer_size, output_feature_class,
+                                         scratch):
+    # The geoprocessing chain has nothing to share between radii: one run per radius, merged with a Radius column
+    radii = parse_radii(buffer_size)
+    if len(radii) == 1:
+        # One radius needs no merge, it is written as the output itself
+        orientation_with_geoprocessing(points_layer, wtg_name, x, y, cable_layer, f"{radii[0]:g}",
+                                       output_feature_class, scratch)
+        add_radius(output_feature_class, radii[0])
+        return
+    pieces = []
+    for radius in radii:
+        arcpy.AddMessage(f"--- Buffer size {radius:g} Meters")
+        piece = scratch.name(f"Angle_{radius:g}".replace(".", "_"))
+        with span(f"Buffer size {radius:g}"):
+            orientation_with_geoprocessing(points_layer, wtg_name, x, y, cable_layer, f"{radius:g}", piece, scratch)
+            add_radius(piece, radius)
+        pieces.append(piece)
+    with span("Merge"):
+        arcpy.management.Merge(pieces, output_feature_class)
+
+
+#------------ Engine 2: in-process spatial index, no intermediate outputs at all
+def orientation_with_spatial_index(points_layer, wtg_name, x, y, cable_layer, buffer_size, output_feature_class,
+                                   scratch=None, workers=1):
+    # All buffer sizes from one index, one snap of the cable ends and one pass over the vertices;
+    # with workers other than 1 the extent is tiled and the tiles run in a process pool (TILED engine)
+    radii = parse_radii(buffer_size)
+    spatial_reference = arcpy.Describe(cable_layer).spatialReference
+
+    # Load the WTG points (in the coordinate system of the cables) and the cable vertices as arrays
+    arcpy.AddMessage("1) Loading WTG points into a spatial index")
+    with span("Read WTG points") as measured:
+        wtg = read_wtg_points(points_layer, wtg_name, x, y, spatial_reference)
+        measured.rows = len(wtg["SHAPE@X"])
+    with span("Read cable vertices") as measured:
+        vertices = arcpy.da.FeatureClassToNumPyArray(cable_layer, ["OID@", "SHAPE@X", "SHAPE@Y"],
+                                                     explode_to_points=True)
+        oids, first, last = first_last_vertices(vertices["OID@"])
+        measured.rows = len(vertices)
+
+    # Snap each cable end to the nearest WTG within the buffer size and measure the angles
+    arcpy.AddMessage("2) Snapping the cable ends to the nearest WTG within " + ", ".join(f"{radius:g}" for radius in radii)
+                     + " Meters")
+    with span("Snap and measure", len(first)):
+        if workers == 1:
+            results = orient_cables_sweep(wtg["SHAPE@X"], wtg["SHAPE@Y"], vertices["SHAPE@X"], vertices["SHAPE@Y"],
+                                          first, last, radii)
         else:
-            row[1] = round(end_point.X, 0)
-            row[2] = round(end_point.Y, 0)
-            row[3] = round(start_point.X, 0)
-            row[4] = round(start_point.Y, 0)
-            angle_from_north = math.degrees(math.atan2(start_point.X - end_point.X, start_point.Y - end_point.Y))
-            angle_from_north = (angle_from_north + 360) % 360
-            row[5] = angle_from_north
-            cursor.updateRow(row)
-# Set the workspace for shapefile and Excel file
-output_shapefile = os.path.join(output_folder, "Cable_Angle_"+ buffer_size.replace(" ", "_")+".shp")
-output_excel = os.path.join(output_folder, "Cable_Angle_"+ buffer_size.replace(" ", "_")+".xlsx")
-
-# Export the shapefile and Excel
-arcpy.CopyFeatures_management(output_feature_class, output_shapefile)
-arcpy.TableToExcel_conversion(output_feature_class, output_excel)
-arcpy.AddMessage("WELL DONE - you can check the output folder:")
-arcpy.AddMessage(output_folder)
+            results = orient_cables_tiled(wtg["SHAPE@X"], wtg["SHAPE@Y"], vertices["SHAPE@X"], vertices["SHAPE@Y"],
+                                          first, last, radii, workers)
+    names = wtg[wtg_name].astype(str)
+
+    # Write the Angle feature class directly, with the same fields as the geoprocessing engine plus the radius
+    arcpy.AddMessage("3) Writing " + str(sum(len(result["cable"]) for result in results.values())) + " cable ends to "
+                     + output_feature_class)
+    with span("Insert cursor", sum(len(result["cable"]) for result in results.values())):
+        create_angle_feature_class(output_feature_class, x, y, spatial_reference)
+        insert_angle_rows(output_feature_class, x, y, angle_rows(results, names, wtg[x], wtg[y]), spatial_reference)
+
+
+def create_angle_feature_class(output_feature_class, x, y, spatial_reference):
+    arcpy.CreateFeatureclass_management(arcpy.env.workspace, output_feature_class, "POLYLINE",
+                                        spatial_reference=spatial_reference)
+    arcpy.management.AddFields(output_feature_class, [["Start", "TEXT"], ["End", "TEXT"], [x, "DOUBLE"], [y, "DOUBLE"],
+                                                      ["X1", "TEXT"], ["Y1", "TEXT"], ["X2", "TEXT"], ["Y2", "TEXT"],
+                                                      ["AngleFromNorth", "DOUBLE"], ["Radius", "DOUBLE"]])
+
+
+def angle_rows(results, names, wtg_x, wtg_y):
+    # (shape, Start, End, X, Y, X1, Y1, X2, Y2, AngleFromNorth, Radius) per cable end and radius; shape None = from X1..Y2
+    for radius, result in results.items():
+        end_names = np.where(result["end_wtg"] >= 0, names[result["end_wtg"]], "")
+        rows = zip(names[result["start_wtg"]].tolist(), end_names.tolist(),
+                   wtg_x[result["start_wtg"]].tolist(), wtg_y[result["start_wtg"]].tolist(),
+                   result["X1"].tolist(), result["Y1"].tolist(), result["X2"].tolist(), result["Y2"].tolist(),
+                   result["AngleFromNorth"].tolist())
+        for start, end, x, y, x1, y1, x2, y2, angle in rows:
+            yield None, start, end, x, y, x1, y1, x2, y2, angle, radius
+
+
+def insert_angle_rows(output_feature_class, x, y, rows, spatial_reference):
+    with arcpy.da.InsertCursor(output_feature_class, ["SHAPE@", "Start", "End", x, y, "X1", "Y1", "X2", "Y2",
+                                                      "AngleFromNorth", "Radius"]) as cursor:
+        for row in rows:
+            if row[0] is None:
+                # The measured piece of cable: from the WTG to the point buffer_size along the cable
+                x1, y1, x2, y2 = (float(value) for value in row[5:9])
+                row = (arcpy.Polyline(arcpy.Array([arcpy.Point(x1, y1), arcpy.Point(x2, y2)]), spatial_reference),
+                       *row[1:])
+            cursor.insertRow(row)
+
+
+def angle_summary(output_feature_class, output_summary, jtube_min_separation=JTUBE_MIN_SEPARATION):
+    """Number of cables, separation between adjacent cables and the J-tube check per WTG and buffer size,
+    as an Excel file."""
+    angles = arcpy.da.FeatureClassToNumPyArray(output_feature_class, ["Start", "AngleFromNorth", "Radius"],
+                                               null_value={"Start": "", "AngleFromNorth": np.nan, "Radius": np.nan})
+    summaries = []
+    adjacents = []
+    for radius in np.unique(angles["Radius"]).tolist():
+        selected = angles[angles["Radius"] == radius]
+        stats = angle_statistics(selected["Start"].astype(str), selected["AngleFromNorth"])
+        summaries.append(pd.DataFrame({
+            "Radius": radius,
+            "WTG": stats["wtg"],
+            "Cables": stats["cable_count"],
+            "Min separation [deg]": np.round(stats["min_separation"], 2),
+            "Max gap [deg]": np.round(stats["max_gap"], 2),
+            # A WTG with a single cable has nothing to collide with
+            "J-tube OK": np.isnan(stats["min_separation"]) | (stats["min_separation"] >= jtube_min_separation),
+        }))
+        adjacents.append(pd.DataFrame({
+            "Radius": radius,
+            "WTG": stats["key"],
+            "AngleFromNorth": np.round(stats["angle"], 2),
+            "Separation to next [deg]": np.round(stats["separation"], 2),
+        }))
+    columns = ["Radius", "WTG", "Cables", "Min separation [deg]", "Max gap [deg]", "J-tube OK"]
+    summary = pd.concat(summaries, ignore_index=True) if summaries else pd.DataFrame(columns=columns)
+    adjacent = pd.concat(adjacents, ignore_index=True) if adjacents else \
+        pd.DataFrame(columns=["Radius", "WTG", "AngleFromNorth", "Separation to next [deg]"])
+    with pd.ExcelWriter(output_summary) as writer:
+        summary.to_excel(writer, sheet_name="WTG summary", index=False)
+        adjacent.to_excel(writer, sheet_name="Adjacent cables", index=False)
+
+    violations = int((~summary["J-tube OK"].astype(bool)).sum())
+    if violations:
+        arcpy.AddWarning(f"{violations} WTGs have cables closer than {jtube_min_separation} degrees (J-tube constraint)")
+    return summary
+
+
+#------------ Whole cable orientation run
+
+def output_paths(buffer_size, output_folder):
+    # Cable_Angle_<sizes>.shp, .xlsx and _WTG_summary.xlsx
+    sizes = "_".join(f"{radius:g}".replace(".", "_") for radius in parse_radii(buffer_size))
+    return (os.path.join(output_folder, "Cable_Angle_" + sizes + ".shp"),
+            os.path.join(output_folder, "Cable_Angle_" + sizes + ".xlsx"),
+            os.path.join(output_folder, "Cable_Angle_" + sizes + "_WTG_summary.xlsx"))
+
+
+def export_angles(output_feature_class, output_folder, buffer_size, jtube_min_separation=JTUBE_MIN_SEPARATION):
+    # Export the shapefile and Excel
+    output_shapefile, output_excel, output_summary = output_paths(buffer_size, output_folder)
+    for output in (output_shapefile, output_excel):
+        if arcpy.Exists(output):
+            arcpy.management.Delete(output)
+    with span("CopyFeatures"):
+        arcpy.CopyFeatures_management(output_feature_class, output_shapefile)
+    with span("TableToExcel"):
+        arcpy.TableToExcel_conversion(output_feature_class, output_excel)
+    with span("WTG summary") as measured:
+        measured.rows = len(angle_summary(output_feature_class, output_summary, jtube_min_separation))
+
+
+def cable_orientation(points_layer, wtg_name, x, y, cable_layer, buffer_size, output_folder, engine="GEOPROCESSING",
+                      scratch_mode=AUTO, jtube_min_separation=JTUBE_MIN_SEPARATION, workers=None, use_cache=True,
+                      cache_folder=CACHE_FOLDER, run_report=True, profile=None):
+    """Angle from North of every cable end at a WTG, exported as Cable_Angle_<buffer size>.shp/.xlsx,
+    plus the per WTG summary Cable_Angle_<buffer size>_WTG_summary.xlsx.
+
+    buffer_size is one size or a list "10;20;50"; all sizes go into one output with a Radius field
+    (Cable_Angle_10_20_50). engine is one of ENGINES: GEOPROCESSING (default) runs the Buffer + SpatialJoin +
+    Intersect chain once per size and merges the results, so its time grows with the number of sizes; the
+    SPATIAL_INDEX engine evaluates all sizes in one pass.
+    The TILED engine is SPATIAL_INDEX over spatial tiles in a pool of workers processes (default: CPU count),
+    for grids with hundreds of thousands of cables; see tiled_orientation.py.
+
+    Intermediate outputs go to a scratch workspace that is unique for the run and deleted afterwards;
+    scratch_mode is AUTO (memory, disk only when they are not expected to fit), MEMORY or DISK.
+    With use_cache the outputs of an earlier run with the same inputs and parameters are copied from
+    cache_folder instead of running the orientation again (see orientation_cache.py).
+    run_report writes the timing of the steps as Cable_Angle_<buffer size>_run_report.json into output_folder (or
+    to the given path); profile CPROFILE, TRACEMALLOC or ALL adds a profile of the run (see instrumentation.py).
+    points_layer can also be a layout store (see layout_store.py) with the SPATIAL_INDEX and TILED engines.
+    Returns the paths of the shapefile, the Excel file and the summary.
+    """
+    arcpy.AddMessage(output_folder)
+    engine = (engine or "GEOPROCESSING").upper()
+    if engine not in ENGINES:
+        raise ValueError("Unknown orientation engine: {} (choose from {})".format(engine, ", ".join(ENGINES)))
+
+    # -----Check Inputs
+    if not os.path.exists(output_folder):
+         arcpy.AddMessage("Output Folder Does not Exit, please create a folder.")
+    if is_layout_store(points_layer):
+        arcpy.AddMessage("WTG layout store exists.")
+        if engine == "GEOPROCESSING":
+            raise ValueError("A layout store is read by the SPATIAL_INDEX and TILED engines only")
+    elif arcpy.Exists(points_layer):
+        arcpy.AddMessage("WTG Feature layer exists.")
+    else:
+        arcpy.AddMessage("WTGFeature layer does not exist.")
+    if arcpy.Exists(cable_layer):
+        arcpy.AddMessage("Cable Feature layer exists.")
+    else:
+        arcpy.AddMessage("Cable Feature layer does not exist.")
+
+    # Set the workspace for shapefile and Excel file
+    output_shapefile, output_excel, output_summary = output_paths(buffer_size, output_folder)
+
+    outputs = [output_shapefile, output_excel, output_summary]
+    parameters = {"points_layer": points_layer, "cable_layer": cable_layer, "buffer_size": buffer_size,
+                  "engine": engine, "scratch_mode": scratch_mode, "workers": workers, "use_cache": use_cache}
+    report = report_path(run_report, output_folder, os.path.splitext(os.path.basename(output_shapefile))[0])
+    with RunReport("Cable orientation", parameters, report, profile) as run:
+        if use_cache:
+            cache = OrientationCache(cache_folder)
+            with span("Cache lookup"):
+                cache_key = orientation_key(points_layer, wtg_name, x, y, cable_layer, parse_radii(buffer_size),
+                                            engine, jtube_min_separation)
+                restored = cache.restore(cache_key, outputs)
+            run.totals["cache_hit"] = restored
+            if restored:
+                arcpy.AddMessage("Same inputs and parameters as an earlier run, the outputs are taken from the cache")
+                return output_shapefile, output_excel, output_summary
+
+        features = count_features(points_layer) + count_features(cable_layer)
+        run.totals["features"] = features
+        estimated_mb = features * SCRATCH_BYTES_PER_FEATURE / 2 ** 20
+        if engine == "SPATIAL_INDEX":
+            run_engine = orientation_with_spatial_index
+        elif engine == "TILED":
+            run_engine = partial(orientation_with_spatial_index, workers=workers)
+        else:
+            run_engine = orientation_sweep_with_geoprocessing
+
+        #------------ Run the selected engine in the scratch workspace
+        with ScratchWorkspace("cable_orientation", estimated_mb, scratch_mode) as scratch:
+            output_feature_class = scratch.name("Angle")
+            try:
+                with span(f"Engine {engine}"):
+                    run_engine(points_layer, wtg_name, x, y, cable_layer, buffer_size, output_feature_class, scratch)
+            except Exception as e:
+                # Out of memory in the memory workspace: run again with the intermediates on disk
+                if not is_out_of_memory(e) or not scratch.spill_to_disk():
+                    raise
+                output_feature_class = scratch.name("Angle")
+                with span(f"Engine {engine} on disk"):
+                    run_engine(points_layer, wtg_name, x, y, cable_layer, buffer_size, output_feature_class, scratch)
+
+            with span("Export"):
+                export_angles(output_feature_class, output_folder, buffer_size, jtube_min_separation)
+        if use_cache:
+            with span("Cache store"):
+                cache.store(cache_key, outputs)
+
+    arcpy.AddMessage("WELL DONE - you can check the output folder:")
+    arcpy.AddMessage(output_folder)
+    return output_shapefile, output_excel, output_summary
+
+
+def refresh_cable_orientation(points_layer, wtg_name, x, y, cable_layer, buffer_size, output_folder, affected_wtgs,
+                              scratch_mode=AUTO, jtube_min_separation=JTUBE_MIN_SEPARATION):
+    """Bring the outputs of an earlier cable_orientation run up to date after the WTGs affected_wtgs changed
+    (inserted, moved or deleted, e.g. the keys of a layout_diff change report).
+
+    Only the cables with an end within the largest buffer size of an affected WTG - at its new position, or at
+    its old one from the earlier output - are measured again (SPATIAL_INDEX engine); the rows of all other
+    cables are kept. Without an earlier output this is a full run.
+    """
+    output_shapefile, output_excel, output_summary = output_paths(buffer_size, output_folder)
+    if not arcpy.Exists(output_shapefile):
+        arcpy.AddMessage("No earlier cable orientation output, running it for all cables")
+        return cable_orientation(points_layer, wtg_name, x, y, cable_layer, buffer_size, output_folder,
+                                 "SPATIAL_INDEX", scratch_mode, jtube_min_separation)
+    affected = {str(name) for name in affected_wtgs}
+    radii = parse_radii(buffer_size)
+    spatial_reference = arcpy.Describe(cable_layer).spatialReference
+
+    # Earlier rows by field name, in the order of insert_angle_rows; the engines write the fields in different
+    # orders (GEOPROCESSING: Start, X, Y, End, ...)
+    fields = {field.name.lower(): field.name for field in arcpy.ListFields(output_shapefile)}
+    names = ["Start", "End", x, y] + ANGLE_FIELDS
+    found = [fields.get(name.lower()) or fields.get(shapefile_field_name(name).lower()) for name in names]
+    missing = [name for name, field in zip(names, found) if field is None]
+    if missing:
+        raise ValueError(f"Field(s) {missing} not found in {output_shapefile}, run the cable orientation again")
+    with arcpy.da.SearchCursor(output_shapefile, ["SHAPE@"] + found) as cursor:
+        earlier = [tuple(row) for row in cursor]
+
+    wtg = read_wtg_points(points_layer, wtg_name, x, y, spatial_reference)
+    names = wtg[wtg_name].astype(str)
+    vertices = arcpy.da.FeatureClassToNumPyArray(cable_layer, ["OID@", "SHAPE@X", "SHAPE@Y"], explode_to_points=True)
+    oids, first, last = first_last_vertices(vertices["OID@"])
+
+    # Where the affected WTGs are now and where their cable ends were measured before
+    moved = np.isin(names, list(affected))
+    old_ends = [(float(row[5]), float(row[6])) for row in earlier if row[1] in affected]
+    spots_x = np.r_[wtg["SHAPE@X"][moved], [end[0] for end in old_ends]]
+    spots_y = np.r_[wtg["SHAPE@Y"][moved], [end[1] for end in old_ends]]
+    spots = GridIndex(spots_x, spots_y, radii[-1] + 1.0)
+    near_first = spots.nearest_within(vertices["SHAPE@X"][first], vertices["SHAPE@Y"][first], radii[-1] + 1.0)[0] >= 0
+    near_last = spots.nearest_within(vertices["SHAPE@X"][last], vertices["SHAPE@Y"][last], radii[-1] + 1.0)[0] >= 0
+    subset = near_first | near_last
+    arcpy.AddMessage(f"{len(affected)} WTGs changed, measuring {int(subset.sum())} of {len(first)} cables again")
+
+    results = orient_cables_sweep(wtg["SHAPE@X"], wtg["SHAPE@Y"], vertices["SHAPE@X"], vertices["SHAPE@Y"],
+                                  first[subset], last[subset], radii)
+    new_rows = list(angle_rows(results, names, wtg[x], wtg[y]))
+
+    # Earlier rows of the measured cable ends (same X1..Y2 and radius) or of an affected WTG are replaced
+    def end_key(row):
+        return tuple(round(float(value)) for value in row[5:9]) + (float(row[10]),)
+    replaced = {end_key(row) for row in new_rows}
+    kept = [row for row in earlier
+            if row[1] not in affected and row[2] not in affected and end_key(row) not in replaced]
+
+    with ScratchWorkspace("cable_orientation", 0, scratch_mode) as scratch:
+        output_feature_class = scratch.name("Angle")
+        create_angle_feature_class(output_feature_class, x, y, spatial_reference)
+        insert_angle_rows(output_feature_class, x, y, kept + new_rows, spatial_reference)
+        export_angles(output_feature_class, output_folder, buffer_size, jtube_min_separation)
+    return output_shapefile, output_excel, output_summary
+
+
+if __name__ == "__main__":
+    # Inside ArcGIS Pro sys.executable is not python.exe, the TILED workers need the interpreter itself
+    if sys.platform == "win32" and not sys.executable.lower().endswith("python.exe"):
+        multiprocessing.set_executable(os.path.join(sys.exec_prefix, "python.exe"))
+
+    #------------ Inputs
+    # Define input parameters fetched from the user or other sources
+    # WTG point layer, or a layout store (<name>.layout) with the SPATIAL_INDEX and TILED engines
+    points_layer = arcpy.GetParameterAsText(0)
+    wtg_name = arcpy.GetParameterAsText(1)
+    x = arcpy.GetParameterAsText(2)
+    y = arcpy.GetParameterAsText(3)
+    cable_layer = arcpy.GetParameterAsText(4)
+    # One buffer size in Meters or several separated by ";" (10;20;50), evaluated in the same run
+    buffer_size = arcpy.GetParameterAsText(5)
+    output_folder = arcpy.GetParameterAsText(6)
+    # GEOPROCESSING (Buffer + SpatialJoin + Intersect, once per buffer size: slow for several sizes or large grids),
+    # SPATIAL_INDEX (in-process, no intermediate outputs, all sizes in one pass) or TILED (SPATIAL_INDEX over
+    # spatial tiles in parallel, for very large grids)
+    engine = arcpy.GetParameterAsText(7) or "GEOPROCESSING"
+    # Optional: AUTO (default), MEMORY or DISK for the intermediate outputs
+    scratch_mode = arcpy.GetParameterAsText(8) or AUTO
+    # Optional: smallest angle between two cables at a WTG the J-tubes allow (degrees)
+    jtube_min_separation = float(arcpy.GetParameterAsText(9) or JTUBE_MIN_SEPARATION)
+
+    # Optional: change report of a WTG layout diff (<WTG fc>_changes.csv): only the cables at the changed WTGs
+    # are measured again, the earlier outputs are updated
+    change_report = arcpy.GetParameterAsText(10)
+
+    # Optional: number of worker processes of the TILED engine (default: CPU count)
+    workers = int(arcpy.GetParameterAsText(11) or 0) or None
+    # Optional: false to always run the orientation again instead of reusing the outputs of an identical run
+    use_cache = arcpy.GetParameterAsText(12).lower() != "false"
+    # Optional: CPROFILE, TRACEMALLOC or ALL to profile the run into the run report
+    profile = arcpy.GetParameterAsText(13) or None
+
+    if change_report:
+        refresh_cable_orientation(points_layer, wtg_name, x, y, cable_layer, buffer_size, output_folder,
+                                  changed_keys(change_report), scratch_mode, jtube_min_separation)
+    else:
+        cable_orientation(points_layer, wtg_name, x, y, cable_layer, buffer_size, output_folder, engine, scratch_mode,
+                          jtube_min_separation, workers, use_cache, profile=profile)
@@ -3,96 +3,255 @@ Name: Import GRID layout
 Autor: Andrea Sulova
 Date: 20th Feb 2024
 
+The steps are stages of a pipeline (see pipeline.py), so the import can also
+be run from batch_import.py and the time of every step is reported.
 """
 import arcpy
+import itertools
+import numpy as np
 import openpyxl
 import os
-import pandas as pd
-import zipfile
-from arcpy import metadata as md
+from collections import deque
+from import_manifest import file_signature, import_key, run_options
+from cable_network import network_from_table, write_network
+from topology_validation import ERROR, TopologyError, cable_columns, validate_topology, write_issues
+from feature_export import DEFAULT_FORMATS, parse_formats
+from feature_writers import DEFAULT_BATCH_SIZE, get_feature_writer, iter_batches
+from layout_diff import DIFF, REBUILD, DuplicateKeyError, diff_feature_class, keyed, read_keyed_rows
+from import_stages import alias_stage, cache_stage, export_stage, manifest_stage, metadata_stage
+from instrumentation import RunReport, report_path
+from pipeline import Pipeline, Stage
+
+# What to import when a workbook has several "Start point" tables: the first table only,
+# all tables into one feature class tagged by source, or one feature class per table
+FIRST = "FIRST"
+MERGED = "MERGED"
+SEPARATE = "SEPARATE"
+
+# Columns added to every row of a merged table
+SOURCE_HEADERS = ["Source sheet", "Source table"]
+
+# Columns that identify a cable when a new revision is matched against the feature class (update mode DIFF)
+CABLE_KEY_HEADERS = ["Start point", "End point", "Source table"]
 
-#------------ Inputs
-# Define input parameters fetched from the user or other sources
-
-file_path = arcpy.GetParameterAsText(0)
-
-spatial_reference = arcpy.GetParameterAsText(1)
+# -------- Import excel files to Dataframe
 
-output_gdb = arcpy.GetParameterAsText(2)
+class StreamedTable:
+    """The rows of one table, read from the workbook by the pass that found the table while they are iterated.
+
+    The rows can be iterated once. Rows the pass reads before they are asked for (a table next to the one
+    being read) wait in pending; a table nobody reads any more is dropped and keeps nothing.
+    """
+
+    def __init__(self, scan, sheet, start_col, headers):
+        self.scan = scan
+        self.sheet = sheet
+        self.start_col = start_col
+        self.headers = headers
+        self.width = len(headers)
+        self.pending = deque()
+        self.ended = False
+        self.dropped = False
+
+    def add(self, row):
+        if not self.dropped:
+            values = row[self.start_col:self.start_col + self.width]
+            self.pending.append(values + (None,) * (self.width - len(values)))
+
+    def drop(self):
+        self.dropped = True
+        self.pending.clear()
+
+    def __iter__(self):
+        if self.dropped:
+            raise RuntimeError(f"The rows of the table in sheet '{self.sheet}' were read already or skipped, "
+                               f"the tables of a workbook are read once and in order")
+        try:
+            while True:
+                while self.pending:
+                    yield self.pending.popleft()
+                if self.ended:
+                    return
+                self.scan.step()
+        finally:
+            self.drop()
+            self.scan.close_when_idle()
+
+
+class WorkbookScan:
+    """One streaming pass over all sheets of a workbook, finding the tables whose header row contains keyword.
+
+    step() reads one row; the workbook is closed at its end, or when no more tables are wanted
+    (release()) and the last table handed out is read.
+    """
+
+    def __init__(self, file_path, keyword):
+        self.keyword = keyword
+        # Open the workbook in read-only mode, so the sheets are streamed row by row instead of loaded as a whole
+        self.wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        self.rows = self._sheet_rows()
+        # Tables of the current sheet that did not end yet, tables found but not handed out yet
+        self.running = []
+        self.found = deque()
+        self.finished = False
+        self.released = False
+        self.closed = False
+
+    def _sheet_rows(self):
+        # Loop through each sheet in the workbook; None marks the end of a sheet
+        for sheet in self.wb.sheetnames:
+            ws = self.wb[sheet]
+            # Do not trust the stored sheet dimensions, some exported templates have them wrong
+            ws.reset_dimensions()
+            for row in ws.iter_rows(values_only=True):
+                yield sheet, row
+            yield sheet, None
+
+    def step(self):
+        """Read the next row of the workbook; False at its end."""
+        if self.finished:
+            return False
+        try:
+            sheet, row = next(self.rows)
+        except StopIteration:
+            self.finished = True
+            self.close_when_idle()
+            return False
+
+        # A table runs down until the first empty cell in its start column (or the end of its sheet)
+        for table in self.running:
+            if row is None or len(row) <= table.start_col or row[table.start_col] is None:
+                table.ended = True
+            else:
+                table.add(row)
+        self.running = [table for table in self.running if not table.ended]
+
+        if row is None or self.released or self.keyword not in row:
+            return True
+        # Every cell with the keyword starts a table; its header row runs to the right until the first empty cell
+        running = {table.start_col for table in self.running}
+        for start_col, value in enumerate(row):
+            if value != self.keyword or start_col in running:
+                continue
+            headers = []
+            for header in row[start_col:]:
+                if header is None:
+                    break
+                headers.append(header)
+            table = StreamedTable(self, sheet, start_col, headers)
+            self.running.append(table)
+            self.found.append(table)
+        return True
+
+    def release(self):
+        # No more tables wanted: the ones found but not handed out are dropped
+        self.released = True
+        for table in self.found:
+            table.drop()
+        self.found.clear()
+        self.close_when_idle()
+
+    def close_when_idle(self):
+        # Open as long as more tables may be asked for or a table handed out may still be read
+        busy = any(not table.dropped for table in self.running)
+        if not self.closed and (self.finished or self.released and not busy):
+            self.closed = True
+            self.wb.close()
 
-output_fc = arcpy.GetParameterAsText(3)
 
-data_inventory = arcpy.GetParameterAsText(4)
+# Beate's amazing work for importing table from the IAC template provided by Cable Engineers
+def iter_tables_in_excel(file_path, keyword):
+    """Every table whose header row contains keyword, in all sheets, from one streaming pass over the workbook.
+
+    Yields (sheet, headers, table_rows) per table, in the order the tables start. table_rows is a StreamedTable:
+    its rows come from the same pass while it is iterated, so the workbook is opened and read once whatever the
+    number of tables. A table has to be read before the next one is asked for, it is dropped then.
+    Several tables per sheet are found, below and next to each other.
+    """
+    scan = WorkbookScan(file_path, keyword)
+    table = None
+    try:
+        while True:
+            while not scan.found and scan.step():
+                pass
+            if not scan.found:
+                return
+            if table is not None:
+                table.drop()
+            table = scan.found.popleft()
+            yield table.sheet, table.headers, table
+    finally:
+        scan.release()
 
-sheet_data_inventory = arcpy.GetParameterAsText(5)
 
-arcpy.env.workspace = output_gdb
+def find_table_in_excel(file_path, keyword):
+    # First table only; the workbook is read no further than to its last row, when its rows are read
+    tables = iter_tables_in_excel(file_path, keyword)
+    try:
+        return next(tables)
+    except StopIteration:
+        raise ValueError(f"No table starting with '{keyword}' found in {file_path}")
+    finally:
+        tables.close()
 
-# -------- Import excel files to Dataframe
 
-# Beate's amazing work for importing table from the IAC template provided by Cable Engineers
-def find_table_in_excel(file_path, keyword):
-    # Load the workbook
-    wb = openpyxl.load_workbook(file_path)
-
-    # Loop through each sheet in the workbook
-    for sheet in wb.sheetnames:
-        ws = wb[sheet]
-
-        # Loop through each row in the sheet
-        for row in ws.iter_rows():
-            # Loop through each cell in the row
-            for cell in row:
-                # Check if the cell value matches the keyword
-                if cell.value == keyword:
-                    start_cell = cell.coordinate
-
-                    # Get start cell coordinates
-                    start_col = start_cell[0]
-                    start_row = int(start_cell[1:])
-
-                    # Initialize end cell coordinates
-                    end_col = start_col
-                    end_row = start_row
-
-                    # Find end of table in rows
-                    while ws[end_col + str(end_row)].value is not None:
-                        end_row += 1
-
-                    # Find end of table in columns
-                    while ws[end_col + str(start_row)].value is not None:
-                        if ord(end_col) < 90:  # ASCII value of 'Z'
-                            end_col = chr(ord(end_col) + 1)
-                        else:
-                            break
-
-                    # Adjust for overstepping boundaries
-                    if ord(end_col) > 65:  # ASCII value of 'A'
-                        end_col = chr(ord(end_col) - 1)
-                        
-                    end_cell = end_col + str(end_row - 1)
-                    
-                    # Return table range
-                    return sheet, start_cell, end_cell                  
-                    
-def excel_table_to_feature_class(excel_file_path, output_gdb_path, output_fc, sheet_name, start_cell, end_cell, epsg_code):
-    
-    epsg_code = int(epsg_code)
-    
-    # Load the workbook and select the sheet
-    wb = openpyxl.load_workbook(excel_file_path)
-    ws = wb[sheet_name]
-
-    # Create an empty list to store the cable strings and a dictionary to store the attributes
-    cable_strings = []
-    attributes = {}
-    string_number = 0
+def find_all_tables_in_excel(file_path, keyword):
+    # Every table, streamed like iter_tables_in_excel; a workbook without any is an error
+    tables = iter_tables_in_excel(file_path, keyword)
+    try:
+        table = next(tables, None)
+        if table is None:
+            raise ValueError(f"No table starting with '{keyword}' found in {file_path}")
+        yield table
+        yield from tables
+    finally:
+        tables.close()
+
+
+def merge_tables(tables):
+    """One table of all tables with the same headers, tagged with the source sheet and table number.
+
+    Returns (sheet, headers, table_rows, groups). table_rows streams the tables one after the other; groups,
+    the (first, last + 1) rows of every source table, is filled while table_rows is read.
+    """
+    tables = iter(tables)
+    first_table = next(tables)
+    headers = list(first_table[1])
+    groups = []
+
+    def merged_rows():
+        first = 0
+        for number, (sheet, other_headers, table_rows) in enumerate(itertools.chain([first_table], tables), 1):
+            if list(other_headers) != headers:
+                raise ValueError(f"The table in sheet '{sheet}' has other columns than the first table "
+                                 f"({other_headers} instead of {headers}), import the tables as separate feature "
+                                 f"classes")
+            count = 0
+            for row in table_rows:
+                count += 1
+                yield tuple(row) + (sheet, number)
+            groups.append((first, first + count))
+            first += count
+
+    return first_table[0], headers + SOURCE_HEADERS, merged_rows(), groups
+
+
+def table_feature_class_name(output_fc, sheet, seen):
+    # <output_fc>_<sheet>, numbered from the second table of a sheet on; seen counts the tables per sheet
+    seen[sheet] = seen.get(sheet, 0) + 1
+    name = f"{output_fc}_{sheet}"
+    if seen[sheet] > 1:
+        name += f"_{seen[sheet]}"
+    return arcpy.ValidateTableName(name)
+
+
+def cable_field_names(headers):
+    """{field name: header} of the cable feature class, String_number first."""
+    # Work on a copy of the headers found by the locator
+    headers = list(headers)
 
-    # Get the headers from the first row of the cell range
-    headers = [cell.value for cell in ws[start_cell:end_cell][0]]
-    
     # As the coordinate columns for start and end point have same names, they need to get renamed to be unique
-    replacements = {'Easting [m]': ['Start Easting [m]', 'End Easting [m]'], 
+    replacements = {'Easting [m]': ['Start Easting [m]', 'End Easting [m]'],
                     'Northing [m]': ['Start Northing [m]', 'End Northing [m]'],
                     'Depth to LAT [m]': ['Start Depth to LAT [m]', 'End Depth to LAT [m]']}
     for key, values in replacements.items():
@@ -102,183 +261,406 @@ def excel_table_to_feature_class(excel_file_path, output_gdb_path, output_fc, sh
                 headers[index] = value
         except ValueError:
             pass
-        
+
     arcpy.AddMessage(f'Header row from Excel: {headers}')
 
     # Create a dictionary to map valid field names to original headers
     field_names = {arcpy.ValidateFieldName(header): header for header in headers}
     field_names = {name.rstrip("_").replace("__","_"): value for name, value in field_names.items()}
-    
-    # Iterate through each row in the cell range (excluding the header row)
-    for row in ws[start_cell:end_cell][1:]:
-        # Create a polyline geometry object using the start and end coordinates
-        array = arcpy.Array([arcpy.Point(row[1].value, row[2].value), arcpy.Point(row[5].value, row[6].value)])
-        polyline = arcpy.Polyline(array)
-    
+
+    # String number should be the first attribute in fc table
+    return {"String_number": "String number", **field_names}
+
+
+def cable_records(table_rows, width):
+    """One plain tuple per cable: (start and end point, string number, the values of the row).
+
+    Works on any iterable of rows and yields lazily, so nothing but the current row is held here.
+    """
+    string_number = 0
+    for row in table_rows:
         # Check if the start point is 0 and increment string number
-        if row[0].value == 0:
+        if row[0] == 0:
             string_number += 1
-    
-        # Create a dictionary of attributes for the current row
-        attrs = {'String_number' : string_number}
-        attrs.update({header: value for header, value in zip(field_names, row)})
-    
-        # Append a tuple with the polyline and the attributes to the list
-        cable_strings.append((polyline, attrs))
+        yield ((row[1], row[2]), (row[5], row[6])), string_number, *row[:width]
 
-    # Define the spatial reference of the output feature class (you may need to adjust this)
-    spatial_reference = arcpy.SpatialReference(epsg_code)
-    arcpy.AddMessage(f'Create feature class: {output_fc}')
 
-    # Create a new feature class in the geodatabase
-    fc_path = os.path.join(output_gdb_path, output_fc)
-    arcpy.CreateFeatureclass_management(output_gdb_path, output_fc, 'POLYLINE', spatial_reference=spatial_reference)
+def keep_cable_columns(table_rows, chunks, chunk_size=DEFAULT_BATCH_SIZE):
+    """Pass the rows on unchanged and add the cable_columns of every chunk_size rows to the list chunks.
+
+    Lets the write pass also collect the ids and coordinates, so the workbook is not read again for them.
+    """
+    chunk = []
+    for row in table_rows:
+        chunk.append(row)
+        yield row
+        if len(chunk) == chunk_size:
+            chunks.append(cable_columns(chunk))
+            chunk = []
+    chunks.append(cable_columns(chunk))
+
 
-    # String number should be the first attribute in fc table, so an extra step is needed to get it added to field_names dict
-    string_item = ({"String_number" : "String number"})
-    field_names = {**string_item, **field_names}
+def excel_table_to_feature_class(headers, table_rows, output_gdb_path, output_fc, epsg_code, batch_size=DEFAULT_BATCH_SIZE):
+    """Write the rows of a "Start point" table as polylines into output_gdb_path/output_fc. Returns the cable count.
 
-    # Add fields for each header in the Excel table
-    # arcpy.AddField_management(fc_path, 'string_number', 'LONG', field_alias="String number")
+    table_rows can be any iterable (also a generator); rows are converted to tuples and pushed to the
+    insert cursor in batches of batch_size, so memory does not grow with the length of the table.
+    """
+    field_names = cable_field_names(headers)
+
+    # Field types: ids and numbers are short integers, the source sheet is text, everything else a double
+    fields = []
     for field_name, header in field_names.items():
-        if header in ['Start point', 'End point', "String number"]:
-            arcpy.AddField_management(fc_path, field_name, 'SHORT', field_alias=header)
+        if header in ['Start point', 'End point', "String number", "Source table"]:
+            fields.append((field_name, 'SHORT', header))
+        elif header == "Source sheet":
+            fields.append((field_name, 'TEXT', header))
         else:
-            arcpy.AddField_management(fc_path, field_name, 'DOUBLE', field_alias=header)
+            fields.append((field_name, 'DOUBLE', header))
+
+    # Define the spatial reference of the output feature class (you may need to adjust this)
+    spatial_reference = arcpy.SpatialReference(int(epsg_code))
+    arcpy.AddMessage(f'Create feature class: {output_fc}')
+
+    # Create a new feature class in the geodatabase, all fields in one schema change
+    writer = get_feature_writer("arcpy", output_gdb_path, output_fc, "POLYLINE", spatial_reference, fields)
+    writer.create()
 
-    # Use an insert cursor to add the cable strings to the new feature class
+    # Rows -> tuples -> batches -> insert cursor, one batch in memory at a time
     arcpy.AddMessage(f'Write cable strings to fc')
-    
-    try:
-        with arcpy.da.InsertCursor(fc_path, ['SHAPE@'] + list(field_names.keys())) as cursor:
-            for cable_string, attrs in cable_strings:
-                cursor.insertRow([cable_string] + [attrs[field_name].value if hasattr(attrs[field_name], 'value') else attrs[field_name] for field_name in field_names])
-    except Exception as e:
-        arcpy.AddError(f"An error occurred: {e}")
+    records = cable_records(table_rows, len(field_names) - 1)
+    count = writer.write_rows(iter_batches(records, batch_size))
     arcpy.AddMessage(f"*** Finished ***")
-   
+    return count
 
-#--------- Call function to get the sheet name and cell range
-sheet_name, start_cell, end_cell = find_table_in_excel(file_path, "Start point")
 
-# Create a new feature class in the geodatabase
-fc_path = os.path.join(output_gdb, output_fc)
+#--------- Adding LayoutName to attribute table
 
-if not arcpy.Exists(fc_path):
-    excel_table_to_feature_class(file_path, output_gdb, output_fc, sheet_name, start_cell, end_cell, spatial_reference) 
-    arcpy.AddMessage("The feature class in geodatabase is created successfully")
-else:
-    arcpy.AddMessage("The feature class already exists in geodatabase")
+def add_layout_name(fc_path, output_fc):
+    new_field_name = "LAYOUT_NAME"
 
+    # Add the new field to the feature class
+    arcpy.AddField_management(fc_path, new_field_name, "TEXT")
 
-#--------- Adding LayoutName to attribute table
+    # Update the new field with values from an existing field
+    with arcpy.da.UpdateCursor(fc_path, [new_field_name]) as cursor:
+        for row in cursor:
+            row[0] = str(output_fc)
+            cursor.updateRow(row)
+
+
+#------------ Stages of the GRID import (metadata, alias, export: see import_stages.py)
 
-new_field_name = "LAYOUT_NAME"  
-
-# Add the new field to the feature class
-arcpy.AddField_management(output_fc, new_field_name, "TEXT")
-
-# Update the new field with values from an existing field
-with arcpy.da.UpdateCursor(output_fc, [new_field_name]) as cursor:
-    for row in cursor:
-        row[0] = str(output_fc)
-        cursor.updateRow(row)
-
-    
-#--------- Metadata extracted from the data inventory file
-
-# Read dataframe = excel file
-df = pd.read_excel(data_inventory,sheet_data_inventory)
-
-# Filter the DataFrame based on the 'Full Name' column containing the search string
-filtered_df = df[df["Full Name"] == output_fc]
-arcpy.AddMessage(filtered_df)
-
-# Check if the search string was found in the DataFrame
-
-if not filtered_df.empty:
-    # Get the text from text_column in the same row
-    imported_title = filtered_df.iloc[0]["Full Name"]
-    imported_summary = filtered_df.iloc[0]["Summary"]
-    imported_tags = filtered_df.iloc[0]["Tags"]
-    imported_Description = filtered_df.iloc[0]["Description"]
-    imported_Credits = filtered_df.iloc[0]["Credits"]
-    imported_Date = str(filtered_df.iloc[0]["Date Created"])
-    imported_Description = imported_Description + "\n" + imported_Date
-    
-    new_md = md.Metadata()
-    new_md.title = imported_title
-    new_md.tags = imported_tags
-    new_md.summary = imported_summary
-    new_md.description = imported_Description
-    new_md.credits = imported_Credits
-
-    # Assign the Metadata object's content to a target item
-    tgt_item_md = md.Metadata(fc_path)
-
-    if not tgt_item_md.isReadOnly:
-        tgt_item_md.copy(new_md)
-        tgt_item_md.save()
-
-    arcpy.AddMessage("Adding metadata is completed successfully")
-    
-else:
-    arcpy.arcpy.AddMessage("Please add information into the DATA INVENTORY File (Excel)")
-    arcpy.arcpy.AddMessage("Name of feature class should be the same as in the data inventory (column Name)")
-
-
-#-------  Establishing Alias Names
-    
-# Get the describe object for the feature class
-desc = arcpy.Describe(fc_path)
-current_alias = desc.aliasName
-arcpy.AddMessage(current_alias)
-
-# Create a new alias name by replacing underscores with spaces
-new_alias = output_fc.replace("_", " ")
-
-try:
-    # Set the new alias name for the feature class
-    arcpy.AlterAliasName(fc_path, new_alias)
-    arcpy.AddMessage("Alias name changed successfully.")
-
-except Exception as e:
-    arcpy.AddMessage("An error occurred during creating alias name")
-
-
-#------  Export this feature class to Shapefile
-    
-# Create the full path to the folder where the shapefile will be save
-
-directory = os.path.dirname(file_path)
-shp_folder = os.path.join(directory, output_fc)
-shp_file = output_fc + ".shp"
-output_shp = os.path.join(shp_folder,shp_file)
-arcpy.AddMessage(output_shp)
-
-# Check if the folder already exists before creating it
-if not os.path.exists(shp_folder):
-    # If the folder does not exist, create it and convert the feature class to a shapefile
-    os.makedirs(shp_folder)
-    arcpy.FeatureClassToFeatureClass_conversion(fc_path, shp_folder, shp_file)
-    arcpy.AddMessage("Shapefile is created successfully and saved in this folder:")
-else:
-    # If the folder already exists, inform the user
-    arcpy.AddMessage("SHP Folder already exists.")
-
-
-#------ Feature class to a DWG file for CAD
-    
-# Set up paths and file names
-dwg_folder = os.path.join(shp_folder+ '_DWG')
-
-# Output DWG file
-dwg_output = os.path.join(dwg_folder, output_fc +'.dwg')
-
-# Check if the output path exists, if not, create it
-if not os.path.exists(dwg_folder):
-    os.makedirs(dwg_folder)
-    arcpy.conversion.ExportCAD(output_shp, "DWG_R2018", dwg_output, False, False)
-    arcpy.AddMessage("DWG file is created successfully and saved in this folder:")
-else:
-    arcpy.AddMessage("DWG Folder already exists.")
+def parse_stage(context):
+    #--------- Locate the table; its rows are streamed from the same pass over the workbook by the write stage
+    if context.get("table") is None:
+        if context.get("table_mode", FIRST) == MERGED:
+            tables = find_all_tables_in_excel(context["file_path"], "Start point")
+            sheet_name, headers, table_rows, context["table_groups"] = merge_tables(tables)
+            context["table"] = sheet_name, headers, table_rows
+        else:
+            context["table"] = find_table_in_excel(context["file_path"], "Start point")
+    sheet_name, headers, table_rows = context["table"]
+    arcpy.AddMessage(f"Table found in sheet '{sheet_name}' with the columns {list(headers)}")
+
+
+def cable_diff_fields(headers, existing_fields):
+    """Key fields and compared fields of the cables for diff_feature_class."""
+    field_names = cable_field_names(headers)
+    # Cable key: Start/End point (and the source table of merged tables), all other fields are compared
+    key_fields = [name for name, header in field_names.items() if header in CABLE_KEY_HEADERS]
+    value_fields = [name for name in field_names if name not in key_fields]
+    return key_fields, value_fields + (["LAYOUT_NAME"] if "LAYOUT_NAME" in existing_fields else [])
+
+
+def cable_diff_input(headers, table_rows, existing_fields, output_fc):
+    """{key: values} and {key: end points} of the cables for diff_feature_class.
+
+    Raises DuplicateKeyError when two cables of the table have the same key.
+    """
+    names = list(cable_field_names(headers))
+    key_fields, value_fields = cable_diff_fields(headers, existing_fields)
+    key_index = [names.index(name) for name in key_fields]
+    value_index = [i for i in range(len(names)) if i not in key_index]
+    layout_name = (output_fc,) if "LAYOUT_NAME" in value_fields else ()
+    pairs = []
+    shapes = {}
+    for shape, *values in cable_records(table_rows, len(names) - 1):
+        key = tuple(values[i] for i in key_index)
+        pairs.append((key, tuple(values[i] for i in value_index) + layout_name))
+        shapes[key] = shape
+    return keyed(pairs), shapes
+
+
+def write_stage(context):
+    # The one pass over the table rows: into the feature class, or into the cables to match for update mode DIFF.
+    # The ids and coordinates of the cables are kept on the way for the topology check and the network.
+    sheet_name, headers, table_rows = context["table"]
+    chunks = []
+    rows = keep_cable_columns(table_rows, chunks)
+    if arcpy.Exists(context["fc_path"]):
+        context["existed"] = True
+        existing_fields = {field.name for field in arcpy.ListFields(context["fc_path"])}
+        missing = [name for name in cable_field_names(headers) if name not in existing_fields]
+        if context.get("update_mode", REBUILD) != DIFF:
+            arcpy.AddMessage("The feature class already exists in geodatabase")
+            deque(rows, maxlen=0)
+            context["cable_columns"] = np.concatenate(chunks)
+            return 0
+        existing = None
+        if not missing:
+            key_fields, value_fields = cable_diff_fields(headers, existing_fields)
+            try:
+                existing = read_keyed_rows(context["fc_path"], key_fields, value_fields)
+            except DuplicateKeyError as e:
+                # Cables of the feature class that cannot be matched one to one
+                arcpy.AddWarning(f"{e}, rebuilding the feature class instead of applying the changes")
+        if existing is not None:
+            # Two cables of the table with the same key end the import here, before anything is written
+            incoming, shapes = cable_diff_input(headers, rows, existing_fields, context["output_fc"])
+            context["diff_input"] = key_fields, value_fields, incoming, shapes, existing
+            context["cable_columns"] = np.concatenate(chunks)
+            return len(incoming)
+        if missing:
+            # Another table layout: nothing to match the rows against
+            arcpy.AddWarning(f"The feature class has no field(s) {missing} of the new table, rebuilding it")
+        arcpy.management.Delete(context["fc_path"])
+        context["existed"] = False
+
+    try:
+        context["rows"] = excel_table_to_feature_class(headers, rows, context["output_gdb"], context["output_fc"],
+                                                       context["spatial_reference"])
+    except Exception:
+        # The rows are checked while they are written (e.g. the columns of the merged tables): a failure leaves
+        # no half-written feature class that the next run would take as existing
+        if arcpy.Exists(context["fc_path"]):
+            arcpy.management.Delete(context["fc_path"])
+        raise
+    context["cable_columns"] = np.concatenate(chunks)
+    if context.get("table_groups"):
+        arcpy.AddMessage(f"{len(context['table_groups'])} tables merged into one feature class")
+    arcpy.AddMessage(f"The feature class in geodatabase is created successfully with {context['rows']} cables")
+    return context["rows"]
+
+
+def table_columns(context):
+    # Ids and coordinates of the cables, kept by the write stage (or read from the table when it was skipped)
+    if context.get("cable_columns") is None:
+        sheet_name, headers, table_rows = context["table"]
+        context["cable_columns"] = cable_columns(table_rows)
+    return context["cable_columns"]
+
+
+def topology_stage(context):
+    # Fail fast on broken cable strings, before the network, metadata and exports
+    columns = table_columns(context)
+    # Tables merged from several sources are separate networks, each validated on its own
+    issues = []
+    for first, last in context.get("table_groups") or [(0, len(columns))]:
+        issues.extend(issue._replace(row=issue.row + first if issue.row > 0 else issue.row)
+                      for issue in validate_topology(columns[first:last]))
+    context["topology_issues"] = issues
+    issues_path = write_issues(issues, context["output_gdb"], context["output_fc"])
+    errors = [issue for issue in issues if issue.severity == ERROR]
+    for issue in issues[:20]:
+        arcpy.AddWarning(f"{issue.severity} {issue.kind}: {issue.detail}" + (f" (row {issue.row})" if issue.row > 0 else ""))
+    if issues_path:
+        arcpy.AddWarning(f"{len(issues)} topology issues, all of them are listed in {issues_path}")
+    if errors and context.get("fail_on_topology", True):
+        raise TopologyError(f"{len(errors)} topology errors in the cable strings of {context['file_path']}", issues)
+    return len(columns)
+
+
+def diff_stage(context):
+    # Update mode DIFF on an existing feature class: only the inserted, changed and deleted cables are written
+    if "diff_input" not in context:
+        return None
+    key_fields, value_fields, incoming, shapes, existing = context.pop("diff_input")
+
+    spatial_reference = arcpy.SpatialReference(int(context["spatial_reference"]))
+    def to_shape(key, values):
+        return arcpy.Polyline(arcpy.Array([arcpy.Point(x, y) for x, y in shapes[key]]), spatial_reference)
+
+    context["changes"] = diff_feature_class(context["fc_path"], key_fields, value_fields, incoming, to_shape,
+                                            context["export_folder"], context["output_fc"], existing=existing)
+    context["rows"] = len(incoming)
+    return len(context["changes"])
+
+
+def network_stage(context):
+    # Node feature class and edge table of the cable network, from the columns the topology check read
+    columns = table_columns(context) if context.get("changes") != [] else None
+    context.pop("table")
+    context.pop("cable_columns", None)
+    if columns is None:
+        return 0
+    groups = context.get("table_groups") or []
+    if len(groups) > 1:
+        # Merged tables share one graph only when no WTG id (other than the OSS) repeats across them
+        ids = [set(np.unique(columns[first:last][:, [0, 4]]).tolist()) for first, last in groups]
+        if sum(len(group - {0}) for group in ids) != len(set().union(*ids) - {0}):
+            arcpy.AddWarning("WTG ids repeat across the merged tables, no cable network written; "
+                             "import the tables as separate feature classes for one network per table")
+            return 0
+    network = network_from_table(columns)
+    context["network"] = network
+    nodes_path, edges_path = write_network(network, context["output_gdb"], context["output_fc"],
+                                           context["spatial_reference"])
+    arcpy.AddMessage(f"Cable network with {len(network)} nodes written to {nodes_path} and {edges_path}")
+    return len(network.edge_from)
+
+
+def layout_name_stage(context):
+    # Cables written by a diff got their layout name with the other fields
+    if "changes" in context:
+        return None
+    add_layout_name(context["fc_path"], context["output_fc"])
+
+
+GRID_PIPELINE = Pipeline("GRID import", [
+    Stage("cache", cache_stage),
+    Stage("parse", parse_stage),
+    Stage("write", write_stage),
+    Stage("topology", topology_stage),
+    Stage("diff", diff_stage),
+    Stage("network", network_stage),
+    Stage("layout_name", layout_name_stage),
+    Stage("metadata", metadata_stage),
+    Stage("alias", alias_stage),
+    Stage("export", export_stage),
+    Stage("manifest", manifest_stage),
+])
+
+
+#------------ Whole import of one workbook
+
+def grid_import_key(file_path, spatial_reference, data_inventory, sheet_data_inventory, table_mode=FIRST, skip=(),
+                    export_formats=DEFAULT_FORMATS, overwrite_exports=False, export_archive=None):
+    # Everything the import depends on: workbook bytes, spatial reference, inventory, which tables and the stages
+    # and exports of the run
+    options = {"tool": "GRID", "keyword": "Start point", "spatial_reference": str(spatial_reference),
+               "data_inventory": file_signature(data_inventory), "sheet_data_inventory": sheet_data_inventory,
+               **run_options(skip, export_formats, overwrite_exports, export_archive)}
+    if table_mode != FIRST:
+        options["table_mode"] = table_mode
+    return import_key(file_path, options)
+
+
+def import_grid_layout(file_path, spatial_reference, output_gdb, output_fc, data_inventory, sheet_data_inventory,
+                       skip=(), table=None, use_cache=True, export_formats=DEFAULT_FORMATS, overwrite_exports=False,
+                       export_archive=None, table_mode=FIRST, update_mode=REBUILD, run_report=True, profile=None):
+    """Import the IAC table of one workbook into output_gdb/output_fc. Returns the number of cables written.
+
+    skip names stages of GRID_PIPELINE not to run, e.g. ("export",).
+    table is the (sheet_name, headers, table_rows) result of find_table_in_excel, if the caller located it already.
+    With use_cache an existing feature class is kept only when the import manifest of output_gdb shows that it
+    was built from the same workbook with the same options; otherwise it is rebuilt.
+
+    export_formats are the formats of the export stage (see feature_export.py); existing outputs are
+    replaced with overwrite_exports, export_archive is a zip file that receives all of them.
+
+    table_mode: FIRST imports the first "Start point" table, MERGED all tables into output_fc with their
+    source sheet and table number, SEPARATE every table into its own <output_fc>_<sheet> feature class.
+    The workbook is read once in every mode: the write stage streams the rows of a table from the same pass
+    that found it. No table is held in memory, only the ids and coordinates of the cables (56 bytes per cable)
+    for the topology check and the network. With SEPARATE the export archive is named per feature class.
+
+    update_mode DIFF matches the table against an existing feature class by Start/End point and writes only the
+    inserted, changed and deleted cables, after the topology check, with a change report <output_fc>_changes.csv
+    (see layout_diff.py); network and exports are redone only when something changed. REBUILD (default) keeps an
+    existing feature class as it is unless the import manifest shows the workbook changed.
+
+    run_report writes the timing of the stages as <output_fc>_run_report.json into the folder of the workbook (or
+    to the given path); profile CPROFILE, TRACEMALLOC or ALL adds a profile of the run (see instrumentation.py).
+    """
+    arcpy.env.workspace = output_gdb
+    table_mode = (table_mode or FIRST).upper()
+    if table_mode not in (FIRST, MERGED, SEPARATE):
+        raise ValueError(f"Unknown table mode {table_mode}, use {FIRST}, {MERGED} or {SEPARATE}")
+
+    skip = set(skip)
+    if not use_cache:
+        skip.update(["cache", "manifest"])
+
+    parameters = {"file_path": file_path, "output_fc": output_fc, "skip": sorted(skip), "export_formats": export_formats,
+                  "table_mode": table_mode, "update_mode": update_mode}
+    with RunReport(f"GRID import of {output_fc}", parameters,
+                   report_path(run_report, os.path.dirname(file_path), output_fc), profile) as run:
+        # Separate feature classes: one pipeline run per table, the tables streamed from one scan of the workbook
+        if table_mode == SEPARATE and table is None:
+            tables = find_all_tables_in_excel(file_path, "Start point")
+        else:
+            tables = [table]
+
+        rows = 0
+        output_fcs = []
+        seen = {}
+        for table in tables:
+            if table_mode == SEPARATE:
+                output_fc = table_feature_class_name(parameters["output_fc"], table[0], seen)
+            output_fcs.append(output_fc)
+            context = {
+                "tool": "GRID",
+                "file_path": file_path, "table": table, "table_mode": table_mode,
+                "spatial_reference": spatial_reference,
+                "output_gdb": output_gdb, "output_fc": output_fc, "fc_path": os.path.join(output_gdb, output_fc),
+                "data_inventory": data_inventory, "sheet_data_inventory": sheet_data_inventory,
+                # Shapefile and DWG folders go into the folder of the workbook
+                "export_folder": os.path.dirname(file_path),
+                "export_formats": export_formats, "overwrite_exports": overwrite_exports,
+                "export_archive": export_archive, "update_mode": (update_mode or REBUILD).upper(),
+            }
+            if export_archive and table_mode == SEPARATE:
+                context["export_archive"] = os.path.splitext(export_archive)[0] + f"_{output_fc}.zip"
+            if use_cache:
+                context["import_key"] = grid_import_key(file_path, spatial_reference, data_inventory,
+                                                        sheet_data_inventory, table_mode, skip, export_formats,
+                                                        overwrite_exports, context["export_archive"])
+
+            GRID_PIPELINE.run(context, skip=skip)
+            rows += context.get("rows", 0)
+        if table_mode == SEPARATE:
+            arcpy.AddMessage(f"{len(output_fcs)} tables imported: {', '.join(output_fcs)}")
+        run.totals["rows"] = rows
+    return rows
+
+
+if __name__ == "__main__":
+    #------------ Inputs
+    # Define input parameters fetched from the user or other sources
+
+    file_path = arcpy.GetParameterAsText(0)
+
+    spatial_reference = arcpy.GetParameterAsText(1)
+
+    output_gdb = arcpy.GetParameterAsText(2)
+
+    output_fc = arcpy.GetParameterAsText(3)
+
+    data_inventory = arcpy.GetParameterAsText(4)
+
+    sheet_data_inventory = arcpy.GetParameterAsText(5)
+
+    # Optional: stages to skip (separated by ";"), e.g. export
+    skip = [stage.strip() for stage in arcpy.GetParameterAsText(6).split(";") if stage.strip()]
+
+    # Optional: export formats (SHP;DWG;GPKG;FGB;PARQUET, default SHP;DWG), overwrite existing outputs, zip them
+    export_formats = parse_formats(arcpy.GetParameterAsText(7))
+    overwrite_exports = arcpy.GetParameterAsText(8).lower() == "true"
+    export_archive = None
+    if arcpy.GetParameterAsText(9).lower() == "true":
+        export_archive = os.path.join(os.path.dirname(file_path), output_fc + ".zip")
+
+    # Optional: FIRST (default), MERGED or SEPARATE when the workbook has several "Start point" tables
+    table_mode = arcpy.GetParameterAsText(10) or FIRST
+
+    # Optional: REBUILD (default) or DIFF to apply only the changes to an existing feature class
+    update_mode = arcpy.GetParameterAsText(11) or REBUILD
+
+    # Optional: CPROFILE, TRACEMALLOC or ALL to profile the run into the run report
+    profile = arcpy.GetParameterAsText(12) or None
+
+    import_grid_layout(file_path, spatial_reference, output_gdb, output_fc, data_inventory, sheet_data_inventory,
+                       skip=skip, export_formats=export_formats, overwrite_exports=overwrite_exports,
+                       export_archive=export_archive, table_mode=table_mode, update_mode=update_mode,
+                       profile=profile)
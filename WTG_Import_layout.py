@@ -1,202 +1,362 @@
-
-
 """
-Name: Import WTG layout 
+Name: Import WTG layout
 Autor: Andrea Sulova
 Date: 4th Dec 2024
 
-Description: This script imports data from an Excel file into a geodatabase
-as a feature class, adds coordinates to the attribute table, extracts metadata
-from an inventory file, establishes alias names, and exports the feature class
-to Shapefile and DWG formats.
+Description: This script imports data from an Excel file (or a CSV/Parquet
+file or a layout store, streamed in chunks) into a geodatabase as a feature
+class, adds coordinates to the attribute table, extracts metadata from an
+inventory file, establishes alias names, and exports the feature class to
+Shapefile and DWG formats.
+
+The steps are stages of a pipeline (see pipeline.py), so the import can also
+be run from batch_import.py and the time of every step is reported.
 """
 
 import os
 import arcpy
-import zipfile
 import pandas as pd
-from arcpy import metadata as md
-
-#------------ Inputs
-# Define input parameters fetched from the user or other sources
-file_path = arcpy.GetParameterAsText(0)
-
-sheet = arcpy.GetParameterAsText(1)
-
-ID_Column = arcpy.GetParameterAsText(2)
-
-X_Column = arcpy.GetParameterAsText(3)
-
-Y_Column = arcpy.GetParameterAsText(4)
-
-spatial_reference = arcpy.GetParameterAsText(5)
+from feature_writers import get_feature_writer, write_points
+from layout_store import LayoutStore, is_layout_store
+from coordinate_enrichment import ETRS89, enrich_coordinates, target_for_epsg
+from import_manifest import file_signature, import_key, run_options
+from feature_export import DEFAULT_FORMATS, parse_formats
+from layout_diff import DIFF, REBUILD, DuplicateKeyError, diff_feature_class, keyed, written_oids
+from import_stages import alias_stage, cache_stage, export_stage, manifest_stage, metadata_stage
+from instrumentation import RunReport, report_path
+from pipeline import Pipeline, Stage
 
-output_gdb = arcpy.GetParameterAsText(6)
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
 
-output_fc = arcpy.GetParameterAsText(7)
+# Rows per chunk when CSV and Parquet inputs are streamed into the feature class
+CHUNK_SIZE = 100000
 
-data_inventory = arcpy.GetParameterAsText(8)
+CSV_EXTENSIONS = (".csv", ".txt", ".csv.gz")
+PARQUET_EXTENSIONS = (".parquet", ".pq")
 
-arcpy.env.workspace = output_gdb
 
 # -------- Import excel files to Dataframe
 
-# Split the file path into directory and file name
-directory, filename = os.path.split(file_path)
-
-# Read dataframe = excel file
-df = pd.read_excel(directory, sheet_name = sheet)
-
-# Remove space in columns at the end of name
-df.columns = df.columns.str.rstrip()
-
-# Create a new feature class in the geodatabase
-fc_path = os.path.join(output_gdb, output_fc)
-
-# Delete the feature class if it exists
-if arcpy.Exists(fc_path):
-    arcpy.AddMessage("Feature class already exit in Geodatabase")
-    # exit()
-    arcpy.management.Delete(fc_path)
-
-# Check if the feature class does not exist and create it
-if not arcpy.Exists(fc_path):
-    arcpy.CreateFeatureclass_management(output_gdb, output_fc, "POINT", spatial_reference= spatial_reference)
+def input_format(file_path):
+    # EXCEL, CSV, PARQUET or LAYOUT (a layout store folder) from the file extension
+    if is_layout_store(file_path):
+        return "LAYOUT"
+    name = file_path.lower()
+    if name.endswith(CSV_EXTENSIONS):
+        return "CSV"
+    if name.endswith(PARQUET_EXTENSIONS):
+        return "PARQUET"
+    return "EXCEL"
+
+
+def read_wtg_table(file_path, sheet, ID_Column, X_Column, Y_Column):
+    # Read dataframe = excel file
+    df = pd.read_excel(file_path, sheet_name = sheet)
+
+    # Remove space in columns at the end of name
+    df.columns = df.columns.str.rstrip()
+    return df
+
+
+def _source_columns(names, ID_Column, X_Column, Y_Column):
+    # {column name in the file: ID/X/Y column name}, matching like the Excel path (spaces at the end removed)
+    stripped = {str(name).rstrip(): name for name in names}
+    missing = [column for column in (ID_Column, X_Column, Y_Column) if column not in stripped]
+    if missing:
+        raise ValueError(f"Column(s) {missing} not found in the file, available columns: {list(stripped)}")
+    return {stripped[column]: column for column in (ID_Column, X_Column, Y_Column)}
+
+
+def iter_wtg_chunks(file_path, ID_Column, X_Column, Y_Column, chunk_size=CHUNK_SIZE):
+    """DataFrames of at most chunk_size rows with the ID/X/Y columns of a CSV or Parquet file or a layout store.
+
+    Only the three columns are read, and only one chunk is in memory at a time.
+    """
+    if input_format(file_path) == "LAYOUT":
+        # Slices of the memory maps, nothing to parse
+        store = LayoutStore(file_path)
+        columns = _source_columns(store.names, ID_Column, X_Column, Y_Column)
+        for start in range(0, len(store), chunk_size):
+            yield pd.DataFrame({column: store[source][start:start + chunk_size] for source, column in columns.items()})
+    elif input_format(file_path) == "CSV":
+        columns = _source_columns(pd.read_csv(file_path, nrows=0).columns, ID_Column, X_Column, Y_Column)
+        id_source = next(source for source, column in columns.items() if column == ID_Column)
+        for chunk in pd.read_csv(file_path, usecols=list(columns), dtype={id_source: str}, chunksize=chunk_size):
+            yield chunk.rename(columns=columns)
+    else:
+        if pq is None:
+            raise RuntimeError("Parquet input needs pyarrow")
+        parquet_file = pq.ParquetFile(file_path)
+        columns = _source_columns(parquet_file.schema_arrow.names, ID_Column, X_Column, Y_Column)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=list(columns)):
+            yield batch.to_pandas().rename(columns=columns)
+
+
+def validate_wtg_table(df, ID_Column, X_Column, Y_Column, seen_ids=None):
+    # seen_ids: IDs of the chunks validated before, to find duplicates across chunks
+    # All three columns have to be there
+    missing = [column for column in (ID_Column, X_Column, Y_Column) if column not in df.columns]
+    if missing:
+        raise ValueError(f"Column(s) {missing} not found in the sheet, available columns: {list(df.columns)}")
+
+    # Rows without coordinates cannot become points
+    no_coordinates = df[X_Column].isna() | df[Y_Column].isna()
+    if no_coordinates.any():
+        arcpy.AddWarning(f"{int(no_coordinates.sum())} rows without coordinates are skipped")
+        df = df[~no_coordinates]
+
+    duplicated = df[ID_Column].duplicated()
+    if seen_ids is not None:
+        ids = df[ID_Column].astype(str)
+        duplicated |= ids.isin(seen_ids)
+        seen_ids.update(ids)
+    if duplicated.any():
+        arcpy.AddWarning(f"Duplicated WTG IDs: {sorted(df.loc[duplicated, ID_Column].astype(str).unique())[:50]}")
+    return df
+
+
+def write_wtg_feature_class(frames, ID_Column, X_Column, Y_Column, spatial_reference, output_gdb, output_fc):
+    # frames: one DataFrame (Excel) or an iterable of chunks (CSV/Parquet), written one after the other
+    if isinstance(frames, pd.DataFrame):
+        frames = [frames]
+
+    # Create a new feature class in the geodatabase
+    fc_path = os.path.join(output_gdb, output_fc)
+
+    # Delete the feature class if it exists
+    if arcpy.Exists(fc_path):
+        arcpy.AddMessage("Feature class already exit in Geodatabase")
+        arcpy.management.Delete(fc_path)
 
     # Define fields from Excel columns and their data types
     field_mappings = [("ID", "TEXT"), ("Point_X", "DOUBLE"), ("Point_Y", "DOUBLE")]
 
-    # Add fields to the feature class
-    for field_name, data_type in field_mappings:
-        arcpy.management.AddField(fc_path, field_name, data_type)
+    # Create the feature class with its fields and insert the points in batches
+    writer = get_feature_writer("arcpy", output_gdb, output_fc, "POINT", spatial_reference, field_mappings)
+    writer.create()
 
-    # Iterate through Excel data and insert rows into the feature class
-    with arcpy.da.InsertCursor(fc_path, ["SHAPE@", "ID", "Point_X", "Point_Y"]) as cursor:
-        for index, row in df.iterrows():
-            # Get X and Y coordinates from Excel (assuming columns "Longitude" and "Latitude")
-            x, y  = row.loc[X_Column], row.loc[Y_Column]
-            # Create a point geometry
-            point = arcpy.Point(x, y)
-            # Create a new row with point geometry and other attributes
-            cursor.insertRow([arcpy.PointGeometry(point, spatial_reference), str(row[ID_Column]), str(row[X_Column]), float(row[Y_Column])])
+    row_count = 0
+    for df in frames:
+        # Pull the ID/X/Y columns out as NumPy arrays instead of walking the DataFrame with iterrows()
+        ids = df[ID_Column].astype(str).to_numpy()
+        xs = df[X_Column].to_numpy(dtype="float64")
+        ys = df[Y_Column].to_numpy(dtype="float64")
+        row_count += write_points(writer, xs, ys, [ids, xs, ys])
+    arcpy.AddMessage(f"{row_count} points written to the feature class")
 
-arcpy.AddMessage("The feature class in geodatabase is created successfully")
+    arcpy.AddMessage("The feature class in geodatabase is created successfully")
+    return fc_path, row_count
 
 
 # -------- Adding  coordinates to the attribute table
 
-# Add geometry attributes
-geom_props = "POINT_X_Y_Z_M"
-arcpy.AddGeometryAttributes_management(fc_path, geom_props , "", "", spatial_reference)
-
-# Rename the fields POINT_X and POINT_Y to X_COORD and Y_COORD
-arcpy.AlterField_management(fc_path, "POINT_X", "X", "X")
-arcpy.AlterField_management(fc_path, "POINT_Y", "Y", "Y")
-
-# Set the output coordinate system
-out_sr = arcpy.SpatialReference(4258)   # ETRS1989 - 4258
-geom_props = "POINT_X_Y_Z_M"
-arcpy.AddGeometryAttributes_management(fc_path, geom_props , "", "", out_sr)
-
-# Rename the fields POINT_X and POINT_Y to X_COORD and Y_COORD
-arcpy.AlterField_management(fc_path, "POINT_X", "X_ETRS", "X [ETRS 1989]")
-arcpy.AlterField_management(fc_path, "POINT_Y", "Y_ETRS", "Y [ETRS 1989]")
-arcpy.AddMessage("XY coordinates are added successfully")
-
-
-#--------- Metadata extracted from the data inventory file
-
-# Read the Excel file into a DataFrame
-df = pd.read_excel(data_inventory)
-
-# Filter the DataFrame based on the 'Full Name' column containing the search string
-filtered_df = df[df["Full Name"] == output_fc]
-
-# Check if the search string was found in the DataFrame
-
-if not filtered_df.empty:
-    # Get the text from text_column in the same row
-    imported_title = filtered_df.iloc[0]["Full Name"]
-    imported_summary = filtered_df.iloc[0]["Summary"]
-    imported_tags = filtered_df.iloc[0]["Tags"]
-    imported_Description = filtered_df.iloc[0]["Description"]
-    imported_Credits = filtered_df.iloc[0]["Credits"]
-    imported_Date = str(filtered_df.iloc[0]["Date Created"])
-    imported_Description = imported_Description + "\n" + imported_Date
-else:
-    arcpy.arcpy.AddMessage("Please add information into the DATA INVENTORY File (Excel)")
-    arcpy.arcpy.AddMessage("Name of feature class should be the same as in the data inventory (column Name)")
-    # exit()
-
-# Create a new Metadata object and add some content to it
-new_md = md.Metadata()
-new_md.title = imported_title
-new_md.tags = imported_tags
-new_md.summary = imported_summary
-new_md.description = imported_Description
-new_md.credits = imported_Credits
-
-# Assign the Metadata object's content to a target item
-tgt_item_md = md.Metadata(fc_path)
-
-if not tgt_item_md.isReadOnly:
-    tgt_item_md.copy(new_md)
-    tgt_item_md.save()
-
-arcpy.AddMessage("Adding metadata is completed successfully")
-
-
-#-------  Establishing Alias Names
-    
-# Get the describe object for the feature class
-desc = arcpy.Describe(fc_path)
-current_alias = desc.aliasName
-arcpy.AddMessage(current_alias)
-
-# Create a new alias name by replacing underscores with spaces
-new_alias = output_fc.replace("_", " ")
-
-try:
-    # Set the new alias name for the feature class
-    arcpy.AlterAliasName(fc_path, new_alias)
-    arcpy.AddMessage("Alias name changed successfully.")
-
-except Exception as e:
-    arcpy.AddMessage("An error occurred during creating alias name")
-
-
-#------  Export this feature class to Shapefile
-    
-# Create the full path to the folder where the shapefile will be save
-directory = os.path.dirname(directory)
-shp_folder = os.path.join(directory, output_fc)
-shp_file = output_fc + ".shp"
-output_shp = os.path.join(shp_folder,shp_file)
-arcpy.AddMessage(output_shp)
-
-# Check if the folder already exists before creating it
-if not os.path.exists(shp_folder):
-    # If the folder does not exist, create it and convert the feature class to a shapefile
-    os.makedirs(shp_folder)
-    arcpy.FeatureClassToFeatureClass_conversion(fc_path, shp_folder, shp_file)
-    arcpy.AddMessage("Shapefile is created successfully and saved in this folder:")
-else:
-    # If the folder already exists, inform the user
-    arcpy.AddMessage("SHP Folder already exists.")
-
-
-#------ Feature class to a DWG file for CAD
-    
-# Set up paths and file names
-dwg_folder = os.path.join(shp_folder+ '_DWG')
-
-# Output DWG file
-dwg_output = os.path.join(dwg_folder, output_fc +'.dwg')
-
-# Check if the output path exists, if not, create it
-if not os.path.exists(dwg_folder):
-    os.makedirs(dwg_folder)
-    arcpy.conversion.ExportCAD(output_shp, "DWG_R2018", dwg_output, False, False)
-    arcpy.AddMessage("DWG file is created successfully and saved in this folder:")
-else:
-    arcpy.AddMessage("DWG Folder already exists.")
+def add_coordinates(fc_path, extra_crs=(), oids=None):
+    # Native X/Y and X/Y [ETRS 1989] (plus any extra EPSG codes) from one read and one update pass; oids limits
+    # them to the rows a diff wrote
+    targets = [ETRS89] + [target_for_epsg(epsg) for epsg in extra_crs if int(epsg) != ETRS89.crs]
+    enrich_coordinates(fc_path, ("X", "Y"), targets, oids)
+    arcpy.AddMessage("XY coordinates are added successfully")
+
+
+#------------ Stages of the WTG import (metadata, alias, export: see import_stages.py)
+
+def parse_stage(context):
+    # Excel is read as a whole; CSV and Parquet are read lazily in chunks while the write stage consumes them
+    if input_format(context["file_path"]) == "EXCEL":
+        context["df"] = read_wtg_table(context["file_path"], context["sheet"], context["ID_Column"],
+                                       context["X_Column"], context["Y_Column"])
+        return len(context["df"])
+    chunk_size = context.get("chunk_size", CHUNK_SIZE)
+    arcpy.AddMessage(f"{input_format(context['file_path'])} input, streamed in chunks of {chunk_size} rows")
+    context["df"] = iter_wtg_chunks(context["file_path"], context["ID_Column"], context["X_Column"],
+                                    context["Y_Column"], chunk_size)
+
+
+def validate_stage(context):
+    if isinstance(context["df"], pd.DataFrame):
+        context["df"] = validate_wtg_table(context["df"], context["ID_Column"], context["X_Column"], context["Y_Column"])
+        return len(context["df"])
+    # Chunks are validated as they are read, duplicates are tracked across chunks
+    seen_ids = set()
+    context["df"] = (validate_wtg_table(chunk, context["ID_Column"], context["X_Column"], context["Y_Column"], seen_ids)
+                     for chunk in context["df"])
+
+
+def diff_stage(context):
+    # Update mode DIFF on an existing feature class: only the inserted, moved and deleted WTGs are written
+    if context.get("update_mode", REBUILD) != DIFF or not arcpy.Exists(context["fc_path"]):
+        return None
+    frames = context.pop("df")
+    # Kept until the diff is applied, the write stage rebuilds from them when it cannot be
+    frames = [frames] if isinstance(frames, pd.DataFrame) else list(frames)
+    pairs = []
+    for df in frames:
+        ids = df[context["ID_Column"]].astype(str).tolist()
+        xs = df[context["X_Column"]].to_numpy(dtype="float64").tolist()
+        ys = df[context["Y_Column"]].to_numpy(dtype="float64").tolist()
+        pairs.extend(zip(ids, zip(xs, ys)))
+    try:
+        incoming = keyed(pairs)
+        context["changes"] = diff_feature_class(context["fc_path"], ["ID"], ["Point_X", "Point_Y"], incoming,
+                                                lambda key, values: values, context["export_folder"],
+                                                context["output_fc"], shape_token="SHAPE@XY")
+    except DuplicateKeyError as e:
+        # Duplicated WTG IDs cannot be matched one to one, nothing was written yet
+        arcpy.AddWarning(f"{e}, rebuilding the feature class instead of applying the changes")
+        context["df"] = frames
+        return None
+    context["rows"] = len(incoming)
+    return len(context["changes"])
+
+
+def write_stage(context):
+    if "changes" in context:
+        return None
+    context["fc_path"], context["rows"] = write_wtg_feature_class(
+        context.pop("df"), context["ID_Column"], context["X_Column"], context["Y_Column"],
+        context["spatial_reference"], context["output_gdb"], context["output_fc"])
+    return context["rows"]
+
+
+def enrich_stage(context):
+    # After a diff only the inserted and moved points get new coordinates
+    if "changes" in context:
+        oids = written_oids(context["changes"])
+        if not oids:
+            return None
+        add_coordinates(context["fc_path"], context["extra_crs"], oids)
+        return len(oids)
+    add_coordinates(context["fc_path"], context["extra_crs"])
+    return context.get("rows")
+
+
+WTG_PIPELINE = Pipeline("WTG import", [
+    Stage("cache", cache_stage),
+    Stage("parse", parse_stage),
+    Stage("validate", validate_stage),
+    Stage("diff", diff_stage),
+    Stage("write", write_stage),
+    Stage("enrich", enrich_stage),
+    Stage("metadata", metadata_stage),
+    Stage("alias", alias_stage),
+    Stage("export", export_stage),
+    Stage("manifest", manifest_stage),
+])
+
+
+#------------ Whole import of one workbook
+
+def wtg_import_key(file_path, sheet, ID_Column, X_Column, Y_Column, spatial_reference, data_inventory, extra_crs=(),
+                   skip=(), export_formats=DEFAULT_FORMATS, overwrite_exports=False, export_archive=None):
+    # Everything the import depends on: workbook bytes, sheet, column mapping, spatial reference, inventory and
+    # the stages and exports of the run
+    return import_key(file_path, {"tool": "WTG", "sheet": sheet, "columns": [ID_Column, X_Column, Y_Column],
+                                  "spatial_reference": str(spatial_reference), "extra_crs": [str(epsg) for epsg in extra_crs],
+                                  "data_inventory": file_signature(data_inventory),
+                                  **run_options(skip, export_formats, overwrite_exports, export_archive)})
+
+
+def import_wtg_layout(file_path, sheet, ID_Column, X_Column, Y_Column, spatial_reference, output_gdb, output_fc,
+                      data_inventory, skip=(), use_cache=True, extra_crs=(), export_formats=DEFAULT_FORMATS,
+                      overwrite_exports=False, export_archive=None, chunk_size=CHUNK_SIZE, update_mode=REBUILD,
+                      run_report=True, profile=None):
+    """Import one WTG workbook into output_gdb/output_fc. Returns the number of points of the layout, also after a
+    diff that wrote only some of them.
+
+    skip names stages of WTG_PIPELINE not to run, e.g. ("export",).
+    With use_cache the import is skipped when the import manifest of output_gdb shows that
+    the feature class was built from the same workbook with the same options.
+    extra_crs are EPSG codes whose X/Y are added next to the native and ETRS89 coordinates.
+
+    export_formats are the formats of the export stage (see feature_export.py); existing outputs are
+    replaced with overwrite_exports, export_archive is a zip file that receives all of them.
+    file_path can also be a CSV or Parquet file or a layout store (sheet is ignored), read in chunks of chunk_size rows.
+
+    update_mode DIFF matches the workbook against an existing feature class by WTG ID and writes only the
+    inserted, moved and deleted points, with a change report <output_fc>_changes.csv next to the exports
+    (see layout_diff.py); the exports are redone only when something changed, and only the written points get
+    new coordinates. REBUILD writes it anew.
+
+    run_report writes the timing of the stages as <output_fc>_run_report.json next to the exports (or to the
+    given path); profile CPROFILE, TRACEMALLOC or ALL adds a profile of the run (see instrumentation.py).
+    """
+    arcpy.env.workspace = output_gdb
+
+    context = {
+        "tool": "WTG",
+        "file_path": file_path, "sheet": sheet,
+        "ID_Column": ID_Column, "X_Column": X_Column, "Y_Column": Y_Column,
+        "spatial_reference": spatial_reference, "extra_crs": extra_crs, "chunk_size": chunk_size,
+        "output_gdb": output_gdb, "output_fc": output_fc, "fc_path": os.path.join(output_gdb, output_fc),
+        "data_inventory": data_inventory,
+        # Shapefile and DWG folders go next to the folder of the workbook
+        "export_folder": os.path.dirname(os.path.dirname(file_path)),
+        "export_formats": export_formats, "overwrite_exports": overwrite_exports, "export_archive": export_archive,
+        "update_mode": (update_mode or REBUILD).upper(),
+    }
+    skip = set(skip)
+    if use_cache:
+        context["import_key"] = wtg_import_key(file_path, sheet, ID_Column, X_Column, Y_Column, spatial_reference,
+                                               data_inventory, extra_crs, skip, export_formats, overwrite_exports,
+                                               export_archive)
+    else:
+        skip.update(["cache", "manifest"])
+
+    parameters = {"file_path": file_path, "sheet": sheet, "output_fc": output_fc, "skip": sorted(skip),
+                  "export_formats": export_formats, "update_mode": context["update_mode"], "chunk_size": chunk_size}
+    with RunReport(f"WTG import of {output_fc}", parameters,
+                   report_path(run_report, context["export_folder"], output_fc), profile) as run:
+        WTG_PIPELINE.run(context, skip=skip)
+        run.totals["rows"] = context.get("rows", 0)
+    return context.get("rows", 0)
+
+
+if __name__ == "__main__":
+    #------------ Inputs
+    # Define input parameters fetched from the user or other sources
+    # Excel workbook, or a CSV/Parquet file or layout store with the same ID/X/Y columns (the sheet is not used then)
+    file_path = arcpy.GetParameterAsText(0)
+
+    sheet = arcpy.GetParameterAsText(1)
+
+    ID_Column = arcpy.GetParameterAsText(2)
+
+    X_Column = arcpy.GetParameterAsText(3)
+
+    Y_Column = arcpy.GetParameterAsText(4)
+
+    spatial_reference = arcpy.GetParameterAsText(5)
+
+    output_gdb = arcpy.GetParameterAsText(6)
+
+    output_fc = arcpy.GetParameterAsText(7)
+
+    data_inventory = arcpy.GetParameterAsText(8)
+
+    # Optional: extra coordinate systems (EPSG codes separated by ";") for additional X/Y columns
+    extra_crs = [epsg.strip() for epsg in arcpy.GetParameterAsText(9).split(";") if epsg.strip()]
+
+    # Optional: stages to skip (separated by ";"), e.g. export
+    skip = [stage.strip() for stage in arcpy.GetParameterAsText(10).split(";") if stage.strip()]
+
+    # Optional: export formats (SHP;DWG;GPKG;FGB;PARQUET;LAYOUT, default SHP;DWG), overwrite existing outputs,
+    # zip them; LAYOUT writes a layout store <output_fc>.layout that this tool and cable orientation read back
+    export_formats = parse_formats(arcpy.GetParameterAsText(11))
+    overwrite_exports = arcpy.GetParameterAsText(12).lower() == "true"
+    export_archive = None
+    if arcpy.GetParameterAsText(13).lower() == "true":
+        export_archive = os.path.join(os.path.dirname(os.path.dirname(file_path)), output_fc + ".zip")
+
+    # Optional: REBUILD (default) or DIFF to apply only the changes to an existing feature class
+    update_mode = arcpy.GetParameterAsText(14) or REBUILD
+
+    # Optional: CPROFILE, TRACEMALLOC or ALL to profile the run into the run report
+    profile = arcpy.GetParameterAsText(15) or None
+
+    import_wtg_layout(file_path, sheet, ID_Column, X_Column, Y_Column, spatial_reference, output_gdb, output_fc,
+                      data_inventory, skip=skip, extra_crs=extra_crs, export_formats=export_formats,
+                      overwrite_exports=overwrite_exports, export_archive=export_archive, update_mode=update_mode,
+                      profile=profile)
@@ -0,0 +1,281 @@
+"""
+Name: Batch import of WTG and GRID layouts
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Imports a whole folder (or glob) of WTG and IAC workbooks in one
+run. Every workbook is parsed, validated and written by a worker of a process
+pool into its own scratch geodatabase; the feature classes are then merged
+into the target geodatabase(s) one after the other, because a file
+geodatabase takes only one writer at a time. Timing and failures are reported
+per file. Workbooks that did not change since their last import (see
+import_manifest.py) are skipped.
+
+Usage:
+    python batch_import.py "D:/Layouts/Rev*" --output-gdb D:/GIS/Layouts.gdb --spatial-reference 25832
+        --id-column WTG --x-column Easting --y-column Northing [--grid-gdb D:/GIS/Grid.gdb] [--workers 4]
+"""
+
+import argparse
+import csv
+import glob
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import arcpy
+
+from cable_network import network_table_names
+from data_inventory import apply_metadata
+from GRID_import_layout import find_table_in_excel, grid_import_key, import_grid_layout
+from import_manifest import ImportManifest
+from instrumentation import REPORT_SUFFIX
+from WTG_Import_layout import import_wtg_layout, wtg_import_key
+
+WORKBOOK_EXTENSIONS = (".xlsx", ".xlsm")
+
+
+#------------ Collect the workbooks
+
+def collect_workbooks(inputs):
+    # Inputs can be workbooks, folders or glob patterns; Excel lock files (~$...) are left out
+    workbooks = []
+    for item in inputs:
+        if os.path.isdir(item):
+            candidates = [os.path.join(item, name) for name in os.listdir(item)]
+        else:
+            candidates = glob.glob(item)
+        workbooks.extend(path for path in candidates
+                         if path.lower().endswith(WORKBOOK_EXTENSIONS) and not os.path.basename(path).startswith("~$"))
+    return sorted(set(os.path.abspath(path) for path in workbooks))
+
+
+def feature_class_names(workbooks, output_gdb):
+    # Feature class name from the workbook name, made unique across folders
+    names = {}
+    used = set()
+    for path in workbooks:
+        name = arcpy.ValidateTableName(os.path.splitext(os.path.basename(path))[0], output_gdb)
+        unique = name
+        counter = 2
+        while unique.lower() in used:
+            unique = f"{name}_{counter}"
+            counter += 1
+        used.add(unique.lower())
+        names[path] = unique
+    return names
+
+
+#------------ Worker: parse, validate and write one workbook
+
+def run_job(job):
+    # Metadata is not added here: the main process applies it to all merged feature classes in one call
+    result = {"file": job["file_path"], "kind": job["kind"], "output_fc": job["output_fc"],
+              "status": "failed", "rows": 0, "seconds": 0.0, "merge_seconds": 0.0, "error": "", "scratch_fc": ""}
+    started = time.perf_counter()
+    try:
+        scratch_gdb = arcpy.management.CreateFileGDB(job["scratch_folder"], f"job_{job['index']}.gdb")[0]
+
+        # Workbooks with a "Start point" table are IAC templates, everything else is a WTG layout
+        table = None
+        if job["kind"] in ("AUTO", "GRID"):
+            try:
+                table = find_table_in_excel(job["file_path"], "Start point")
+                result["kind"] = "GRID"
+            except ValueError:
+                if job["kind"] == "GRID":
+                    raise
+                result["kind"] = "WTG"
+
+        if result["kind"] == "GRID":
+            result["rows"] = import_grid_layout(job["file_path"], job["spatial_reference"], scratch_gdb, job["output_fc"],
+                                                "", job["sheet_data_inventory"],
+                                                skip=job["skip"], table=table, use_cache=False,
+                                                run_report=job["run_report"])
+        else:
+            result["rows"] = import_wtg_layout(job["file_path"], job["sheet"], job["id_column"], job["x_column"],
+                                               job["y_column"], job["spatial_reference"], scratch_gdb, job["output_fc"],
+                                               "", skip=job["skip"], use_cache=False, run_report=job["run_report"])
+        result["scratch_fc"] = os.path.join(scratch_gdb, job["output_fc"])
+        result["status"] = "ok"
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        result["traceback"] = traceback.format_exc()
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+#------------ Import manifest of the target geodatabases
+
+def job_key(job, kind):
+    if kind == "GRID":
+        return grid_import_key(job["file_path"], job["spatial_reference"], job["data_inventory"],
+                               job["sheet_data_inventory"], skip=job["skip"])
+    return wtg_import_key(job["file_path"], job["sheet"], job["id_column"], job["x_column"], job["y_column"],
+                          job["spatial_reference"], job["data_inventory"], skip=job["skip"])
+
+
+def is_up_to_date(job, manifests, output_gdb, grid_gdb):
+    # The manifest entry tells which tool built the feature class, so AUTO jobs need no classification here
+    for target_gdb in dict.fromkeys([output_gdb, grid_gdb]):
+        entry = manifests[target_gdb].get(job["output_fc"])
+        if entry is None or job["kind"] not in ("AUTO", entry["tool"]):
+            continue
+        if entry["key"] == job_key(job, entry["tool"]) and arcpy.Exists(os.path.join(target_gdb, job["output_fc"])):
+            return entry["tool"]
+    return None
+
+
+#------------ Merge and report
+
+def merge_result(result, output_gdb, grid_gdb):
+    # Copy keeps the metadata and alias name that were set in the scratch geodatabase
+    target_gdb = grid_gdb if result["kind"] == "GRID" else output_gdb
+    target_fc = os.path.join(target_gdb, result["output_fc"])
+    started = time.perf_counter()
+    if arcpy.Exists(target_fc):
+        arcpy.management.Delete(target_fc)
+    arcpy.management.Copy(result["scratch_fc"], target_fc)
+
+    # Cable network node feature class and edge table of a GRID import go along
+    if result["kind"] == "GRID":
+        scratch_gdb = os.path.dirname(result["scratch_fc"])
+        for name in network_table_names(result["output_fc"]):
+            if arcpy.Exists(os.path.join(scratch_gdb, name)):
+                if arcpy.Exists(os.path.join(target_gdb, name)):
+                    arcpy.management.Delete(os.path.join(target_gdb, name))
+                arcpy.management.Copy(os.path.join(scratch_gdb, name), os.path.join(target_gdb, name))
+    result["merge_seconds"] = time.perf_counter() - started
+    result["target_fc"] = target_fc
+
+
+def report(results, report_path=None):
+    arcpy.AddMessage(f"{'status':8} {'kind':5} {'rows':>8} {'parse+write [s]':>16} {'merge [s]':>10}  file")
+    for result in results:
+        arcpy.AddMessage(f"{result['status']:8} {result['kind']:5} {result['rows']:>8} {result['seconds']:>16.2f} "
+                         f"{result['merge_seconds']:>10.2f}  {result['file']}")
+    failed = [result for result in results if result["status"] == "failed"]
+    for result in failed:
+        arcpy.AddWarning(f"{result['file']}: {result['error']}")
+    skipped = [result for result in results if result["status"] == "skipped"]
+    arcpy.AddMessage(f"{len(results) - len(failed) - len(skipped)} of {len(results)} workbooks imported, "
+                     f"{len(skipped)} unchanged")
+
+    if report_path:
+        fields = ["file", "kind", "output_fc", "status", "rows", "seconds", "merge_seconds", "error"]
+        with open(report_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(results)
+
+
+def run_report_path(report_path, output_fc):
+    # Run report of one import, in the folder of the batch report
+    if not report_path:
+        return False
+    return os.path.join(os.path.dirname(os.path.abspath(report_path)), output_fc + REPORT_SUFFIX)
+
+
+def run_batch(workbooks, output_gdb, spatial_reference, sheet=0, id_column="", x_column="", y_column="",
+              grid_gdb=None, kind="AUTO", data_inventory="", sheet_data_inventory=0, skip=(),
+              workers=None, report_path=None, use_cache=True):
+    """Import all workbooks over a process pool and merge them into output_gdb (and grid_gdb for IAC tables).
+
+    With use_cache, workbooks that the import manifests of the target geodatabases show as unchanged are skipped.
+    With report_path, the run report of every import is written next to it as <output_fc>_run_report.json; the
+    workers write none otherwise, rather than one into the folder of every workbook.
+    """
+    grid_gdb = grid_gdb or output_gdb
+    names = feature_class_names(workbooks, output_gdb)
+    scratch_folder = tempfile.mkdtemp(prefix="layout_batch_")
+    jobs = [{"index": index, "file_path": path, "kind": kind.upper(), "output_fc": names[path],
+             "scratch_folder": scratch_folder, "spatial_reference": spatial_reference, "sheet": sheet,
+             "id_column": id_column, "x_column": x_column, "y_column": y_column,
+             "data_inventory": data_inventory, "sheet_data_inventory": sheet_data_inventory, "skip": tuple(skip),
+             "run_report": run_report_path(report_path, names[path])}
+            for index, path in enumerate(workbooks)]
+
+    results = []
+    manifests = {gdb: ImportManifest(gdb) for gdb in dict.fromkeys([output_gdb, grid_gdb])}
+    if use_cache:
+        pending = []
+        for job in jobs:
+            tool = is_up_to_date(job, manifests, output_gdb, grid_gdb)
+            if tool:
+                results.append({"file": job["file_path"], "kind": tool, "output_fc": job["output_fc"],
+                                "status": "skipped", "rows": 0, "seconds": 0.0, "merge_seconds": 0.0, "error": ""})
+            else:
+                pending.append(job)
+        jobs = pending
+
+    try:
+        arcpy.AddMessage(f"Importing {len(jobs)} workbooks ({len(results)} unchanged)")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_job, job) for job in jobs]
+            for future in as_completed(futures):
+                result = future.result()
+                arcpy.AddMessage(f"  {result['status']:6} {result['seconds']:7.2f} s  {os.path.basename(result['file'])}")
+                results.append(result)
+
+        # Merge one after the other in a fixed order, so the run is reproducible
+        results.sort(key=lambda result: result["file"])
+        for result in results:
+            if result["status"] != "ok":
+                continue
+            try:
+                merge_result(result, output_gdb, grid_gdb)
+                if use_cache:
+                    job = next(job for job in jobs if job["file_path"] == result["file"])
+                    target_gdb = grid_gdb if result["kind"] == "GRID" else output_gdb
+                    manifests[target_gdb].record(result["output_fc"], job_key(job, result["kind"]), result["kind"],
+                                                 result["file"], result["rows"])
+            except Exception as e:
+                result["status"] = "failed"
+                result["error"] = f"Merge failed - {type(e).__name__}: {e}"
+
+        # Metadata for all merged feature classes from one parse of the data inventory
+        merged = [(result["target_fc"], result["output_fc"]) for result in results if result["status"] == "ok"]
+        if data_inventory and merged:
+            apply_metadata(merged, data_inventory, sheet_data_inventory)
+        report(results, report_path)
+    finally:
+        shutil.rmtree(scratch_folder, ignore_errors=True)
+    return results
+
+
+if __name__ == "__main__":
+    # Inside ArcGIS Pro sys.executable is not python.exe, the workers need the interpreter itself
+    if sys.platform == "win32" and not sys.executable.lower().endswith("python.exe"):
+        multiprocessing.set_executable(os.path.join(sys.exec_prefix, "python.exe"))
+
+    parser = argparse.ArgumentParser(description="Import a folder of WTG and IAC layout workbooks")
+    parser.add_argument("inputs", nargs="+", help="Workbooks, folders or glob patterns")
+    parser.add_argument("--output-gdb", required=True, help="Target geodatabase (WTG layouts, and GRID layouts unless --grid-gdb)")
+    parser.add_argument("--grid-gdb", help="Separate target geodatabase for the GRID (IAC) layouts")
+    parser.add_argument("--spatial-reference", required=True, help="EPSG code of the layout coordinates")
+    parser.add_argument("--kind", default="AUTO", choices=["AUTO", "WTG", "GRID"], type=str.upper)
+    parser.add_argument("--sheet", default=0, help="WTG sheet name (default: first sheet)")
+    parser.add_argument("--id-column", default="ID")
+    parser.add_argument("--x-column", default="X")
+    parser.add_argument("--y-column", default="Y")
+    parser.add_argument("--data-inventory", default="")
+    parser.add_argument("--inventory-sheet", default=0)
+    parser.add_argument("--skip", nargs="*", default=[], help="Pipeline stages to skip per workbook, e.g. export")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--report", help="Write the per-file report to this CSV file, and the run report of every "
+                                         "import next to it")
+    parser.add_argument("--force", action="store_true", help="Re-import workbooks even if they are unchanged")
+    args = parser.parse_args()
+
+    workbooks = collect_workbooks(args.inputs)
+    results = run_batch(workbooks, args.output_gdb, args.spatial_reference, sheet=args.sheet,
+                        id_column=args.id_column, x_column=args.x_column, y_column=args.y_column,
+                        grid_gdb=args.grid_gdb, kind=args.kind, data_inventory=args.data_inventory,
+                        sheet_data_inventory=args.inventory_sheet, skip=args.skip,
+                        workers=args.workers, report_path=args.report, use_cache=not args.force)
+    sys.exit(0 if all(result["status"] != "failed" for result in results) else 1)
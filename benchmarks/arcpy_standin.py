@@ -0,0 +1,605 @@
+"""
+Name: arcpy stand-in
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Lightweight local replacement for the part of arcpy the three
+tools use (cursors, FeatureClassToNumPyArray, the management calls for
+feature classes and fields, Describe, geometry objects), backed by in-memory
+tables. It exists only to run the tools on a machine without ArcGIS for
+benchmarking; spatial analysis (Buffer, SpatialJoin, Intersect) and CAD export
+are not covered.
+
+Usage:
+    import arcpy_standin
+    arcpy_standin.install()      # before the tools are imported
+"""
+
+import math
+import os
+import re
+import sys
+import types
+
+import numpy as np
+import pandas as pd
+
+
+class ExecuteError(Exception):
+    pass
+
+
+#------------ Messages and parameters
+
+messages = []
+parameters = []
+verbose = False
+
+
+def _message(severity, text):
+    messages.append((severity, str(text)))
+    if verbose:
+        print(f"[{severity}] {text}")
+
+
+def AddMessage(text):
+    _message("INFO", text)
+
+
+def AddWarning(text):
+    _message("WARNING", text)
+
+
+def AddError(text):
+    _message("ERROR", text)
+
+
+def GetParameterAsText(index):
+    return str(parameters[index]) if index < len(parameters) else ""
+
+
+class _Env:
+    def __init__(self):
+        self.workspace = ""
+        self.overwriteOutput = True
+        self.scratchFolder = ""
+
+
+env = _Env()
+
+
+#------------ Spatial reference and geometry
+
+class SpatialReference:
+    def __init__(self, item=None):
+        self.factoryCode = 0
+        self._text = ""
+        if isinstance(item, SpatialReference):
+            self.factoryCode, self._text = item.factoryCode, item._text
+        elif item not in (None, ""):
+            text = str(item).strip()
+            if text.isdigit():
+                self.factoryCode = int(text)
+            else:
+                self._text = text
+        self.name = f"EPSG:{self.factoryCode}" if self.factoryCode else self._text[:40]
+
+    def exportToString(self):
+        return self._text or f"EPSG:{self.factoryCode}"
+
+    def __eq__(self, other):
+        return isinstance(other, SpatialReference) and self.exportToString() == other.exportToString()
+
+    def __hash__(self):
+        return hash(self.exportToString())
+
+
+class Point:
+    def __init__(self, X=None, Y=None, Z=None, M=None):
+        self.X, self.Y, self.Z, self.M = X, Y, Z, M
+
+
+class Array(list):
+    pass
+
+
+class PointGeometry:
+    def __init__(self, point, spatial_reference=None):
+        self.firstPoint = self.lastPoint = self.centroid = point
+        self.spatialReference = spatial_reference
+
+    def _coordinates(self):
+        return (self.firstPoint.X, self.firstPoint.Y)
+
+
+class Polyline:
+    def __init__(self, array, spatial_reference=None):
+        self._points = [(point.X, point.Y) if isinstance(point, Point) else tuple(point) for point in array]
+        self.spatialReference = spatial_reference
+
+    @property
+    def firstPoint(self):
+        return Point(*self._points[0])
+
+    @property
+    def lastPoint(self):
+        return Point(*self._points[-1])
+
+    @property
+    def length(self):
+        return sum(math.hypot(x2 - x1, y2 - y1) for (x1, y1), (x2, y2) in zip(self._points, self._points[1:]))
+
+    @property
+    def centroid(self):
+        xs, ys = zip(*self._points)
+        return Point(sum(xs) / len(xs), sum(ys) / len(ys))
+
+    def _coordinates(self):
+        return list(self._points)
+
+    def __iter__(self):
+        # One part, like a single part polyline
+        yield Array(Point(x, y) for x, y in self._points)
+
+
+#------------ In-memory tables
+
+class Field:
+    def __init__(self, name, type, aliasName=None):
+        self.name = name
+        self.type = type
+        self.aliasName = aliasName or name
+
+
+_FIELD_TYPES = {"TEXT": "String", "STRING": "String", "DOUBLE": "Double", "FLOAT": "Single", "SHORT": "SmallInteger",
+                "LONG": "Integer", "DATE": "Date"}
+
+
+class _Table:
+    def __init__(self, geometry_type, spatial_reference):
+        self.geometry_type = (geometry_type or "").upper()
+        self.spatial_reference = SpatialReference(spatial_reference)
+        self.fields = [Field("OBJECTID", "OID")]
+        if self.geometry_type:
+            self.fields.append(Field("Shape", "Geometry"))
+        self.rows = []
+        self.next_oid = 1
+        self.alias = ""
+
+    def index(self, name):
+        lowered = name.lower()
+        for i, field in enumerate(self.fields):
+            if field.name.lower() == lowered:
+                return i
+        raise ExecuteError(f"Field {name} does not exist")
+
+    def add_field(self, name, field_type, alias=None):
+        if any(field.name.lower() == name.lower() for field in self.fields):
+            raise ExecuteError(f"Field {name} already exists")
+        self.fields.append(Field(name, _FIELD_TYPES.get(str(field_type).upper(), str(field_type)), alias))
+        for row in self.rows:
+            row.append(None)
+
+    def copy(self):
+        table = _Table(self.geometry_type, self.spatial_reference)
+        table.fields = [Field(field.name, field.type, field.aliasName) for field in self.fields]
+        table.rows = [list(row) for row in self.rows]
+        table.next_oid = self.next_oid
+        table.alias = self.alias
+        return table
+
+
+_tables = {}
+
+
+def _key(path):
+    path = str(path)
+    if not os.path.isabs(path) and not path.lower().startswith("memory") and env.workspace:
+        path = os.path.join(env.workspace, path)
+    return os.path.normcase(os.path.normpath(path.replace("\\", "/")))
+
+
+def _table(path):
+    try:
+        return _tables[_key(path)]
+    except KeyError:
+        raise ExecuteError(f"Dataset {path} does not exist or is not supported")
+
+
+def reset():
+    _tables.clear()
+    messages.clear()
+    env.workspace = ""
+
+
+def _to_shape(value, geometry_type):
+    # Geometry objects, a point tuple or a list of coordinate pairs
+    if value is None:
+        return None
+    if hasattr(value, "_coordinates"):
+        return value._coordinates()
+    if isinstance(value, Point):
+        return (value.X, value.Y)
+    if geometry_type == "POINT":
+        return (float(value[0]), float(value[1]))
+    return [(float(x), float(y)) for x, y in value]
+
+
+def _from_shape(shape, table):
+    if shape is None:
+        return None
+    if table.geometry_type == "POINT":
+        return PointGeometry(Point(*shape), table.spatial_reference)
+    return Polyline(shape, table.spatial_reference)
+
+
+def _centroid(shape):
+    if shape is None:
+        return (None, None)
+    if isinstance(shape, tuple):
+        return shape
+    xs, ys = zip(*shape)
+    return (sum(xs) / len(xs), sum(ys) / len(ys))
+
+
+class _Accessor:
+    """Reads and writes one cursor field (incl. the OID@ and SHAPE@ tokens) of a row."""
+
+    def __init__(self, table, name):
+        token = name.upper()
+        self.token = token
+        self.shape_index = table.index("Shape") if token.startswith("SHAPE@") else None
+        self.index = 0 if token == "OID@" else self.shape_index if self.shape_index is not None else table.index(name)
+        self.table = table
+
+    def get(self, row):
+        if self.token == "SHAPE@":
+            return _from_shape(row[self.index], self.table)
+        if self.token in ("SHAPE@XY", "SHAPE@TRUECENTROID"):
+            return _centroid(row[self.index])
+        if self.token == "SHAPE@X":
+            return _centroid(row[self.index])[0]
+        if self.token == "SHAPE@Y":
+            return _centroid(row[self.index])[1]
+        return row[self.index]
+
+    def set(self, row, value):
+        if self.token == "OID@":
+            return
+        if self.shape_index is not None:
+            value = _to_shape(value, self.table.geometry_type)
+        row[self.index] = value
+
+
+#------------ Cursors
+
+class _Cursor:
+    def __init__(self, in_table, field_names):
+        self.table = _table(in_table)
+        if isinstance(field_names, str):
+            field_names = [field_names]
+        if field_names == ["*"]:
+            field_names = [field.name for field in self.table.fields]
+        self.fields = list(field_names)
+        self.accessors = [_Accessor(self.table, name) for name in self.fields]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+def _matches(where_clause):
+    # Only the simple "FIELD = value" / "FIELD IN (...)" forms the tools use
+    if not where_clause:
+        return None
+    match = re.match(r"\s*(\w+)\s*(=|IN)\s*(.+)$", where_clause, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"where_clause not supported by the stand-in: {where_clause}")
+    name, operator, values = match.groups()
+    values = [value.strip().strip("'") for value in values.strip("() ").split(",")]
+    return name, set(values)
+
+
+class SearchCursor(_Cursor):
+    def __init__(self, in_table, field_names, where_clause=None, spatial_reference=None, explode_to_points=False,
+                 sql_clause=(None, None)):
+        super().__init__(in_table, field_names)
+        self.where = _matches(where_clause)
+
+    def __iter__(self):
+        where_index = self.table.index(self.where[0]) if self.where else None
+        for row in list(self.table.rows):
+            if where_index is not None and str(row[where_index]) not in self.where[1]:
+                continue
+            yield tuple(accessor.get(row) for accessor in self.accessors)
+
+
+class UpdateCursor(_Cursor):
+    def __init__(self, in_table, field_names, where_clause=None, spatial_reference=None, explode_to_points=False,
+                 sql_clause=(None, None)):
+        super().__init__(in_table, field_names)
+        self.where = _matches(where_clause)
+        self._current = None
+        self._deleted = set()
+
+    def __iter__(self):
+        where_index = self.table.index(self.where[0]) if self.where else None
+        for row in self.table.rows:
+            if where_index is not None and str(row[where_index]) not in self.where[1]:
+                continue
+            self._current = row
+            yield [accessor.get(row) for accessor in self.accessors]
+
+    def updateRow(self, values):
+        for accessor, value in zip(self.accessors, values):
+            accessor.set(self._current, value)
+
+    def deleteRow(self):
+        self._deleted.add(self._current[0])
+
+    def __exit__(self, *args):
+        if self._deleted:
+            self.table.rows = [row for row in self.table.rows if row[0] not in self._deleted]
+        return False
+
+
+class InsertCursor(_Cursor):
+    def insertRow(self, values):
+        row = [None] * len(self.table.fields)
+        row[0] = self.table.next_oid
+        self.table.next_oid += 1
+        for accessor, value in zip(self.accessors, values):
+            accessor.set(row, value)
+        self.table.rows.append(row)
+        return row[0]
+
+
+_NUMPY_TYPES = {"OID": "<i8", "Double": "<f8", "Single": "<f4", "SmallInteger": "<i4", "Integer": "<i4"}
+
+
+def FeatureClassToNumPyArray(in_table, field_names, where_clause=None, spatial_reference=None,
+                             explode_to_points=False, skip_nulls=False, null_value=None):
+    table = _table(in_table)
+    if spatial_reference is not None and SpatialReference(spatial_reference) != table.spatial_reference:
+        raise ValueError("The stand-in does not project on read, install pyproj for the ETRS89 coordinates "
+                         "or skip the enrich stage")
+    if isinstance(field_names, str):
+        field_names = [field_names]
+    accessors = [_Accessor(table, name) for name in field_names]
+
+    rows = []
+    for values in SearchCursor(in_table, ["SHAPE@"] + list(field_names) if explode_to_points else field_names,
+                               where_clause):
+        if explode_to_points:
+            shape, values = values[0], list(values[1:])
+            coordinates = shape._coordinates() if shape is not None else []
+            coordinates = [coordinates] if isinstance(coordinates, tuple) else coordinates
+            for x, y in coordinates:
+                rows.append([x if accessor.token == "SHAPE@X" else y if accessor.token == "SHAPE@Y" else value
+                             for accessor, value in zip(accessors, values)])
+        else:
+            rows.append(list(values))
+
+    # Nulls: skipped, replaced by null_value (scalar or per field) or an error, like arcpy
+    columns = list(zip(*rows)) if rows else [() for _ in field_names]
+    for i, name in enumerate(field_names):
+        if any(value is None for value in columns[i]):
+            replacement = null_value.get(name) if isinstance(null_value, dict) else null_value
+            if skip_nulls:
+                keep = [value is not None for value in columns[i]]
+                columns = [tuple(value for value, k in zip(column, keep) if k) for column in columns]
+            elif replacement is not None:
+                columns[i] = tuple(replacement if value is None else value for value in columns[i])
+            else:
+                raise ValueError(f"Null value in field {name}, use skip_nulls or null_value")
+
+    dtypes = []
+    for accessor, name, column in zip(accessors, field_names, columns):
+        if accessor.token in ("SHAPE@X", "SHAPE@Y"):
+            dtype = "<f8"
+        elif accessor.token == "OID@":
+            dtype = "<i8"
+        else:
+            field = table.fields[accessor.index]
+            dtype = _NUMPY_TYPES.get(field.type) or "<U%d" % max([1] + [len(str(value)) for value in column])
+        dtypes.append((name, dtype))
+    array = np.zeros(len(columns[0]) if columns else 0, dtype=dtypes)
+    for (name, dtype), column in zip(dtypes, columns):
+        array[name] = column
+    return array
+
+
+#------------ Management and conversion calls
+
+class _Result(list):
+    def getOutput(self, index):
+        return self[index]
+
+
+def Exists(dataset):
+    if not dataset:
+        return False
+    return _key(dataset) in _tables or os.path.exists(str(dataset))
+
+
+def CreateFileGDB(out_folder_path, out_name):
+    path = os.path.join(out_folder_path, out_name if out_name.lower().endswith(".gdb") else out_name + ".gdb")
+    if os.path.exists(path):
+        raise ExecuteError(f"ERROR 000258: Output {path} already exists")
+    os.makedirs(path)
+    return _Result([path])
+
+
+def CreateFeatureclass(out_path, out_name, geometry_type="POLYGON", template=None, has_m=None, has_z=None,
+                       spatial_reference=None):
+    key = _key(os.path.join(out_path, out_name))
+    if key in _tables and not env.overwriteOutput:
+        raise ExecuteError(f"ERROR 000258: Output {out_name} already exists")
+    _tables[key] = _Table(geometry_type, spatial_reference)
+    return _Result([os.path.join(out_path, out_name)])
+
+
+def CreateTable(out_path, out_name, template=None):
+    key = _key(os.path.join(out_path, out_name))
+    _tables[key] = _Table(None, None)
+    return _Result([os.path.join(out_path, out_name)])
+
+
+def AddField(in_table, field_name, field_type, field_precision=None, field_scale=None, field_length=None,
+             field_alias=None, *args, **kwargs):
+    _table(in_table).add_field(field_name, field_type, field_alias)
+    return _Result([in_table])
+
+
+def AddFields(in_table, field_description):
+    table = _table(in_table)
+    for description in field_description:
+        table.add_field(description[0], description[1], description[2] if len(description) > 2 else None)
+    return _Result([in_table])
+
+
+def DeleteField(in_table, drop_field):
+    table = _table(in_table)
+    for name in [drop_field] if isinstance(drop_field, str) else drop_field:
+        index = table.index(name)
+        del table.fields[index]
+        for row in table.rows:
+            del row[index]
+    return _Result([in_table])
+
+
+def AlterField(in_table, field, new_field_name=None, new_field_alias=None, *args, **kwargs):
+    target = _table(in_table).fields[_table(in_table).index(field)]
+    target.name = new_field_name or target.name
+    target.aliasName = new_field_alias or target.aliasName
+    return _Result([in_table])
+
+
+def Delete(in_data, data_type=None):
+    _tables.pop(_key(in_data), None)
+    return _Result([in_data])
+
+
+def Copy(in_data, out_data, data_type=None):
+    _tables[_key(out_data)] = _table(in_data).copy()
+    return _Result([out_data])
+
+
+def FeatureClassToFeatureClass(in_features, out_path, out_name, where_clause=None, field_mapping=None, config_keyword=None):
+    return Copy(in_features, os.path.join(out_path, out_name))
+
+
+def TableToExcel(Input_Table, Output_Excel_File, *args, **kwargs):
+    table = _table(Input_Table)
+    names = [field.name for field in table.fields if field.type != "Geometry"]
+    indexes = [table.index(name) for name in names]
+    pd.DataFrame([[row[i] for i in indexes] for row in table.rows], columns=names).to_excel(Output_Excel_File, index=False)
+    return _Result([Output_Excel_File])
+
+
+def ExportCAD(*args, **kwargs):
+    raise RuntimeError("ExportCAD is not covered by the arcpy stand-in, skip the DWG export")
+
+
+def _not_covered(name):
+    def call(*args, **kwargs):
+        raise RuntimeError(f"{name} is not covered by the arcpy stand-in")
+    return call
+
+
+def GetCount(in_rows):
+    return _Result([str(len(_table(in_rows).rows))])
+
+
+def ClearWorkspaceCache(in_data=None):
+    return _Result([True])
+
+
+def AlterAliasName(table, alias):
+    _table(table).alias = alias
+
+
+def ListFields(dataset, wild_card=None, field_type=None):
+    fields = _table(dataset).fields
+    if wild_card:
+        pattern = re.compile(wild_card.replace("*", ".*") + "$", re.IGNORECASE)
+        fields = [field for field in fields if pattern.match(field.name)]
+    return list(fields)
+
+
+class _Describe:
+    def __init__(self, table, path):
+        self.spatialReference = table.spatial_reference
+        self.shapeType = table.geometry_type.capitalize()
+        self.aliasName = table.alias
+        self.fields = table.fields
+        self.catalogPath = path
+        self.name = os.path.basename(str(path))
+
+
+def Describe(value):
+    return _Describe(_table(value), value)
+
+
+def ValidateFieldName(name, workspace=None):
+    name = re.sub(r"\W", "_", str(name))
+    return "_" + name if name[:1].isdigit() else name
+
+
+def ValidateTableName(name, workspace=None):
+    return ValidateFieldName(name, workspace)
+
+
+#------------ Metadata (no-op)
+
+class _Metadata:
+    def __init__(self, uri=None):
+        self.uri = uri
+        self.isReadOnly = False
+        self.title = self.tags = self.summary = self.description = self.credits = None
+
+    def copy(self, other):
+        for name in ("title", "tags", "summary", "description", "credits"):
+            setattr(self, name, getattr(other, name))
+
+    def save(self):
+        pass
+
+
+#------------ Namespaces as the tools import them
+
+da = types.ModuleType("arcpy.da")
+da.SearchCursor, da.UpdateCursor, da.InsertCursor = SearchCursor, UpdateCursor, InsertCursor
+da.FeatureClassToNumPyArray = FeatureClassToNumPyArray
+da.TableToNumPyArray = FeatureClassToNumPyArray
+
+management = types.ModuleType("arcpy.management")
+for _name in ("CreateFileGDB", "CreateFeatureclass", "CreateTable", "AddField", "AddFields", "DeleteField",
+              "AlterField", "Delete", "Copy", "GetCount", "ClearWorkspaceCache"):
+    setattr(management, _name, globals()[_name])
+    globals()[_name + "_management"] = globals()[_name]
+management.CopyFeatures = CopyFeatures_management = lambda in_features, out_feature_class, *args: Copy(in_features, out_feature_class)
+
+conversion = types.ModuleType("arcpy.conversion")
+conversion.FeatureClassToFeatureClass = FeatureClassToFeatureClass_conversion = FeatureClassToFeatureClass
+conversion.TableToExcel = TableToExcel_conversion = TableToExcel
+conversion.ExportCAD = ExportCAD
+
+analysis = types.ModuleType("arcpy.analysis")
+analysis.Buffer = Buffer_analysis = _not_covered("Buffer")
+analysis.SpatialJoin = _not_covered("SpatialJoin")
+analysis.Intersect = _not_covered("Intersect")
+
+metadata = types.ModuleType("arcpy.metadata")
+metadata.Metadata = _Metadata
+
+
+def install():
+    """Register the stand-in as arcpy; call before importing the tools."""
+    module = sys.modules[__name__]
+    sys.modules["arcpy"] = module
+    for name in ("da", "management", "conversion", "analysis", "metadata"):
+        sys.modules["arcpy." + name] = getattr(module, name)
+    return module
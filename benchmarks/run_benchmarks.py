@@ -0,0 +1,144 @@
+"""
+Name: Benchmark suite
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Throughput of the three tools - WTG import, GRID import and cable
+orientation - on synthetic wind farms from 100 to 1M turbines. Runs on any
+machine: without ArcGIS the tools are driven through the arcpy stand-in
+(arcpy_standin.py), which needs pyproj for the coordinate columns. The results can be saved and compared against a saved
+baseline, a drop in rows/sec beyond the tolerance ends with exit code 1.
+
+Cable orientation is measured with the SPATIAL_INDEX engine, the stand-in does
+not emulate Buffer/SpatialJoin/Intersect. Shapefile/DWG export and metadata are
+skipped for the imports.
+
+Usage: python benchmarks/run_benchmarks.py [100 1000 ...] [--save results.json] [--baseline results.json]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+BENCHMARK_FOLDER = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_FOLDER))
+sys.path.insert(0, BENCHMARK_FOLDER)
+
+try:
+    import arcpy
+except ImportError:
+    import arcpy_standin
+    arcpy = arcpy_standin.install()
+
+from synthetic_layouts import synthetic_farm, write_iac_workbook, write_wtg_workbook
+from WTG_Import_layout import import_wtg_layout
+from GRID_import_layout import import_grid_layout
+from GRID_Cable_Orientation import cable_orientation
+from coordinate_enrichment import pyproj
+
+DEFAULT_SCALES = [100, 1000, 10000, 100000]
+SPATIAL_REFERENCE = "25832"  # ETRS89 / UTM zone 32N
+BUFFER_SIZE = "50"
+
+
+def _timed(function, *args, **kwargs):
+    started = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def run_scale(turbines, folder):
+    """Run the three tools on one synthetic farm. Returns {tool: {rows, seconds, rows_per_sec}}."""
+    farm = synthetic_farm(turbines)
+    wtg_workbook = write_wtg_workbook(farm, os.path.join(folder, "WTG.xlsx"))
+    iac_workbook = write_iac_workbook(farm, os.path.join(folder, "IAC.xlsx"))
+    output_gdb = arcpy.CreateFileGDB_management(folder, "Benchmark.gdb")[0]
+    wtg_fc = os.path.join(output_gdb, "WTG_Layout")
+    cable_fc = os.path.join(output_gdb, "IAC_Layout")
+
+    skip = ("metadata", "export")
+    timings = {}
+    rows, seconds = _timed(import_wtg_layout, wtg_workbook, "WTG", "WTG", "Easting", "Northing", SPATIAL_REFERENCE,
+                           output_gdb, "WTG_Layout", "", skip=skip, use_cache=False, run_report=False)
+    timings["WTG import"] = (rows, seconds)
+
+    rows, seconds = _timed(import_grid_layout, iac_workbook, SPATIAL_REFERENCE, output_gdb, "IAC_Layout", "", 0,
+                           skip=skip, use_cache=False, run_report=False)
+    timings["GRID import"] = (rows, seconds)
+
+    orientation_folder = os.path.join(folder, "orientation")
+    os.makedirs(orientation_folder)
+    _, seconds = _timed(cable_orientation, wtg_fc, "ID", "X", "Y", cable_fc, BUFFER_SIZE, orientation_folder,
+                        "SPATIAL_INDEX", use_cache=False, run_report=False)
+    timings["Cable orientation"] = (len(farm["start"]), seconds)
+
+    return {tool: {"rows": rows, "seconds": seconds, "rows_per_sec": rows / seconds if seconds else None}
+            for tool, (rows, seconds) in timings.items()}
+
+
+def run(scales, keep=False):
+    results = {}
+    for turbines in scales:
+        folder = tempfile.mkdtemp(prefix=f"benchmark_{turbines}_")
+        try:
+            if hasattr(arcpy, "reset"):
+                arcpy.reset()
+            results[str(turbines)] = run_scale(turbines, folder)
+        finally:
+            if not keep:
+                shutil.rmtree(folder, ignore_errors=True)
+    return results
+
+
+def regressions(results, baseline, tolerance):
+    # (scale, tool, baseline rows/sec, rows/sec) of every tool that got slower than the tolerance allows
+    slower = []
+    for scale, tools in results.items():
+        for tool, result in tools.items():
+            reference = baseline.get(scale, {}).get(tool, {}).get("rows_per_sec")
+            if reference and result["rows_per_sec"] < reference * (1.0 - tolerance):
+                slower.append((scale, tool, reference, result["rows_per_sec"]))
+    return slower
+
+
+def print_results(results):
+    print(f"{'turbines':>9} {'tool':18} {'rows':>9} {'time [s]':>9} {'rows/sec':>11}")
+    for scale, tools in results.items():
+        for tool, result in tools.items():
+            print(f"{scale:>9} {tool:18} {result['rows']:>9} {result['seconds']:9.2f} {result['rows_per_sec']:11,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Throughput of WTG import, GRID import and cable orientation")
+    parser.add_argument("scales", nargs="*", type=int, default=DEFAULT_SCALES,
+                        help="numbers of turbines, e.g. 100 1000 1000000")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON file of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed drop in rows/sec (default 0.25)")
+    parser.add_argument("--keep", action="store_true", help="keep the generated workbooks and outputs")
+    args = parser.parse_args()
+
+    if getattr(arcpy, "__name__", "") == "arcpy_standin":
+        # The stand-in does not project: the X/Y and ETRS89 columns the orientation reads need pyproj
+        if pyproj is None:
+            sys.exit("ArcGIS not found and pyproj is not installed; the arcpy stand-in needs pyproj for the "
+                     "coordinates of the WTG import (pip install pyproj)")
+        print("ArcGIS not found, running on the arcpy stand-in")
+    results = run(args.scales, args.keep)
+    print_results(results)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        slower = regressions(results, baseline, args.tolerance)
+        for scale, tool, reference, rows_per_sec in slower:
+            print(f"REGRESSION {tool} at {scale} turbines: {rows_per_sec:,.0f} rows/sec (baseline {reference:,.0f})")
+        sys.exit(1 if slower else 0)
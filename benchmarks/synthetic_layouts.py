@@ -0,0 +1,106 @@
+"""
+Name: Synthetic layouts
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Generates synthetic wind farms for the benchmarks: a WTG
+workbook (ID, Easting, Northing) and an IAC cable template with the
+"Start point" table the GRID import looks for. Turbines sit on a regular
+grid and are connected in strings that start at the offshore substation
+(Start point 0), like the templates from the Cable Engineers.
+
+Usage: python benchmarks/synthetic_layouts.py turbines output_folder [--string-length N]
+"""
+
+import argparse
+import math
+import os
+
+import numpy as np
+import openpyxl
+
+# Columns of the IAC table; the coordinate headers repeat for the start and the end point
+IAC_HEADERS = ["Start point", "Easting [m]", "Northing [m]", "Depth to LAT [m]",
+               "End point", "Easting [m]", "Northing [m]", "Depth to LAT [m]",
+               "Cable length [m]", "Cross section [mm2]"]
+WTG_HEADERS = ["WTG", "Easting", "Northing"]
+
+ORIGIN = (400000.0, 6000000.0)  # ETRS89 / UTM zone 32N, EPSG 25832
+
+
+def synthetic_farm(turbines, string_length=8, spacing=1000.0, seed=0):
+    """Turbine positions and cables of a synthetic wind farm.
+
+    Returns a dict with ids (1..turbines), x, y, depth of the turbines, the substation
+    position oss_x, oss_y and the cables as arrays start, end (turbine ids, 0 = substation).
+    """
+    rng = np.random.default_rng(seed)
+    columns = max(1, int(math.ceil(math.sqrt(turbines))))
+    index = np.arange(turbines)
+
+    # Regular grid with a little jitter, so no two cables have exactly the same angle
+    x = ORIGIN[0] + (index % columns) * spacing + rng.uniform(-0.1, 0.1, turbines) * spacing
+    y = ORIGIN[1] + (index // columns) * spacing + rng.uniform(-0.1, 0.1, turbines) * spacing
+    depth = rng.uniform(-45.0, -20.0, turbines)
+
+    # Substation in the middle of the western edge
+    oss_x = ORIGIN[0] - spacing
+    oss_y = ORIGIN[1] + (turbines // columns) * spacing / 2.0
+
+    # Strings of string_length turbines: substation -> first turbine -> ... -> last turbine
+    ids = index + 1
+    start = np.where(index % string_length == 0, 0, ids - 1)
+    end = ids
+    return {"ids": ids, "x": x, "y": y, "depth": depth, "oss_x": oss_x, "oss_y": oss_y, "start": start, "end": end}
+
+
+def _position(farm, point_id):
+    if point_id == 0:
+        return farm["oss_x"], farm["oss_y"], -30.0
+    i = point_id - 1
+    return farm["x"][i], farm["y"][i], farm["depth"][i]
+
+
+def write_wtg_workbook(farm, file_path, sheet="WTG"):
+    # write_only streams the rows to disk, so a million turbines do not have to sit in memory as cells
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(sheet)
+    ws.append(WTG_HEADERS)
+    for point_id, x, y in zip(farm["ids"].tolist(), farm["x"].tolist(), farm["y"].tolist()):
+        ws.append(["WTG_%06d" % point_id, round(x, 2), round(y, 2)])
+    wb.save(file_path)
+    return file_path
+
+
+def write_iac_workbook(farm, file_path, sheet="IAC"):
+    # The table does not start in A1: a title and an empty row first, and one empty column, like the templates
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Cover")
+    ws.append(["Inter Array Cable layout - synthetic"])
+    ws = wb.create_sheet(sheet)
+    ws.append([None, "Inter Array Cable schedule"])
+    ws.append([])
+    ws.append([None] + IAC_HEADERS)
+    for start, end in zip(farm["start"].tolist(), farm["end"].tolist()):
+        x1, y1, z1 = _position(farm, start)
+        x2, y2, z2 = _position(farm, end)
+        length = math.hypot(x2 - x1, y2 - y1)
+        ws.append([None, start, round(x1, 2), round(y1, 2), round(z1, 1),
+                   end, round(x2, 2), round(y2, 2), round(z2, 1), round(length, 1), 240 if start else 630])
+    ws.append([])
+    ws.append([None, "Generated for benchmarking"])
+    wb.save(file_path)
+    return file_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic WTG workbook and IAC template")
+    parser.add_argument("turbines", type=int)
+    parser.add_argument("output_folder")
+    parser.add_argument("--string-length", type=int, default=8)
+    args = parser.parse_args()
+
+    os.makedirs(args.output_folder, exist_ok=True)
+    farm = synthetic_farm(args.turbines, args.string_length)
+    print(write_wtg_workbook(farm, os.path.join(args.output_folder, f"WTG_{args.turbines}.xlsx")))
+    print(write_iac_workbook(farm, os.path.join(args.output_folder, f"IAC_{args.turbines}.xlsx")))
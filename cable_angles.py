@@ -0,0 +1,110 @@
+"""
+Name: Cable angles
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Vectorized NumPy kernels for the cable orientation. The angle is
+measured from North azimuth (NAz) - clockwise direction from north - starting
+at the cable end that lies at the WTG. No arcpy needed, so the math can be
+tested and benchmarked on its own.
+"""
+
+import numpy as np
+
+# Distance (in map units) within which a cable end counts as lying at the WTG
+WTG_TOLERANCE = 5.0
+
+# Smallest angle (degrees) between two cables at one WTG that the J-tubes allow, project default
+JTUBE_MIN_SEPARATION = 30.0
+
+
+def angle_from_north(x1, y1, x2, y2):
+    # Azimuth of the direction (x1, y1) -> (x2, y2) in degrees, 0 = North, clockwise
+    angle = np.degrees(np.arctan2(np.asarray(x2) - x1, np.asarray(y2) - y1))
+    return (angle + 360.0) % 360.0
+
+
+def orientation_kernel(first_x, first_y, last_x, last_y, wtg_x, wtg_y, tolerance=WTG_TOLERANCE):
+    """Orientation of all cable segments in one call.
+
+    Each segment is given by its first and last point and the X/Y of the WTG
+    it belongs to. When the first point is within the tolerance of the WTG the
+    segment is measured first -> last, otherwise it is swapped and measured
+    last -> first.
+
+    Returns X1, Y1, X2, Y2 (rounded to whole map units, X1/Y1 at the WTG) and
+    AngleFromNorth as float arrays.
+    """
+    first_x = np.asarray(first_x, dtype="float64")
+    first_y = np.asarray(first_y, dtype="float64")
+    last_x = np.asarray(last_x, dtype="float64")
+    last_y = np.asarray(last_y, dtype="float64")
+    wtg_x = np.asarray(wtg_x, dtype="float64")
+    wtg_y = np.asarray(wtg_y, dtype="float64")
+
+    # Missing WTG coordinates (NaN) compare as False and fall back to the swapped direction
+    at_start = (np.abs(first_x - wtg_x) <= tolerance) & (np.abs(first_y - wtg_y) <= tolerance)
+
+    x1 = np.where(at_start, first_x, last_x)
+    y1 = np.where(at_start, first_y, last_y)
+    x2 = np.where(at_start, last_x, first_x)
+    y2 = np.where(at_start, last_y, first_y)
+
+    angle = angle_from_north(x1, y1, x2, y2)
+    return np.round(x1), np.round(y1), np.round(x2), np.round(y2), angle
+
+
+def first_last_vertices(oids):
+    """First and last vertex of every feature from an exploded vertex array.
+
+    oids is the OID@ column of FeatureClassToNumPyArray(..., explode_to_points=True),
+    where the vertices of one feature are consecutive and in drawing order.
+
+    Returns the unique OIDs and the index of their first and last vertex.
+    """
+    oids = np.asarray(oids)
+    if len(oids) == 0:
+        empty = np.zeros(0, dtype="int64")
+        return oids, empty, empty
+    # A new feature starts wherever the OID changes
+    starts = np.flatnonzero(np.r_[True, oids[1:] != oids[:-1]])
+    ends = np.r_[starts[1:] - 1, len(oids) - 1]
+    return oids[starts], starts, ends
+
+
+def angle_statistics(keys, angles):
+    """Per-WTG picture of the cable angles in one sorted, grouped pass (no loop over the WTGs).
+
+    keys is the WTG of every cable end (the Start field), angles its AngleFromNorth.
+    Returns the per-cable arrays sorted by WTG and angle (key, angle, separation to the next
+    cable clockwise) and the per-WTG arrays (wtg, cable_count, min_separation, max_gap).
+    A WTG with one cable has no separation (NaN) and a gap of 360 degrees.
+    """
+    keys = np.asarray(keys)
+    angles = np.asarray(angles, dtype="float64")
+    valid = ~np.isnan(angles)
+    keys, angles = keys[valid], angles[valid] % 360.0
+
+    # Sort by WTG, then clockwise by angle; every WTG is a run of consecutive entries
+    order = np.lexsort((angles, keys))
+    keys, angles = keys[order], angles[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.zeros(0, dtype="int64")
+    counts = np.diff(np.r_[starts, len(keys)])
+
+    # Separation to the next cable clockwise; the last cable of a WTG wraps around to its first
+    next_index = np.arange(1, len(keys) + 1)
+    next_index[starts + counts - 1] = starts
+    separation = (angles[next_index] - angles) % 360.0 if len(keys) else angles
+    single = np.repeat(counts == 1, counts)
+    separation[single] = 360.0
+
+    if len(keys):
+        min_separation = np.minimum.reduceat(separation, starts)
+        max_gap = np.maximum.reduceat(separation, starts)
+    else:
+        min_separation = max_gap = np.zeros(0)
+    min_separation[counts == 1] = np.nan
+    separation[single] = np.nan
+
+    return {"key": keys, "angle": angles, "separation": separation,
+            "wtg": keys[starts], "cable_count": counts, "min_separation": min_separation, "max_gap": max_gap}
@@ -0,0 +1,196 @@
+"""
+Name: Cable network
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: The array-cable network of an IAC table as a graph. Nodes are
+the WTGs and the OSS (Start/End point ids, 0 = OSS), edges are the cable
+segments, directed from the "Start point" (towards the OSS) to the "End
+point". Everything is kept in NumPy arrays: a node index, the incoming edge
+of every node and the outgoing edges in CSR form (offsets + edge indices),
+so upstream, downstream and string lookups need no geoprocessing.
+
+The graph is built at import time and stored next to the cable feature class
+as a node feature class (<fc>_Nodes) and an edge table (<fc>_Edges). The
+lookups and read_network are an API for scripts working on a stored network;
+the cable orientation does not use them, it matches cable ends to the WTG
+points by distance, which works also for tables with broken topology.
+"""
+
+import os
+
+import numpy as np
+
+from cable_angles import angle_from_north
+from feature_writers import get_feature_writer, write_points
+
+try:
+    import arcpy
+except ImportError:
+    arcpy = None
+
+OSS_ID = 0
+
+NODES_SUFFIX = "_Nodes"
+EDGES_SUFFIX = "_Edges"
+
+NODE_FIELDS = [("NodeID", "LONG", "Node ID"), ("Kind", "TEXT", "Kind"), ("String_number", "SHORT", "String number"),
+               ("Upstream", "LONG", "Upstream node"), ("Downstream", "SHORT", "Downstream nodes")]
+EDGE_FIELDS = [("EdgeID", "LONG", "Edge ID"), ("FromNode", "LONG", "From node"), ("ToNode", "LONG", "To node"),
+               ("String_number", "SHORT", "String number"), ("Length", "DOUBLE", "Length [m]"),
+               ("StartAngle", "DOUBLE", "Angle from North at From node"),
+               ("EndAngle", "DOUBLE", "Angle from North at To node")]
+
+
+def network_table_names(output_fc):
+    return output_fc + NODES_SUFFIX, output_fc + EDGES_SUFFIX
+
+
+class CableNetwork:
+    """Directed cable graph in compact arrays.
+
+    node_ids, node_x, node_y: one entry per node (sorted by id).
+    edge_from, edge_to: node indexes of every segment; edge_string: its string number.
+    """
+
+    def __init__(self, node_ids, node_x, node_y, edge_from, edge_to, edge_string):
+        self.node_ids = np.asarray(node_ids, dtype="int64")
+        self.node_x = np.asarray(node_x, dtype="float64")
+        self.node_y = np.asarray(node_y, dtype="float64")
+        self.edge_from = np.asarray(edge_from, dtype="int64")
+        self.edge_to = np.asarray(edge_to, dtype="int64")
+        self.edge_string = np.asarray(edge_string, dtype="int64")
+        nodes = len(self.node_ids)
+        edges = len(self.edge_from)
+
+        # Node id -> index, a dict gives O(1) lookups for single ids
+        self._index = dict(zip(self.node_ids.tolist(), range(nodes)))
+
+        # Outgoing edges per node (CSR): edges of node i are out_edges[out_offsets[i]:out_offsets[i + 1]]
+        self.out_edges = np.argsort(self.edge_from, kind="stable")
+        self.out_offsets = np.zeros(nodes + 1, dtype="int64")
+        np.cumsum(np.bincount(self.edge_from, minlength=nodes), out=self.out_offsets[1:])
+
+        # Incoming (upstream) edge per node, -1 for the OSS and for nodes nothing feeds
+        self.parent_edge = np.full(nodes, -1, dtype="int64")
+        self.parent_edge[self.edge_to] = np.arange(edges)
+
+        # String of a node = string of the cable that feeds it (0 for the OSS)
+        fed = self.parent_edge >= 0
+        self.node_string = np.zeros(nodes, dtype="int64")
+        self.node_string[fed] = self.edge_string[self.parent_edge[fed]]
+
+        self.edge_length = np.hypot(self.node_x[self.edge_to] - self.node_x[self.edge_from],
+                                    self.node_y[self.edge_to] - self.node_y[self.edge_from])
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    @property
+    def node_kind(self):
+        return np.where(self.node_ids == OSS_ID, "OSS", "WTG")
+
+    def index(self, node_id):
+        return self._index[int(node_id)]
+
+    def upstream(self, node_id):
+        # Next node towards the OSS, None at the OSS
+        edge = self.parent_edge[self.index(node_id)]
+        return int(self.node_ids[self.edge_from[edge]]) if edge >= 0 else None
+
+    def downstream(self, node_id):
+        # Nodes fed directly by node_id
+        i = self.index(node_id)
+        edges = self.out_edges[self.out_offsets[i]:self.out_offsets[i + 1]]
+        return self.node_ids[self.edge_to[edges]].tolist()
+
+    def string_of(self, node_id):
+        return int(self.node_string[self.index(node_id)])
+
+    def path_to_oss(self, node_id):
+        # Node ids from node_id up to the OSS (stops on a loop)
+        path = [int(node_id)]
+        seen = {path[0]}
+        upstream = self.upstream(node_id)
+        while upstream is not None and upstream not in seen:
+            path.append(upstream)
+            seen.add(upstream)
+            upstream = self.upstream(upstream)
+        return path
+
+    def edge_angles(self):
+        """Angle from North of every segment at its From node and at its To node."""
+        fx, fy = self.node_x[self.edge_from], self.node_y[self.edge_from]
+        tx, ty = self.node_x[self.edge_to], self.node_y[self.edge_to]
+        return angle_from_north(fx, fy, tx, ty), angle_from_north(tx, ty, fx, fy)
+
+
+def build_network(start_ids, start_x, start_y, end_ids, end_x, end_y, string_numbers):
+    """CableNetwork from the columns of the IAC table (one entry per cable segment)."""
+    ids = np.concatenate([np.asarray(start_ids, dtype="float64"), np.asarray(end_ids, dtype="float64")]).astype("int64")
+    xs = np.concatenate([np.asarray(start_x, dtype="float64"), np.asarray(end_x, dtype="float64")])
+    ys = np.concatenate([np.asarray(start_y, dtype="float64"), np.asarray(end_y, dtype="float64")])
+
+    # Every id is a node, placed where it shows up first in the table
+    node_ids, first, inverse = np.unique(ids, return_index=True, return_inverse=True)
+    segments = len(ids) // 2
+    return CableNetwork(node_ids, xs[first], ys[first], inverse[:segments], inverse[segments:], string_numbers)
+
+
+def network_from_table(table_rows):
+    """CableNetwork of the rows of a "Start point" table (Start point, Easting, Northing, Depth, End point, ...).
+
+    A new string starts wherever the Start point is the OSS (0), like in excel_table_to_feature_class.
+    table_rows may also be the cable_columns array of the table (see topology_validation.py).
+    """
+    if len(table_rows) == 0:
+        return build_network([], [], [], [], [], [], [])
+    columns = table_rows.T if isinstance(table_rows, np.ndarray) else list(zip(*[row[:7] for row in table_rows]))
+    start_ids = np.asarray(columns[0], dtype="float64")
+    string_numbers = np.cumsum(start_ids == OSS_ID)
+    return build_network(start_ids, columns[1], columns[2], columns[4], columns[5], columns[6], string_numbers)
+
+
+#------------ Node feature class and edge table in the geodatabase
+
+def write_network(network, output_gdb, output_fc, spatial_reference):
+    """Store the graph as <output_fc>_Nodes (points) and <output_fc>_Edges (table). Returns both paths."""
+    nodes_name, edges_name = network_table_names(output_fc)
+    nodes_path = os.path.join(output_gdb, nodes_name)
+    edges_path = os.path.join(output_gdb, edges_name)
+    for path in (nodes_path, edges_path):
+        if arcpy.Exists(path):
+            arcpy.management.Delete(path)
+
+    # Nodes: id, kind, string, upstream node (-1 at the OSS) and number of downstream nodes
+    upstream = np.where(network.parent_edge >= 0, network.node_ids[network.edge_from[network.parent_edge]], -1)
+    degree = np.diff(network.out_offsets)
+    writer = get_feature_writer("arcpy", output_gdb, nodes_name, "POINT", arcpy.SpatialReference(int(spatial_reference)),
+                                NODE_FIELDS)
+    writer.create()
+    write_points(writer, network.node_x, network.node_y,
+                 [network.node_ids, network.node_kind, network.node_string, upstream, degree])
+
+    # Edges: a plain table, the geometry is in the cable feature class already
+    start_angle, end_angle = network.edge_angles()
+    arcpy.management.CreateTable(output_gdb, edges_name)
+    arcpy.management.AddFields(edges_path, [list(field) for field in EDGE_FIELDS])
+    rows = zip(range(1, len(network.edge_from) + 1), network.node_ids[network.edge_from].tolist(),
+               network.node_ids[network.edge_to].tolist(), network.edge_string.tolist(),
+               network.edge_length.tolist(), start_angle.tolist(), end_angle.tolist())
+    with arcpy.da.InsertCursor(edges_path, [field[0] for field in EDGE_FIELDS]) as cursor:
+        for row in rows:
+            cursor.insertRow(row)
+    return nodes_path, edges_path
+
+
+def read_network(output_gdb, output_fc):
+    """CableNetwork from the node and edge tables written by write_network."""
+    nodes_name, edges_name = network_table_names(output_fc)
+    nodes = arcpy.da.FeatureClassToNumPyArray(os.path.join(output_gdb, nodes_name), ["NodeID", "SHAPE@X", "SHAPE@Y"])
+    edges = arcpy.da.TableToNumPyArray(os.path.join(output_gdb, edges_name), ["FromNode", "ToNode", "String_number"])
+    order = np.argsort(nodes["NodeID"])
+    node_ids = nodes["NodeID"][order]
+    return CableNetwork(node_ids, nodes["SHAPE@X"][order], nodes["SHAPE@Y"][order],
+                        np.searchsorted(node_ids, edges["FromNode"]), np.searchsorted(node_ids, edges["ToNode"]),
+                        edges["String_number"])
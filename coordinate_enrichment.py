@@ -0,0 +1,152 @@
+"""
+Name: Coordinate enrichment
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Adds the native X/Y and the X/Y in other coordinate systems
+(ETRS89 by default, UTM zones, WGS84, ...) to the attribute table of a point
+feature class. The points are read once, projected as arrays with a cached
+transformer per CRS pair and all columns are written in a single update pass,
+instead of one AddGeometryAttributes + AlterField table rewrite per system.
+"""
+
+import functools
+from collections import namedtuple
+
+import numpy as np
+
+try:
+    import arcpy
+except ImportError:
+    arcpy = None
+
+try:
+    import pyproj
+except ImportError:
+    pyproj = None
+
+# One target coordinate system and the fields its coordinates go into
+CoordinateTarget = namedtuple("CoordinateTarget", ["crs", "x_field", "y_field", "x_alias", "y_alias"])
+
+ETRS89 = CoordinateTarget(4258, "X_ETRS", "Y_ETRS", "X [ETRS 1989]", "Y [ETRS 1989]")
+WGS84 = CoordinateTarget(4326, "X_WGS84", "Y_WGS84", "X [WGS 1984]", "Y [WGS 1984]")
+
+DEFAULT_TARGETS = [ETRS89]
+
+# EPSG codes are 1-32767, the well-known IDs above are ESRI's own (e.g. 54009 World Mollweide, 102100)
+EPSG_MAX_CODE = 32767
+
+
+def target_for_epsg(epsg):
+    # Fields for an extra coordinate system given only by its EPSG code, e.g. 32631 -> X_32631 / Y_32631
+    for target in (ETRS89, WGS84):
+        if target.crs == int(epsg):
+            return target
+    return CoordinateTarget(int(epsg), f"X_{epsg}", f"Y_{epsg}", f"X [EPSG {epsg}]", f"Y [EPSG {epsg}]")
+
+
+@functools.lru_cache(maxsize=None)
+def get_transformer(source_crs, target_crs):
+    """Transformer for a CRS pair (EPSG codes or WKT), built once per process.
+
+    Returns a function (xs, ys) -> (xs, ys) working on whole arrays, with X = easting/longitude.
+    """
+    if pyproj is None:
+        raise RuntimeError("pyproj is not installed")
+    try:
+        transformer = pyproj.Transformer.from_crs(pyproj.CRS.from_user_input(source_crs),
+                                                  pyproj.CRS.from_user_input(target_crs), always_xy=True)
+    except pyproj.exceptions.CRSError as e:
+        raise ValueError(f"pyproj cannot project from {source_crs} to {target_crs}: {e}") from e
+    return transformer.transform
+
+
+def transform(xs, ys, source_crs, target_crs):
+    if source_crs == target_crs:
+        return np.asarray(xs, dtype="float64"), np.asarray(ys, dtype="float64")
+    tx, ty = get_transformer(source_crs, target_crs)(np.asarray(xs, dtype="float64"), np.asarray(ys, dtype="float64"))
+    return np.asarray(tx), np.asarray(ty)
+
+
+def _known_to_pyproj(crs):
+    try:
+        pyproj.CRS.from_user_input(crs)
+    except pyproj.exceptions.CRSError:
+        return False
+    return True
+
+
+def authority_of(code):
+    """("EPSG", code) or ("ESRI", code) of a well-known ID, None for a code of neither.
+
+    Without pyproj the authority is told by the range of the code.
+    """
+    code = int(code)
+    if code <= 0:
+        return None
+    if pyproj is None:
+        return ("EPSG" if code <= EPSG_MAX_CODE else "ESRI"), code
+    for authority in ("EPSG", "ESRI"):
+        if _known_to_pyproj(f"{authority}:{code}"):
+            return authority, code
+    return None
+
+
+def crs_of(spatial_reference):
+    """The coordinate system of an arcpy SpatialReference for pyproj (also the CRS of layout stores).
+
+    The EPSG code, "ESRI:<code>" for an ESRI-only WKID, or the WKT when there is no code; None when pyproj
+    cannot read any of them. Without pyproj the code or WKT as it is.
+    """
+    code = spatial_reference.factoryCode
+    if pyproj is None:
+        return code or spatial_reference.exportToString()
+    for crs in ([code, f"ESRI:{code}"] if code else [spatial_reference.exportToString()]):
+        if _known_to_pyproj(crs):
+            return crs
+    return None
+
+
+def enrich_coordinates(fc_path, native_fields=("X", "Y"), targets=DEFAULT_TARGETS, oids=None):
+    """Write native X/Y plus X/Y in every target coordinate system into fc_path in one pass.
+
+    oids limits the projection and the update to these rows (e.g. the ones a layout diff wrote); all rows are
+    done anyway when a field is missing.
+    """
+    spatial_reference = arcpy.Describe(fc_path).spatialReference
+    source_crs = crs_of(spatial_reference)
+
+    # All fields in one schema change
+    fields = [(native_fields[0], native_fields[0]), (native_fields[1], native_fields[1])]
+    for target in targets:
+        fields.extend([(target.x_field, target.x_alias), (target.y_field, target.y_alias)])
+    existing = {field.name.lower() for field in arcpy.ListFields(fc_path)}
+    new_fields = [[name, "DOUBLE", alias] for name, alias in fields if name.lower() not in existing]
+    if new_fields:
+        arcpy.management.AddFields(fc_path, new_fields)
+        # The new fields need a value in every row
+        oids = None
+
+    # One read of the geometry
+    points = arcpy.da.FeatureClassToNumPyArray(fc_path, ["OID@", "SHAPE@X", "SHAPE@Y"], skip_nulls=True)
+    selected = np.isin(points["OID@"], list(oids)) if oids is not None else slice(None)
+    points = points[selected]
+    columns = [points["SHAPE@X"], points["SHAPE@Y"]]
+    for target in targets:
+        if pyproj is not None and source_crs is not None:
+            tx, ty = transform(points["SHAPE@X"], points["SHAPE@Y"], source_crs, target.crs)
+        else:
+            # Without pyproj (or a coordinate system it cannot read) arcpy projects while reading: one more read,
+            # still no table rewrite
+            projected = arcpy.da.FeatureClassToNumPyArray(fc_path, ["SHAPE@X", "SHAPE@Y"], skip_nulls=True,
+                                                          spatial_reference=arcpy.SpatialReference(target.crs))
+            tx, ty = projected["SHAPE@X"][selected], projected["SHAPE@Y"][selected]
+        columns.extend([tx, ty])
+
+    # All values in one update pass
+    values = dict(zip(points["OID@"].tolist(), zip(*[column.tolist() for column in columns])))
+    with arcpy.da.UpdateCursor(fc_path, ["OID@"] + [name for name, alias in fields]) as cursor:
+        for row in cursor:
+            if row[0] in values:
+                cursor.updateRow([row[0], *values[row[0]]])
+    return len(values)
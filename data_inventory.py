@@ -0,0 +1,138 @@
+"""
+Name: Data inventory
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Metadata lookup in the DATA INVENTORY workbook. The inventory is
+parsed once into a dict indexed by "Full Name" and the index is kept in an
+on-disk JSON cache (dates as ISO text), which is thrown away as soon as the
+size or modification time of the workbook changes. Metadata can be applied
+to many feature classes in one call.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import tempfile
+
+import pandas as pd
+
+try:
+    import arcpy
+    from arcpy import metadata as md
+except ImportError:
+    arcpy = None
+    md = None
+
+# Columns of the inventory that end up in the metadata
+INVENTORY_COLUMNS = ["Summary", "Tags", "Description", "Credits", "Date Created"]
+
+CACHE_FOLDER = os.path.join(tempfile.gettempdir(), "data_inventory_cache")
+
+# Indexes already loaded in this process: (path, sheet) -> (signature, index)
+_loaded = {}
+
+
+def _signature(data_inventory):
+    stat = os.stat(data_inventory)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _cache_file(data_inventory, sheet, cache_folder):
+    name = hashlib.sha1(f"{os.path.abspath(data_inventory)}|{sheet}".encode("utf-8")).hexdigest()
+    return os.path.join(cache_folder, name + ".json")
+
+
+def _plain(value):
+    # Only JSON types in the index, so it reads back from the cache exactly as it was parsed
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+def parse_inventory(data_inventory, sheet=0):
+    """Read the inventory sheet into {Full Name: {Summary, Tags, Description, Credits, Date Created}}."""
+    df = pd.read_excel(data_inventory, sheet)
+    df = df.drop_duplicates("Full Name", keep="first").set_index("Full Name")
+    df = df.reindex(columns=INVENTORY_COLUMNS)
+    # Empty cells become empty text instead of NaN
+    df = df.astype(object).where(df.notna(), "")
+    return {str(name): {column: _plain(value) for column, value in record.items()}
+            for name, record in df.to_dict("index").items()}
+
+
+def load_inventory(data_inventory, sheet=0, cache_folder=CACHE_FOLDER):
+    """Index of the inventory, from memory, from the on-disk cache or parsed from the workbook, in that order."""
+    sheet = sheet if sheet not in (None, "") else 0
+    signature = _signature(data_inventory)
+    key = (os.path.abspath(data_inventory), sheet)
+
+    loaded = _loaded.get(key)
+    if loaded is not None and loaded[0] == signature:
+        return loaded[1]
+
+    cache_file = _cache_file(data_inventory, sheet, cache_folder)
+    index = None
+    try:
+        with open(cache_file, encoding="utf-8") as f:
+            cached = json.load(f)
+        if tuple(cached["signature"]) == signature:
+            index = cached["index"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    if index is None:
+        index = parse_inventory(data_inventory, sheet)
+        try:
+            os.makedirs(cache_folder, exist_ok=True)
+            temporary = cache_file + ".tmp"
+            with open(temporary, "w", encoding="utf-8") as f:
+                json.dump({"signature": signature, "index": index}, f)
+            os.replace(temporary, cache_file)
+        except (OSError, TypeError):
+            # The cache is only a speed-up, the lookup still works without it
+            pass
+
+    _loaded[key] = (signature, index)
+    return index
+
+
+def apply_metadata(items, data_inventory, sheet=0):
+    """Copy title, tags, summary, description and credits from the inventory to feature classes.
+
+    items is a list of (fc_path, name) pairs, name being the "Full Name" in the inventory.
+    Returns the names that were not found in the inventory.
+    """
+    index = load_inventory(data_inventory, sheet)
+    missing = []
+    for fc_path, name in items:
+        record = index.get(name)
+        if record is None:
+            missing.append(name)
+            continue
+
+        # Create a new Metadata object and add some content to it
+        new_md = md.Metadata()
+        new_md.title = name
+        new_md.tags = record["Tags"]
+        new_md.summary = record["Summary"]
+        new_md.description = str(record["Description"]) + "\n" + str(record["Date Created"])
+        new_md.credits = record["Credits"]
+
+        # Assign the Metadata object's content to a target item
+        tgt_item_md = md.Metadata(fc_path)
+        if not tgt_item_md.isReadOnly:
+            tgt_item_md.copy(new_md)
+            tgt_item_md.save()
+
+    if len(items) > len(missing):
+        arcpy.AddMessage(f"Adding metadata is completed successfully ({len(items) - len(missing)} feature classes)")
+    if missing:
+        arcpy.AddMessage("Please add information into the DATA INVENTORY File (Excel) for: " + ", ".join(missing))
+        arcpy.AddMessage("Name of feature class should be the same as in the data inventory (column Name)")
+    return missing
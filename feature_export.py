@@ -0,0 +1,295 @@
+"""
+Name: Feature export
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Exports a feature class to several formats at once. The feature
+class is read once into memory; GeoPackage, FlatGeobuf and GeoParquet are
+streamed from that read in worker threads while arcpy writes the Shapefile
+and the DWG (straight from the feature class, not from the shapefile). The
+time of every format is reported, existing outputs are skipped or
+overwritten, and the outputs can be packaged into one zip archive.
+
+Formats: SHP, DWG, GPKG, FGB (needs GDAL/osgeo), PARQUET (needs pyarrow),
+LAYOUT (memory-mapped columnar store of a point feature class, see layout_store.py)
+"""
+
+import json
+import os
+import shutil
+import struct
+import time
+import zipfile
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from coordinate_enrichment import crs_of
+from feature_writers import DEFAULT_BATCH_SIZE, GeoPackageFeatureWriter
+from layout_store import STORE_EXTENSION, export_layout_store
+
+try:
+    import arcpy
+except ImportError:
+    arcpy = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+try:
+    from osgeo import ogr, osr
+except ImportError:
+    ogr = None
+    osr = None
+
+try:
+    import pyproj
+except ImportError:
+    pyproj = None
+
+ALL_FORMATS = ("SHP", "DWG", "GPKG", "FGB", "PARQUET", "LAYOUT")
+DEFAULT_FORMATS = ("SHP", "DWG")
+
+# Formats that own a folder next to the other outputs
+ARCPY_FORMATS = ("SHP", "DWG")
+
+# arcpy field type -> feature_writers field type
+FIELD_TYPES = {"String": "TEXT", "Double": "DOUBLE", "Single": "FLOAT", "Integer": "LONG", "SmallInteger": "SHORT",
+               "Date": "DATE"}
+
+# Feature class read into memory: coordinates per feature (x, y) or [(x, y), ...] and one list per field.
+# srs_id is the WKID of the spatial reference (-1 without one), crs its coordinate system for pyproj (see crs_of)
+FeatureData = namedtuple("FeatureData", ["name", "geometry_type", "srs_id", "crs", "fields", "shapes", "columns"])
+
+ExportResult = namedtuple("ExportResult", ["format", "path", "status", "seconds", "error"])
+
+
+def parse_formats(text):
+    # "SHP;GPKG;parquet" -> ("SHP", "GPKG", "PARQUET"); empty -> DEFAULT_FORMATS
+    formats = tuple(item.strip().upper() for item in str(text or "").split(";") if item.strip())
+    unknown = [item for item in formats if item not in ALL_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown export format(s) {unknown}, choose from {', '.join(ALL_FORMATS)}")
+    return formats or DEFAULT_FORMATS
+
+
+def output_paths(output_fc, directory):
+    """Where every format goes; SHP and DWG keep the folders the tools always used."""
+    shp_folder = os.path.join(directory, output_fc)
+    return {
+        "SHP": os.path.join(shp_folder, output_fc + ".shp"),
+        "DWG": os.path.join(shp_folder + "_DWG", output_fc + ".dwg"),
+        "GPKG": os.path.join(directory, output_fc + ".gpkg"),
+        "FGB": os.path.join(directory, output_fc + ".fgb"),
+        "PARQUET": os.path.join(directory, output_fc + ".parquet"),
+        "LAYOUT": os.path.join(directory, output_fc + STORE_EXTENSION),
+    }
+
+
+#------------ One read of the feature class
+
+def _coordinates(shape, geometry_type):
+    if geometry_type == "POINT":
+        return (shape.firstPoint.X, shape.firstPoint.Y)
+    return [(point.X, point.Y) for part in shape for point in part if point]
+
+
+def read_features(fc_path, name):
+    describe = arcpy.Describe(fc_path)
+    geometry_type = "POINT" if describe.shapeType.upper() == "POINT" else "POLYLINE"
+    fields = [(field.name, FIELD_TYPES.get(field.type, "TEXT")) for field in arcpy.ListFields(fc_path)
+              if field.type not in ("OID", "Geometry", "GlobalID", "Blob", "Raster")
+              and field.name.lower() not in ("shape_length", "shape_area")]
+
+    shapes = []
+    columns = [[] for _ in fields]
+    with arcpy.da.SearchCursor(fc_path, ["SHAPE@"] + [field[0] for field in fields]) as cursor:
+        for row in cursor:
+            if row[0] is None:
+                continue
+            shapes.append(_coordinates(row[0], geometry_type))
+            for column, value in zip(columns, row[1:]):
+                column.append(value)
+    srs_id = describe.spatialReference.factoryCode or -1
+    return FeatureData(name, geometry_type, srs_id, crs_of(describe.spatialReference), fields, shapes, columns)
+
+
+def _batches(features, batch_size=DEFAULT_BATCH_SIZE):
+    for start in range(0, len(features.shapes), batch_size):
+        stop = start + batch_size
+        yield list(zip(features.shapes[start:stop], *[column[start:stop] for column in features.columns]))
+
+
+def _wkb(shape, geometry_type):
+    if geometry_type == "POINT":
+        return struct.pack("<BIdd", 1, 1, shape[0], shape[1])
+    flat = [value for xy in shape for value in xy]
+    return struct.pack("<BII%dd" % len(flat), 1, 2, len(shape), *flat)
+
+
+#------------ Format writers (path, features) -> None
+
+def write_geopackage(path, features):
+    writer = GeoPackageFeatureWriter(path, features.name, features.geometry_type, features.srs_id, features.fields)
+    writer.create()
+    writer.write_rows(_batches(features))
+
+
+def write_geoparquet(path, features, batch_size=DEFAULT_BATCH_SIZE):
+    if pa is None:
+        raise RuntimeError("GeoParquet export needs pyarrow")
+    # GeoParquet 1.0: WKB geometry column plus the "geo" file metadata
+    column_metadata = {"encoding": "WKB",
+                       "geometry_types": ["Point" if features.geometry_type == "POINT" else "LineString"]}
+    if pyproj is not None and features.crs is not None:
+        # EPSG or ESRI code, or WKT: whatever crs_of found pyproj can read
+        column_metadata["crs"] = pyproj.CRS.from_user_input(features.crs).to_json_dict()
+    geo = {"version": "1.0.0", "primary_column": "geometry", "columns": {"geometry": column_metadata}}
+
+    types = {"TEXT": pa.string(), "DOUBLE": pa.float64(), "FLOAT": pa.float32(), "LONG": pa.int32(),
+             "SHORT": pa.int16(), "DATE": pa.timestamp("ms")}
+    schema = pa.schema([(name, types[field_type]) for name, field_type in features.fields]
+                       + [("geometry", pa.binary())], metadata={"geo": json.dumps(geo)})
+
+    # Written in row groups, so only one batch is converted to Arrow at a time
+    with pq.ParquetWriter(path, schema) as writer:
+        for start in range(0, len(features.shapes), batch_size):
+            stop = start + batch_size
+            arrays = [column[start:stop] for column in features.columns]
+            arrays.append([_wkb(shape, features.geometry_type) for shape in features.shapes[start:stop]])
+            writer.write_table(pa.Table.from_arrays([pa.array(values, type=field.type)
+                                                     for values, field in zip(arrays, schema)], schema=schema))
+
+
+def write_flatgeobuf(path, features):
+    if ogr is None:
+        raise RuntimeError("FlatGeobuf export needs GDAL (osgeo)")
+    ogr.UseExceptions()
+    source = ogr.GetDriverByName("FlatGeobuf").CreateDataSource(path)
+    spatial_reference = None
+    if features.crs is not None:
+        spatial_reference = osr.SpatialReference()
+        spatial_reference.SetFromUserInput(f"EPSG:{features.crs}" if isinstance(features.crs, int) else features.crs)
+    layer = source.CreateLayer(features.name, spatial_reference,
+                               ogr.wkbPoint if features.geometry_type == "POINT" else ogr.wkbLineString)
+    types = {"TEXT": ogr.OFTString, "DOUBLE": ogr.OFTReal, "FLOAT": ogr.OFTReal, "LONG": ogr.OFTInteger,
+             "SHORT": ogr.OFTInteger, "DATE": ogr.OFTDateTime}
+    for name, field_type in features.fields:
+        layer.CreateField(ogr.FieldDefn(name, types[field_type]))
+
+    # Features are streamed to the file one by one
+    definition = layer.GetLayerDefn()
+    for i, shape in enumerate(features.shapes):
+        feature = ogr.Feature(definition)
+        feature.SetGeometry(ogr.CreateGeometryFromWkb(_wkb(shape, features.geometry_type)))
+        for j, column in enumerate(features.columns):
+            if column[i] is not None:
+                feature.SetField(j, column[i])
+        layer.CreateFeature(feature)
+    source = None
+
+
+def export_shapefile(fc_path, path):
+    arcpy.FeatureClassToFeatureClass_conversion(fc_path, os.path.dirname(path), os.path.basename(path))
+
+
+def export_dwg(fc_path, path):
+    arcpy.conversion.ExportCAD(fc_path, "DWG_R2018", path, False, False)
+
+
+STREAMED_WRITERS = {"GPKG": write_geopackage, "FGB": write_flatgeobuf, "PARQUET": write_geoparquet}
+# Written from the feature class in the calling thread; LAYOUT reads it as arrays, not through read_features.
+# They stay serial: arcpy is not thread-safe (geoprocessing tools and cursors are only supported in the thread
+# that imported arcpy), and a lock around every call would serialize them again. They run while the pool
+# writes the streamed formats, which do not touch arcpy.
+ARCPY_WRITERS = {"SHP": export_shapefile, "DWG": export_dwg, "LAYOUT": export_layout_store}
+
+
+#------------ Export
+
+def _remove(format_name, path):
+    # The Shapefile and DWG own their folder, a layout store is a folder, the other formats are single files
+    if format_name in ARCPY_FORMATS:
+        shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+    elif os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def _run(format_name, path, write):
+    started = time.perf_counter()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write()
+    except Exception as e:
+        # No half-written output, it would be taken as done by the next run
+        _remove(format_name, path)
+        return ExportResult(format_name, path, "failed", time.perf_counter() - started, str(e))
+    return ExportResult(format_name, path, "done", time.perf_counter() - started, "")
+
+
+def export_feature_class(fc_path, output_fc, directory, formats=DEFAULT_FORMATS, overwrite=False, archive=None):
+    """Export fc_path as output_fc into directory in all formats. Returns an ExportResult per format.
+
+    Existing outputs are skipped, or replaced with overwrite. archive is the path of a zip
+    file that receives all outputs (None: no archive).
+    """
+    paths = output_paths(output_fc, directory)
+    results = []
+    todo = []
+    for format_name in formats:
+        path = paths[format_name]
+        target = os.path.dirname(path) if format_name in ARCPY_FORMATS else path
+        if os.path.exists(target):
+            if not overwrite:
+                arcpy.AddMessage(f"{format_name} output already exists, skipped: {target}")
+                results.append(ExportResult(format_name, path, "skipped", 0.0, ""))
+                continue
+            _remove(format_name, path)
+        todo.append(format_name)
+
+    streamed = [format_name for format_name in todo if format_name in STREAMED_WRITERS]
+    features = read_features(fc_path, output_fc) if streamed else None
+
+    # Streamed formats in threads, the arcpy exports in this thread meanwhile
+    with ThreadPoolExecutor(max_workers=max(1, len(streamed))) as pool:
+        futures = [pool.submit(_run, format_name, paths[format_name],
+                               partial(STREAMED_WRITERS[format_name], paths[format_name], features))
+                   for format_name in streamed]
+        for format_name in todo:
+            if format_name in ARCPY_WRITERS:
+                results.append(_run(format_name, paths[format_name],
+                                    partial(ARCPY_WRITERS[format_name], fc_path, paths[format_name])))
+        results.extend(future.result() for future in futures)
+
+    for result in results:
+        if result.status == "failed":
+            arcpy.AddWarning(f"{result.format} export failed: {result.error}")
+        else:
+            arcpy.AddMessage(f"{result.format:8} {result.status:8} {result.seconds:7.2f} s  {result.path}")
+
+    if archive:
+        package_outputs([result for result in results if result.status != "failed"], archive)
+        arcpy.AddMessage(f"Outputs packaged into {archive}")
+    return results
+
+
+def package_outputs(results, archive):
+    # Files are streamed into the archive in chunks by zipfile, never read as a whole
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED, allowZip64=True) as zf:
+        for result in results:
+            if result.format in ARCPY_FORMATS:
+                # Shapefile sidecars (.dbf, .shx, .prj, ...) and the DWG are in the folder of the output
+                folder = os.path.dirname(result.path)
+                for name in sorted(os.listdir(folder)) if os.path.isdir(folder) else []:
+                    zf.write(os.path.join(folder, name), os.path.join(os.path.basename(folder), name))
+            elif os.path.isdir(result.path):
+                for name in sorted(os.listdir(result.path)):
+                    zf.write(os.path.join(result.path, name), os.path.join(os.path.basename(result.path), name))
+            elif os.path.exists(result.path):
+                zf.write(result.path, os.path.basename(result.path))
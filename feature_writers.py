@@ -0,0 +1,245 @@
+"""
+Name: Feature writers
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Pluggable backends for writing features in batches. The arcpy
+backend writes into a geodatabase through arcpy.da.InsertCursor, the GeoPackage
+backend is a pure-Python stand-in (sqlite3) so the import logic can be run and
+benchmarked on machines without ArcGIS.
+"""
+
+import itertools
+import os
+import sqlite3
+import struct
+
+from coordinate_enrichment import authority_of
+
+try:
+    import arcpy
+except ImportError:
+    arcpy = None
+
+# Number of rows converted from arrays to Python values and pushed to the cursor at once
+DEFAULT_BATCH_SIZE = 10000
+
+# arcpy field type -> GeoPackage column type
+GPKG_FIELD_TYPES = {
+    "TEXT": "TEXT",
+    "DOUBLE": "DOUBLE",
+    "FLOAT": "FLOAT",
+    "LONG": "INTEGER",
+    "SHORT": "INTEGER",
+    "DATE": "DATETIME",
+}
+
+
+#------------ arcpy backend
+
+class ArcpyFeatureWriter:
+    """Writes features into a geodatabase feature class with an InsertCursor."""
+
+    def __init__(self, workspace, name, geometry_type, spatial_reference, fields):
+        if arcpy is None:
+            raise RuntimeError("The arcpy backend requires ArcGIS Pro (arcpy is not installed)")
+        self.workspace = workspace
+        self.name = name
+        self.geometry_type = geometry_type.upper()
+        self.spatial_reference = spatial_reference
+        # fields = [(field_name, field_type)] or [(field_name, field_type, alias)]
+        self.fields = [tuple(field) for field in fields]
+        self.path = os.path.join(workspace, name)
+
+    def create(self):
+        arcpy.CreateFeatureclass_management(self.workspace, self.name, self.geometry_type,
+                                            spatial_reference=self.spatial_reference)
+        # One AddFields call instead of one schema change per field
+        arcpy.management.AddFields(self.path, [[field[0], field[1], field[2] if len(field) > 2 else field[0]]
+                                               for field in self.fields])
+
+    def write_rows(self, rows):
+        # Points are written with SHAPE@XY, so no Point/PointGeometry has to be built per row
+        if self.geometry_type == "POINT":
+            shape_token = "SHAPE@XY"
+            to_shape = None
+        else:
+            shape_token = "SHAPE@"
+            to_shape = self._polyline
+
+        count = 0
+        with arcpy.da.InsertCursor(self.path, [shape_token] + [field[0] for field in self.fields]) as cursor:
+            for batch in rows:
+                for row in batch:
+                    if to_shape is not None:
+                        row = (to_shape(row[0]),) + tuple(row[1:])
+                    cursor.insertRow(row)
+                count += len(batch)
+        return count
+
+    def _polyline(self, coordinates):
+        return arcpy.Polyline(arcpy.Array([arcpy.Point(x, y) for x, y in coordinates]), self.spatial_reference)
+
+
+#------------ GeoPackage backend (pure Python)
+
+# GeoPackage binary header: magic, version 0, flags (little endian, no envelope), srs_id
+_GPKG_HEADER = struct.Struct("<2sBBi")
+_WKB_POINT = struct.Struct("<BIdd")
+_WKB_LINESTRING_HEADER = struct.Struct("<BII")
+
+
+def gpkg_point_blob(srs_id, x, y):
+    return _GPKG_HEADER.pack(b"GP", 0, 1, srs_id) + _WKB_POINT.pack(1, 1, x, y)
+
+
+def gpkg_linestring_blob(srs_id, coordinates):
+    flat = [value for xy in coordinates for value in xy]
+    return (_GPKG_HEADER.pack(b"GP", 0, 1, srs_id)
+            + _WKB_LINESTRING_HEADER.pack(1, 2, len(coordinates))
+            + struct.pack("<%dd" % len(flat), *flat))
+
+
+def gpkg_blob_coordinates(blob):
+    # Inverse of gpkg_point_blob / gpkg_linestring_blob, to read features back (see tests/test_feature_writers.py)
+    offset = _GPKG_HEADER.size
+    _, geometry_type = struct.unpack_from("<BI", blob, offset)
+    if geometry_type == 1:
+        return struct.unpack_from("<dd", blob, offset + 5)
+    count = struct.unpack_from("<I", blob, offset + 5)[0]
+    values = struct.unpack_from("<%dd" % (2 * count), blob, offset + 9)
+    return list(zip(values[0::2], values[1::2]))
+
+
+class GeoPackageFeatureWriter:
+    """Writes features into a table of a GeoPackage file using only the standard library."""
+
+    def __init__(self, workspace, name, geometry_type, spatial_reference, fields):
+        self.workspace = workspace
+        self.name = name
+        self.geometry_type = geometry_type.upper()
+        # Registered under the authority of the code; a code of no known authority is the undefined SRS
+        srs_id = _srs_id(spatial_reference)
+        authority = authority_of(srs_id) if srs_id > 0 else None
+        self.organization, self.srs_id = authority or ("NONE", -1)
+        self.fields = [tuple(field) for field in fields]
+        self.path = workspace
+
+    def _connect(self):
+        connection = sqlite3.connect(self.workspace)
+        connection.execute("PRAGMA application_id = 1196444487")  # 'GPKG'
+        connection.execute("PRAGMA user_version = 10300")
+        connection.executescript("""
+            CREATE TABLE IF NOT EXISTS gpkg_spatial_ref_sys (
+                srs_name TEXT NOT NULL, srs_id INTEGER PRIMARY KEY, organization TEXT NOT NULL,
+                organization_coordsys_id INTEGER NOT NULL, definition TEXT NOT NULL, description TEXT);
+            CREATE TABLE IF NOT EXISTS gpkg_contents (
+                table_name TEXT NOT NULL PRIMARY KEY, data_type TEXT NOT NULL, identifier TEXT UNIQUE,
+                description TEXT DEFAULT '', last_change DATETIME NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ','now')),
+                min_x DOUBLE, min_y DOUBLE, max_x DOUBLE, max_y DOUBLE, srs_id INTEGER);
+            CREATE TABLE IF NOT EXISTS gpkg_geometry_columns (
+                table_name TEXT NOT NULL, column_name TEXT NOT NULL, geometry_type_name TEXT NOT NULL,
+                srs_id INTEGER NOT NULL, z TINYINT NOT NULL, m TINYINT NOT NULL,
+                CONSTRAINT pk_geom_cols PRIMARY KEY (table_name, column_name));
+        """)
+        srs = [("Undefined cartesian SRS", -1, "NONE", -1, "undefined", None),
+               ("Undefined geographic SRS", 0, "NONE", 0, "undefined", None)]
+        if self.srs_id > 0:
+            srs.append(("%s:%d" % (self.organization, self.srs_id), self.srs_id, self.organization, self.srs_id,
+                        "undefined", None))
+        connection.executemany("INSERT OR IGNORE INTO gpkg_spatial_ref_sys VALUES (?, ?, ?, ?, ?, ?)", srs)
+        return connection
+
+    def create(self):
+        with self._connect() as connection:
+            connection.execute('DROP TABLE IF EXISTS "%s"' % self.name)
+            connection.execute("DELETE FROM gpkg_contents WHERE table_name = ?", (self.name,))
+            connection.execute("DELETE FROM gpkg_geometry_columns WHERE table_name = ?", (self.name,))
+            columns = ", ".join('"%s" %s' % (field[0], GPKG_FIELD_TYPES.get(field[1].upper(), "TEXT"))
+                                for field in self.fields)
+            connection.execute('CREATE TABLE "%s" (fid INTEGER PRIMARY KEY AUTOINCREMENT, geom BLOB, %s)'
+                               % (self.name, columns))
+            connection.execute("INSERT INTO gpkg_contents (table_name, data_type, identifier, srs_id) VALUES (?, 'features', ?, ?)",
+                               (self.name, self.name, self.srs_id))
+            connection.execute("INSERT INTO gpkg_geometry_columns VALUES (?, 'geom', ?, ?, 0, 0)",
+                               (self.name, "POINT" if self.geometry_type == "POINT" else "LINESTRING", self.srs_id))
+        connection.close()
+
+    def write_rows(self, rows):
+        srs_id = self.srs_id
+        if self.geometry_type == "POINT":
+            to_blob = lambda xy: gpkg_point_blob(srs_id, xy[0], xy[1])
+        else:
+            to_blob = lambda coordinates: gpkg_linestring_blob(srs_id, coordinates)
+
+        sql = 'INSERT INTO "%s" (geom, %s) VALUES (?%s)' % (
+            self.name, ", ".join('"%s"' % field[0] for field in self.fields), ", ?" * len(self.fields))
+        count = 0
+        connection = self._connect()
+        try:
+            with connection:
+                for batch in rows:
+                    connection.executemany(sql, [(to_blob(row[0]),) + tuple(row[1:]) for row in batch])
+                    count += len(batch)
+        finally:
+            connection.close()
+        return count
+
+
+def _srs_id(spatial_reference):
+    # GeoPackage needs an integer srs_id; anything that is not a well-known ID is stored as undefined
+    if spatial_reference is None or spatial_reference == "":
+        return -1
+    factory_code = getattr(spatial_reference, "factoryCode", spatial_reference)
+    try:
+        return int(factory_code)
+    except (TypeError, ValueError):
+        return -1
+
+
+#------------ Backend selection
+
+FEATURE_WRITERS = {
+    "arcpy": ArcpyFeatureWriter,
+    "gpkg": GeoPackageFeatureWriter,
+}
+
+
+def get_feature_writer(backend, workspace, name, geometry_type, spatial_reference, fields):
+    # "auto" picks arcpy inside ArcGIS Pro and the GeoPackage stand-in everywhere else
+    if backend == "auto":
+        backend = "arcpy" if arcpy is not None else "gpkg"
+    if backend not in FEATURE_WRITERS:
+        raise ValueError("Unknown feature writer backend: {} (choose from {})".format(
+            backend, ", ".join(sorted(FEATURE_WRITERS))))
+    return FEATURE_WRITERS[backend](workspace, name, geometry_type, spatial_reference, fields)
+
+
+def iter_batches(rows, batch_size=DEFAULT_BATCH_SIZE):
+    # Lists of at most batch_size rows from any iterable; only one batch is held at a time
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def iter_point_batches(xs, ys, columns, batch_size=DEFAULT_BATCH_SIZE):
+    # Slice the coordinate and attribute arrays into batches of plain Python rows;
+    # tolist() converts a whole slice at once instead of unboxing every value separately
+    total = len(xs)
+    for start in range(0, total, batch_size):
+        stop = min(start + batch_size, total)
+        shapes = list(zip(xs[start:stop].tolist(), ys[start:stop].tolist()))
+        values = [column[start:stop].tolist() for column in columns]
+        yield list(zip(shapes, *values))
+
+
+def write_points(writer, xs, ys, columns, batch_size=DEFAULT_BATCH_SIZE):
+    """Write point features from coordinate arrays and a list of attribute arrays.
+
+    The attribute arrays have to be in the same order as the fields of the writer.
+    Returns the number of rows written.
+    """
+    return writer.write_rows(iter_point_batches(xs, ys, columns, batch_size))
@@ -0,0 +1,108 @@
+"""
+Name: Import manifest
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Sidecar file next to a geodatabase that remembers which workbook
+(hash of its bytes plus the import options) every feature class was built
+from. An import of an unchanged workbook with the same options can then be
+skipped, a changed workbook is always rebuilt.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+
+MANIFEST_SUFFIX = ".import_manifest.json"
+
+# Workbooks are hashed in chunks, so large templates are never held in memory at once
+CHUNK_SIZE = 1024 * 1024
+
+
+def manifest_path(output_gdb):
+    # D:/GIS/Layouts.gdb -> D:/GIS/Layouts.gdb.import_manifest.json
+    return os.path.normpath(output_gdb) + MANIFEST_SUFFIX
+
+
+def file_signature(path):
+    # Cheap stand-in for files that are only looked up (e.g. the data inventory), not imported
+    if not path or not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def import_key(file_path, options):
+    """Hash of the workbook bytes plus the import options (sheet, column mapping, spatial reference, ...).
+
+    A folder input (a layout store) is hashed file by file, in name order.
+    """
+    digest = hashlib.sha256()
+    files = [file_path]
+    if os.path.isdir(file_path):
+        files = [os.path.join(file_path, name) for name in sorted(os.listdir(file_path))]
+    for path in files:
+        if path != file_path:
+            digest.update(os.path.basename(path).encode("utf-8"))
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+    digest.update(json.dumps(options, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def run_options(skip=(), export_formats=(), overwrite_exports=False, export_archive=None):
+    """The options of a run that decide what it leaves behind besides the feature class, for the import key.
+
+    A run that skipped a stage (e.g. the export) or exported other formats is not the same import as a full run,
+    so the next full run does not take its feature class as up to date. The cache and manifest stages themselves
+    do not count.
+    """
+    return {"skip": sorted(set(skip) - {"cache", "manifest"}),
+            "export_formats": sorted(str(item).upper() for item in export_formats or ()),
+            "overwrite_exports": bool(overwrite_exports),
+            "export_archive": os.path.abspath(export_archive) if export_archive else None}
+
+
+class ImportManifest:
+    """Entries by feature class name: {key, tool, file, rows, imported}."""
+
+    def __init__(self, output_gdb):
+        self.path = manifest_path(output_gdb)
+        self.entries = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self.entries = json.load(f).get("entries", {})
+            except (ValueError, OSError):
+                # A broken manifest only costs a rebuild, never a wrong skip
+                self.entries = {}
+
+    def get(self, output_fc):
+        return self.entries.get(output_fc.lower())
+
+    def is_current(self, output_fc, key):
+        entry = self.get(output_fc)
+        return entry is not None and entry["key"] == key
+
+    def record(self, output_fc, key, tool, file_path, rows):
+        self.entries[output_fc.lower()] = {
+            "key": key,
+            "tool": tool,
+            "file": os.path.abspath(file_path),
+            "rows": rows,
+            "imported": datetime.datetime.now().isoformat(timespec="seconds"),
+        }
+        self.save()
+
+    def forget(self, output_fc):
+        if self.entries.pop(output_fc.lower(), None) is not None:
+            self.save()
+
+    def save(self):
+        # Write to a temporary file first, so an interrupted run never leaves half a manifest behind
+        temporary = self.path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({"entries": self.entries}, f, indent=1, sort_keys=True)
+        os.replace(temporary, self.path)
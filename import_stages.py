@@ -0,0 +1,93 @@
+"""
+Name: Import stages
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: The stages both import tools end with - metadata from the data
+inventory, alias name, export (Shapefile, DWG and the other formats of
+feature_export.py) - plus the import manifest check and record. Every stage
+takes the pipeline context (see pipeline.py).
+"""
+
+import arcpy
+
+from data_inventory import apply_metadata
+from feature_export import DEFAULT_FORMATS, export_feature_class
+from import_manifest import ImportManifest
+from layout_diff import DIFF
+
+
+#-------  Establishing Alias Names
+
+def set_alias_name(fc_path, output_fc):
+    # Get the describe object for the feature class
+    desc = arcpy.Describe(fc_path)
+    current_alias = desc.aliasName
+    arcpy.AddMessage(current_alias)
+
+    # Create a new alias name by replacing underscores with spaces
+    new_alias = output_fc.replace("_", " ")
+
+    try:
+        # Set the new alias name for the feature class
+        arcpy.AlterAliasName(fc_path, new_alias)
+        arcpy.AddMessage("Alias name changed successfully.")
+
+    except Exception as e:
+        arcpy.AddMessage("An error occurred during creating alias name")
+
+
+#------------ Stages shared by the WTG and GRID import
+
+def cache_stage(context):
+    # Stop the pipeline when the feature class was built from the same workbook with the same options
+    manifest = ImportManifest(context["output_gdb"])
+    context["manifest"] = manifest
+    if arcpy.Exists(context["fc_path"]):
+        if manifest.is_current(context["output_fc"], context["import_key"]):
+            arcpy.AddMessage(f"{context['output_fc']} is up to date with {context['file_path']}, import skipped")
+            context["stop"] = True
+            return 0
+        if context.get("update_mode") == DIFF:
+            arcpy.AddMessage("The feature class already exists in geodatabase but the workbook changed, applying the changes")
+        else:
+            arcpy.AddMessage("The feature class already exists in geodatabase but the workbook changed, rebuilding it")
+            arcpy.management.Delete(context["fc_path"])
+    manifest.forget(context["output_fc"])
+
+
+def metadata_stage(context):
+    # The inventory is parsed once and cached, see data_inventory.py
+    if context.get("data_inventory"):
+        apply_metadata([(context["fc_path"], context["output_fc"])], context["data_inventory"],
+                       context.get("sheet_data_inventory", 0))
+
+
+def alias_stage(context):
+    set_alias_name(context["fc_path"], context["output_fc"])
+
+
+def export_stage(context):
+    # After a diff (see layout_diff.py) the exports are only redone when a feature changed, and then replaced
+    changes = context.get("changes")
+    if changes is not None and not changes:
+        arcpy.AddMessage("No feature changed, the exports are up to date")
+        return
+    # All formats from one read of the feature class, see feature_export.py
+    results = export_feature_class(context["fc_path"], context["output_fc"], context["export_folder"],
+                                   context.get("export_formats") or DEFAULT_FORMATS,
+                                   context.get("overwrite_exports", False) or changes is not None,
+                                   context.get("export_archive"))
+    context["export_results"] = results
+
+
+def manifest_stage(context):
+    # A failed export leaves the import unrecorded, so the next run does it again instead of skipping it
+    failed = [result.format for result in context.get("export_results", []) if result.status == "failed"]
+    if failed:
+        arcpy.AddWarning(f"{', '.join(failed)} export failed, {context['output_fc']} is not recorded in the import "
+                         f"manifest and will be imported again by the next run")
+        return 0
+    manifest = context.get("manifest") or ImportManifest(context["output_gdb"])
+    manifest.record(context["output_fc"], context["import_key"], context["tool"], context["file_path"],
+                    context.get("rows", 0))
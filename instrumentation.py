@@ -0,0 +1,342 @@
+"""
+Name: Instrumentation
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Measurements of a tool run. A run (RunReport) collects spans:
+one per geoprocessing call, cursor loop or pipeline stage, with wall time,
+rows, bytes read/written by the process, the RSS after the span and the
+peak RSS during the span (sampled by a thread while the run is open). At
+the end of the run a JSON report is written for collecting the runs of many
+machines, and a summary table goes through AddMessage. cProfile and
+tracemalloc can be switched on per run (profile="CPROFILE", "TRACEMALLOC"
+or "ALL").
+
+Usage:
+    with RunReport("Cable orientation", parameters, report_path, profile):
+        with span("Buffer") as measured:
+            arcpy.Buffer_analysis(...)
+            measured.rows = ...
+
+span() outside a run measures nothing, so instrumented functions can also be
+called on their own.
+"""
+
+import contextvars
+import cProfile
+import datetime
+import io
+import json
+import os
+import platform
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+
+try:
+    import arcpy
+    _message = arcpy.AddMessage
+except ImportError:
+    arcpy = None
+    _message = print
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+CPROFILE = "CPROFILE"
+TRACEMALLOC = "TRACEMALLOC"
+ALL = "ALL"
+
+REPORT_SUFFIX = "_run_report.json"
+
+# Functions and allocation sites listed in the report when profiling
+PROFILE_TOP = 25
+
+# Seconds between two RSS samples for the peak memory of the spans
+SAMPLE_SECONDS = 0.01
+
+_current_run = contextvars.ContextVar("current_run", default=None)
+
+
+def _io_bytes():
+    # Bytes read and written by this process so far, None where psutil cannot tell (macOS)
+    if psutil is None:
+        return None
+    try:
+        counters = psutil.Process().io_counters()
+    except (AttributeError, psutil.Error):
+        return None
+    return counters.read_bytes, counters.write_bytes
+
+
+def rss_mb():
+    return psutil.Process().memory_info().rss / 2 ** 20 if psutil is not None else None
+
+
+class MemorySampler:
+    """Thread sampling the RSS every SAMPLE_SECONDS into peak_rss_mb of every open span.
+
+    The process high-water mark (maxrss, peak working set) never goes down, so it cannot tell the peak of one
+    step after a heavier one; the samples can. A peak shorter than the interval may be missed between two
+    samples, the RSS at the start and end of a span is always taken.
+    """
+
+    def __init__(self):
+        self._process = psutil.Process()
+        self._open = set()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(SAMPLE_SECONDS):
+            self.sample()
+
+    def sample(self):
+        rss = self._process.memory_info().rss / 2 ** 20
+        with self._lock:
+            for item in self._open:
+                if item.peak_rss_mb is None or rss > item.peak_rss_mb:
+                    item.peak_rss_mb = rss
+
+    def open(self, item):
+        with self._lock:
+            self._open.add(item)
+        self.sample()
+
+    def close(self, item):
+        self.sample()
+        with self._lock:
+            self._open.discard(item)
+
+
+class Span:
+    """One measured step; rows can be set inside the with block. depth counts the enclosing spans."""
+
+    __slots__ = ("name", "depth", "seconds", "rows", "bytes_read", "bytes_written", "rss_mb", "peak_rss_mb",
+                 "peak_traced_mb", "status", "_started", "_io", "_run")
+
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.depth = 0
+        self.rows = rows
+        self.seconds = 0.0
+        self.bytes_read = self.bytes_written = None
+        self.rss_mb = self.peak_rss_mb = self.peak_traced_mb = None
+        self.status = "running"
+        self._run = None
+
+    def __enter__(self):
+        # Listed in the order the steps started, an enclosing step before its inner ones
+        self._run = _current_run.get()
+        if self._run is not None:
+            self.depth = self._run.depth
+            self._run.depth += 1
+            self._run.spans.append(self)
+        self._io = _io_bytes()
+        if self._sampler() is not None:
+            self._sampler().open(self)
+        if self._traced():
+            # reset_peak() would lose the peak of the enclosing span so far: it is kept on the run's stack first
+            peaks = self._run._traced_peaks
+            if peaks:
+                peaks[-1] = max(peaks[-1], tracemalloc.get_traced_memory()[1])
+            peaks.append(0)
+            tracemalloc.reset_peak()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, error_type, error, tb):
+        self.seconds = time.perf_counter() - self._started
+        after = _io_bytes()
+        if self._io is not None and after is not None:
+            self.bytes_read = after[0] - self._io[0]
+            self.bytes_written = after[1] - self._io[1]
+        self.rss_mb = rss_mb()
+        if self._sampler() is not None:
+            self._sampler().close(self)
+        if self._traced() and self._run._traced_peaks:
+            # Peak since the last reset or of an inner span, whichever is higher; it counts for the enclosing span too
+            peaks = self._run._traced_peaks
+            peak = max(peaks.pop(), tracemalloc.get_traced_memory()[1])
+            if peaks:
+                peaks[-1] = max(peaks[-1], peak)
+            self.peak_traced_mb = peak / 2 ** 20
+        self.status = "failed" if error_type else "done"
+        if self._run is not None:
+            self._run.depth -= 1
+        return False
+
+    def _sampler(self):
+        # Peak memory only inside a run, and only where psutil can read the RSS
+        return self._run._memory if self._run is not None else None
+
+    def _traced(self):
+        # Python allocations only with the TRACEMALLOC profile of the run, tracing slows every stage down
+        return self._run is not None and self._run.profile in (TRACEMALLOC, ALL) and tracemalloc.is_tracing()
+
+    def as_dict(self):
+        # peak_traced_mb only in reports of runs with the TRACEMALLOC profile
+        return {name: getattr(self, name) for name in self.__slots__
+                if not name.startswith("_") and not (name == "peak_traced_mb" and self.peak_traced_mb is None)}
+
+
+def span(name, rows=None):
+    """Measure the with block as one step of the current run (if any)."""
+    return Span(name, rows)
+
+
+def current_run():
+    return _current_run.get()
+
+
+def report_path(run_report, folder, name):
+    """Path of the JSON report of a tool: run_report True is <name>_run_report.json in folder (if it exists),
+    a string is the path itself, False/None is no report."""
+    if isinstance(run_report, str):
+        return run_report
+    if run_report and folder and os.path.isdir(folder):
+        return os.path.join(folder, name + REPORT_SUFFIX)
+    return None
+
+
+class RunReport:
+    """A whole tool run: its spans, the profile and the JSON report written at the end.
+
+    report_path None writes no file (the summary is still shown). profile: None, CPROFILE, TRACEMALLOC or ALL.
+    """
+
+    def __init__(self, tool, parameters=None, report_path=None, profile=None):
+        self.tool = tool
+        self.parameters = parameters or {}
+        self.report_path = report_path
+        self.profile = (profile or "").upper() or None
+        if self.profile not in (None, CPROFILE, TRACEMALLOC, ALL):
+            raise ValueError(f"Unknown profile {profile}, use {CPROFILE}, {TRACEMALLOC} or {ALL}")
+        self.run_id = uuid.uuid4().hex
+        self.spans = []
+        self.depth = 0
+        self.status = "running"
+        self.error = ""
+        # Figures of the whole run set by the tool, e.g. {"rows": 1200}
+        self.totals = {}
+        self.profile_stats = None
+        self.allocations = None
+        self._profiler = None
+        self._started_tracing = False
+        self._memory = None
+        # Traced peak of every open span, innermost last (see Span)
+        self._traced_peaks = []
+
+    def __enter__(self):
+        self.started = datetime.datetime.now()
+        self._memory = MemorySampler().start() if psutil is not None else None
+        self._total = Span(self.tool).__enter__()
+        if self._memory is not None:
+            self._memory.open(self._total)
+        self._token = _current_run.set(self)
+        if self.profile in (TRACEMALLOC, ALL) and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if self.profile in (CPROFILE, ALL):
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def __exit__(self, error_type, error, tb):
+        _current_run.reset(self._token)
+        self._total.__exit__(error_type, error, tb)
+        if self._memory is not None:
+            self._memory.close(self._total)
+            self._memory.stop()
+        self.status = "failed" if error_type else "done"
+        self.error = f"{error_type.__name__}: {error}" if error_type else ""
+        if self._profiler is not None:
+            self._profiler.disable()
+            self.profile_stats = self._top_functions()
+        if tracemalloc.is_tracing() and self.profile in (TRACEMALLOC, ALL):
+            self.allocations = [{"site": str(stat.traceback), "size_mb": stat.size / 2 ** 20, "count": stat.count}
+                                for stat in tracemalloc.take_snapshot().statistics("lineno")[:PROFILE_TOP]]
+        if self._started_tracing:
+            tracemalloc.stop()
+
+        # A report that cannot be written must not hide the result (or the error) of the run
+        try:
+            self.summarize()
+            if self.report_path:
+                self.write(self.report_path)
+        except Exception as e:
+            _message(f"Run report not written: {e}")
+        return False
+
+    def _top_functions(self):
+        stream = io.StringIO()
+        stats = pstats.Stats(self._profiler, stream=stream).sort_stats("cumulative")
+        if self.report_path:
+            # The full profile next to the report, for snakeviz, pstats, ...
+            stats.dump_stats(os.path.splitext(self.report_path)[0] + ".prof")
+        top = []
+        for (file_name, line, function), (calls, _, own, cumulative, _) in stats.stats.items():
+            top.append({"function": f"{os.path.basename(file_name)}:{line}({function})", "calls": calls,
+                        "own_seconds": own, "cumulative_seconds": cumulative})
+        return sorted(top, key=lambda item: -item["cumulative_seconds"])[:PROFILE_TOP]
+
+    def as_dict(self):
+        return {
+            "run_id": self.run_id,
+            "tool": self.tool,
+            "status": self.status,
+            "error": self.error,
+            "started": self.started.isoformat(timespec="seconds"),
+            "seconds": self._total.seconds,
+            "peak_rss_mb": self._total.peak_rss_mb,
+            "host": platform.node(),
+            "python": sys.version.split()[0],
+            "arcpy": arcpy.GetInstallInfo().get("Version") if arcpy is not None and hasattr(arcpy, "GetInstallInfo")
+            else None,
+            "parameters": {name: value if isinstance(value, (int, float, bool, type(None))) else str(value)
+                           for name, value in self.parameters.items()},
+            "totals": self.totals,
+            "spans": [item.as_dict() for item in self.spans],
+            "profile": self.profile_stats,
+            "allocations": self.allocations,
+        }
+
+    def write(self, report_path):
+        folder = os.path.dirname(report_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        temporary = report_path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(self.as_dict(), f, indent=1)
+        os.replace(temporary, report_path)
+        _message(f"Run report: {report_path}")
+
+    def summarize(self):
+        lines = [f"{self.tool} - {self.status} in {self._total.seconds:.2f} s",
+                 f"  {'step':28} {'time [s]':>9} {'rows':>9} {'read [MB]':>10} {'written [MB]':>12} {'RSS [MB]':>9} "
+                 f"{'peak [MB]':>10}"]
+        for item in self.spans:
+            name = "  " * item.depth + item.name
+            lines.append(f"  {name[:28]:28} {item.seconds:9.2f} {'' if item.rows is None else item.rows:>9} "
+                         f"{'' if item.bytes_read is None else format(item.bytes_read / 2 ** 20, '.1f'):>10} "
+                         f"{'' if item.bytes_written is None else format(item.bytes_written / 2 ** 20, '.1f'):>12} "
+                         f"{'' if item.rss_mb is None else format(item.rss_mb, '.0f'):>9} "
+                         f"{'' if item.peak_rss_mb is None else format(item.peak_rss_mb, '.0f'):>10}")
+        for item in (self.profile_stats or [])[:10]:
+            lines.append(f"  profile {item['cumulative_seconds']:8.2f} s {item['calls']:>8}  {item['function']}")
+        for line in lines:
+            _message(line)
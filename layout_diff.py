@@ -0,0 +1,177 @@
+"""
+Name: Layout diff
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Incremental update of an existing layout feature class from a
+new revision of the workbook. The rows of the feature class and of the new
+workbook are keyed (WTG ID, or Start/End point of a cable) into hash maps,
+so matching them takes one pass over each side instead of nested lookups.
+Only the inserted, updated and deleted features are written, in one update
+pass and one insert pass, and the changes are listed in a CSV change report.
+A key that is not unique on either side cannot be matched; the diff then
+raises DuplicateKeyError before anything is written, and the tools rebuild.
+"""
+
+import csv
+import os
+from collections import namedtuple
+
+try:
+    import arcpy
+except ImportError:
+    arcpy = None
+
+# Update mode of the import tools: rebuild the feature class, or apply only the differences
+REBUILD = "REBUILD"
+DIFF = "DIFF"
+
+INSERT = "INSERT"
+UPDATE = "UPDATE"
+DELETE = "DELETE"
+
+CHANGES_SUFFIX = "_changes.csv"
+
+# Numbers closer than this are the same value (coordinates in map units, read back from a geodatabase)
+VALUE_TOLERANCE = 1e-6
+
+# One changed feature; old/new are the values of the compared fields (None for inserts/deletes), oid of the old row
+Change = namedtuple("Change", ["kind", "key", "oid", "old", "new"])
+
+
+class DuplicateKeyError(ValueError):
+    """Keys that occur more than once in the feature class or the new revision, so no diff can be applied."""
+
+    def __init__(self, side, keys):
+        self.side = side
+        self.keys = sorted(keys, key=str)
+        super().__init__(f"{len(self.keys)} key(s) occur more than once in the {side}: {self.keys[:20]}")
+
+
+def keyed(pairs, side="new revision"):
+    """{key: values} of (key, values) pairs; DuplicateKeyError when a key occurs more than once."""
+    rows = {}
+    duplicates = set()
+    for key, values in pairs:
+        if key in rows:
+            duplicates.add(key)
+        rows[key] = values
+    if duplicates:
+        raise DuplicateKeyError(side, duplicates)
+    return rows
+
+
+def _same(old, new, tolerance=VALUE_TOLERANCE):
+    if old is None or new is None:
+        return old is None and new is None
+    try:
+        return abs(float(old) - float(new)) <= tolerance
+    except (TypeError, ValueError):
+        return str(old) == str(new)
+
+
+def read_keyed_rows(fc_path, key_fields, value_fields):
+    """{key: (oid, values)} of all rows of fc_path; the key is the value of the key fields (a tuple for several).
+
+    Raises DuplicateKeyError when a key occurs in more than one row: only one of them could be matched, the
+    others would never be updated or deleted.
+    """
+    width = len(key_fields)
+    with arcpy.da.SearchCursor(fc_path, ["OID@"] + list(key_fields) + list(value_fields)) as cursor:
+        return keyed(((row[1] if width == 1 else tuple(row[1:width + 1]), (row[0], tuple(row[width + 1:])))
+                      for row in cursor), "feature class")
+
+
+def diff_rows(existing, incoming, tolerance=VALUE_TOLERANCE):
+    """Changes that turn existing ({key: (oid, values)}) into incoming ({key: values}), as a list of Change."""
+    changes = []
+    for key, values in incoming.items():
+        current = existing.get(key)
+        if current is None:
+            changes.append(Change(INSERT, key, None, None, values))
+        elif len(current[1]) != len(values) or not all(_same(old, new, tolerance) for old, new in zip(current[1], values)):
+            changes.append(Change(UPDATE, key, current[0], current[1], values))
+    for key, (oid, values) in existing.items():
+        if key not in incoming:
+            changes.append(Change(DELETE, key, oid, values, None))
+    return changes
+
+
+def apply_changes(fc_path, key_fields, value_fields, changes, to_shape, shape_token="SHAPE@"):
+    """Write the changes into fc_path: one update pass for updates and deletes, one insert pass for inserts.
+
+    to_shape(key, values) is the geometry of a new or updated feature. Returns {kind: count}. The inserts in
+    changes get the oid of their new row, so the caller can find all written rows (see written_oids).
+    """
+    by_oid = {change.oid: change for change in changes if change.kind != INSERT}
+    fields = list(key_fields) + list(value_fields)
+    counts = {INSERT: 0, UPDATE: 0, DELETE: 0}
+
+    if by_oid:
+        with arcpy.da.UpdateCursor(fc_path, ["OID@", shape_token] + list(value_fields)) as cursor:
+            for row in cursor:
+                change = by_oid.get(row[0])
+                if change is None:
+                    continue
+                if change.kind == DELETE:
+                    cursor.deleteRow()
+                else:
+                    cursor.updateRow([row[0], to_shape(change.key, change.new), *change.new])
+                counts[change.kind] += 1
+
+    inserts = [(i, change) for i, change in enumerate(changes) if change.kind == INSERT]
+    if inserts:
+        with arcpy.da.InsertCursor(fc_path, [shape_token] + fields) as cursor:
+            for i, change in inserts:
+                key = change.key if len(key_fields) > 1 else (change.key,)
+                oid = cursor.insertRow([to_shape(change.key, change.new), *key, *change.new])
+                changes[i] = change._replace(oid=oid)
+                counts[INSERT] += 1
+    return counts
+
+
+def written_oids(changes):
+    # Rows of the feature class that a diff inserted or updated, e.g. the ones whose derived fields are redone
+    return {change.oid for change in changes if change.kind in (INSERT, UPDATE)}
+
+
+def write_change_report(changes, value_fields, report_path):
+    """CSV with one line per inserted/deleted feature and per changed field of an updated feature."""
+    with open(report_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Change", "Key", "Field", "Old value", "New value"])
+        for change in changes:
+            key = " - ".join(str(part) for part in change.key) if isinstance(change.key, tuple) else change.key
+            if change.kind == UPDATE:
+                for field, old, new in zip(value_fields, change.old, change.new):
+                    if not _same(old, new):
+                        writer.writerow([change.kind, key, field, old, new])
+            else:
+                writer.writerow([change.kind, key, "", "", ""])
+    return report_path
+
+
+def changed_keys(report_path):
+    # Keys of all features in a change report, e.g. the WTGs whose cable orientation has to be refreshed
+    with open(report_path, newline="") as f:
+        return sorted({row["Key"] for row in csv.DictReader(f)})
+
+
+def diff_feature_class(fc_path, key_fields, value_fields, incoming, to_shape, report_folder, output_fc,
+                       shape_token="SHAPE@", existing=None):
+    """Bring fc_path in line with incoming ({key: values}) and write <output_fc>_changes.csv into report_folder.
+
+    existing is the read_keyed_rows of fc_path, if the caller read them already. Returns the list of Change.
+    """
+    if existing is None:
+        existing = read_keyed_rows(fc_path, key_fields, value_fields)
+    changes = diff_rows(existing, incoming)
+    counts = apply_changes(fc_path, key_fields, value_fields, changes, to_shape, shape_token)
+    arcpy.AddMessage(f"{output_fc}: {counts[INSERT]} inserted, {counts[UPDATE]} updated, {counts[DELETE]} deleted, "
+                     f"{len(incoming) - counts[INSERT] - counts[UPDATE]} unchanged")
+
+    report_path = os.path.join(report_folder, output_fc + CHANGES_SUFFIX)
+    if os.path.isdir(report_folder):
+        write_change_report(changes, value_fields, report_path)
+        arcpy.AddMessage(f"Change report: {report_path}")
+    return changes
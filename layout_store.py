@@ -0,0 +1,186 @@
+"""
+Name: Layout store
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Columnar on-disk store for large sets of WTG positions, e.g. the
+candidate positions of a layout optimization. A store is a folder
+<name>.layout with one .npy file per column (ID, SHAPE_X/SHAPE_Y, native and
+ETRS89 X/Y, attributes) in a fixed dtype, plus schema.json with the number of
+rows, the dtypes and the coordinate system. Columns are opened as memory maps:
+opening a store reads only the schema and the .npy headers whatever its size,
+and a column is paged in from disk (or the page cache) when it is used.
+
+Written by the LAYOUT export format of the import tools (see
+feature_export.py) and read by the WTG import and the array based cable
+orientation engines instead of a workbook or feature class.
+
+Usage:
+    store = LayoutStore("D:/Layouts/WTG_Layout.layout")
+    xs, ys = store["SHAPE_X"], store["SHAPE_Y"]      # numpy memmaps, no copy
+
+    with LayoutStore.create("D:/Candidates.layout", rows, {"ID": "<U16", "SHAPE_X": "f8", "SHAPE_Y": "f8"},
+                            25832) as store:
+        store["SHAPE_X"][:] = ...                    # written straight into the file
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+
+from coordinate_enrichment import crs_of, transform
+
+try:
+    import arcpy
+except ImportError:
+    arcpy = None
+
+STORE_EXTENSION = ".layout"
+SCHEMA_FILE = "schema.json"
+SCHEMA_VERSION = 1
+
+# Point geometry of the features, in the coordinate system of the store
+X_COLUMN = "SHAPE_X"
+Y_COLUMN = "SHAPE_Y"
+
+
+def is_layout_store(path):
+    return str(path).lower().rstrip("/\\").endswith(STORE_EXTENSION) and os.path.isdir(path)
+
+
+def _column_file(path, name):
+    return os.path.join(path, name + ".npy")
+
+
+class LayoutStore:
+    """Columns of a store as memory maps, opened on first use. mode "r" (read only) or "r+" (update in place)."""
+
+    def __init__(self, path, mode="r"):
+        self.path = path
+        self.mode = mode
+        with open(os.path.join(path, SCHEMA_FILE), encoding="utf-8") as f:
+            schema = json.load(f)
+        if schema.get("version") != SCHEMA_VERSION:
+            raise ValueError(f"{path} is a layout store of version {schema.get('version')}, "
+                             f"this tool reads version {SCHEMA_VERSION}")
+        self.rows = schema["rows"]
+        self.spatial_reference = schema["spatial_reference"]
+        self.dtypes = {name: np.dtype(dtype) for name, dtype in schema["columns"].items()}
+        self._columns = {}
+
+    @classmethod
+    def create(cls, path, rows, dtypes, spatial_reference=None):
+        """New store with rows rows and the columns {name: dtype}, opened for writing in place.
+
+        The store is written into <path>.tmp and moved to path by close() (or the end of the with
+        block), so a reader never sees a half-written store.
+        """
+        dtypes = {name: np.dtype(dtype) for name, dtype in dtypes.items()}
+        objects = [name for name, dtype in dtypes.items() if dtype.hasobject]
+        if objects:
+            raise ValueError(f"Column(s) {objects} have no fixed dtype, use e.g. '<U32' for text")
+        temporary = path.rstrip("/\\") + ".tmp"
+        shutil.rmtree(temporary, ignore_errors=True)
+        os.makedirs(temporary)
+        for name, dtype in dtypes.items():
+            np.lib.format.open_memmap(_column_file(temporary, name), mode="w+", dtype=dtype, shape=(rows,)).flush()
+        with open(os.path.join(temporary, SCHEMA_FILE), "w", encoding="utf-8") as f:
+            json.dump({"version": SCHEMA_VERSION, "rows": rows, "spatial_reference": spatial_reference,
+                       "columns": {name: dtype.str for name, dtype in dtypes.items()}}, f, indent=1)
+        store = cls(temporary, "r+")
+        store._target = path
+        return store
+
+    def __getitem__(self, name):
+        if name not in self._columns:
+            if name not in self.dtypes:
+                raise KeyError(f"No column {name} in {self.path}, available columns: {list(self.dtypes)}")
+            self._columns[name] = np.load(_column_file(self.path, name), mmap_mode=self.mode)
+        return self._columns[name]
+
+    def __contains__(self, name):
+        return name in self.dtypes
+
+    def __len__(self):
+        return self.rows
+
+    @property
+    def names(self):
+        return list(self.dtypes)
+
+    def close(self):
+        # Memory maps keep the files open (and locked on Windows) until they are dropped
+        for column in self._columns.values():
+            if self.mode != "r":
+                column.flush()
+        self._columns = {}
+        target = getattr(self, "_target", None)
+        if target is not None:
+            shutil.rmtree(target, ignore_errors=True)
+            os.replace(self.path, target)
+            self.path, self.mode, self._target = target, "r", None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, error_type, error, tb):
+        if error_type is not None and getattr(self, "_target", None) is not None:
+            # A failed write leaves the earlier store as it was
+            self._columns = {}
+            shutil.rmtree(self.path, ignore_errors=True)
+            return False
+        self.close()
+        return False
+
+
+def write_layout_store(path, columns, spatial_reference=None):
+    """Store of the arrays columns ({name: array}, all of the same length). Returns path."""
+    columns = {name: np.asarray(values) for name, values in columns.items()}
+    rows = len(next(iter(columns.values()))) if columns else 0
+    with LayoutStore.create(path, rows, {name: values.dtype for name, values in columns.items()},
+                            spatial_reference) as store:
+        for name, values in columns.items():
+            store[name][:] = values
+    return path
+
+
+#------------ Feature classes
+
+def export_layout_store(fc_path, path):
+    """Store of a point feature class: its point geometry as SHAPE_X/SHAPE_Y plus every attribute field."""
+    describe = arcpy.Describe(fc_path)
+    if describe.shapeType.upper() != "POINT":
+        raise ValueError(f"A layout store holds points, {fc_path} has {describe.shapeType} features")
+    fields = [field for field in arcpy.ListFields(fc_path)
+              if field.type in ("String", "Double", "Single", "Integer", "SmallInteger")]
+    # No nulls in a fixed dtype: empty text, NaN for reals and missing points, -1 for integers
+    nulls = {field.name: "" if field.type == "String" else np.nan if field.type in ("Double", "Single") else -1
+             for field in fields}
+    nulls.update({"SHAPE@X": np.nan, "SHAPE@Y": np.nan})
+    values = arcpy.da.FeatureClassToNumPyArray(fc_path, ["SHAPE@X", "SHAPE@Y"] + [field.name for field in fields],
+                                               null_value=nulls)
+    columns = {X_COLUMN: values["SHAPE@X"], Y_COLUMN: values["SHAPE@Y"]}
+    columns.update((field.name, values[field.name]) for field in fields)
+    # A coordinate system pyproj cannot read is kept as its WKT, the store can then only be read in it
+    crs = crs_of(describe.spatialReference) or describe.spatialReference.exportToString()
+    return write_layout_store(path, columns, crs)
+
+
+def read_points(path, fields, spatial_reference=None):
+    """{"SHAPE@X", "SHAPE@Y", field: array} of a store, like FeatureClassToNumPyArray on a point feature class.
+
+    The arrays are the memory maps themselves; only when spatial_reference differs from the one of the
+    store are the coordinates projected into new arrays.
+    """
+    store = LayoutStore(path)
+    xs, ys = store[X_COLUMN], store[Y_COLUMN]
+    target = store.spatial_reference
+    if spatial_reference is not None:
+        target = crs_of(spatial_reference) or spatial_reference.exportToString()
+    if store.spatial_reference is not None and target != store.spatial_reference:
+        xs, ys = transform(xs, ys, store.spatial_reference, target)
+    points = {"SHAPE@X": xs, "SHAPE@Y": ys}
+    points.update((field, store[field]) for field in fields)
+    return points
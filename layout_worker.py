@@ -0,0 +1,197 @@
+"""
+Name: Layout worker
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Long-lived worker process for batch scripting. Importing arcpy,
+pandas and openpyxl takes longer than the whole run for a small layout, so
+the worker imports them once and then runs WTG import, GRID import and cable
+orientation jobs as plain function calls, one after the other. Clients talk
+to it over a local socket (127.0.0.1 only) secured with a random key; the
+port and key of the running worker are kept in a session file in the temp
+folder of the user.
+
+The worker keeps the modules it loaded at start: restart it after the tools
+were changed.
+
+Usage:
+    python layout_worker.py serve [--port 6011] [--timeout 30]
+    python layout_worker.py run cable_orientation '["D:/GIS/Layouts.gdb/WTG", "ID", "X", "Y", ...]' ['{"engine": "SPATIAL_INDEX"}']
+    python layout_worker.py ping
+    python layout_worker.py stop
+"""
+
+import argparse
+import importlib
+import json
+import os
+import secrets
+import sys
+import tempfile
+import time
+import traceback
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+DEFAULT_PORT = 6011
+# Seconds a client gets to send its request after connecting, before the worker drops it for the next one
+REQUEST_TIMEOUT = 30
+SESSION_FILE = os.path.join(tempfile.gettempdir(), "layout_worker.json")
+
+# Job name -> (module, function); the modules are imported once, when the worker starts
+JOBS = {
+    "wtg_import": ("WTG_Import_layout", "import_wtg_layout"),
+    "grid_import": ("GRID_import_layout", "import_grid_layout"),
+    "cable_orientation": ("GRID_Cable_Orientation", "cable_orientation"),
+}
+
+
+class WorkerError(RuntimeError):
+    """A job failed in the worker; remote_traceback holds the traceback from the worker process."""
+
+    def __init__(self, message, remote_traceback=""):
+        super().__init__(message)
+        self.remote_traceback = remote_traceback
+
+
+#------------ Worker
+
+def load_jobs():
+    # The expensive part of every tool run: arcpy, pandas, openpyxl and numpy come in with the tool modules
+    return {name: getattr(importlib.import_module(module), function) for name, (module, function) in JOBS.items()}
+
+
+def run_request(jobs, request):
+    """Answer to one request: {"status": "ok", "result": ..., "seconds": ...} or status "failed" with the error."""
+    if request.get("command") == "ping":
+        return {"status": "ok", "result": {"pid": os.getpid(), "jobs": sorted(jobs)}, "seconds": 0.0}
+    job = request.get("job")
+    if job not in jobs:
+        return {"status": "failed", "error": f"Unknown job {job}, choose from {', '.join(sorted(jobs))}",
+                "traceback": "", "seconds": 0.0}
+
+    # Loaded with the tools already; imported here so the client side stays free of arcpy
+    import arcpy
+    workspace = arcpy.env.workspace
+    started = time.perf_counter()
+    try:
+        result = jobs[job](*request.get("args", []), **request.get("kwargs", {}))
+        answer = {"status": "ok", "result": result}
+    except Exception as e:
+        answer = {"status": "failed", "error": f"{type(e).__name__}: {e}", "traceback": traceback.format_exc()}
+    finally:
+        # Jobs share the process: no workspace or schema lock may carry over to the next job
+        arcpy.env.workspace = workspace
+        arcpy.management.ClearWorkspaceCache()
+    answer["seconds"] = time.perf_counter() - started
+    return answer
+
+
+def serve(port=DEFAULT_PORT, session_file=SESSION_FILE, request_timeout=REQUEST_TIMEOUT):
+    started = time.perf_counter()
+    jobs = load_jobs()
+    print(f"Modules loaded in {time.perf_counter() - started:.2f} s")
+
+    authkey = secrets.token_bytes(32)
+    with Listener(("127.0.0.1", port), authkey=authkey) as listener:
+        # Only the user that started the worker can read the key
+        descriptor = os.open(session_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(descriptor, "w") as f:
+            json.dump({"port": listener.address[1], "authkey": authkey.hex(), "pid": os.getpid()}, f)
+        print(f"Layout worker {os.getpid()} listening on {listener.address[0]}:{listener.address[1]}")
+        try:
+            while True:
+                # One job at a time: a file geodatabase takes only one writer anyway
+                try:
+                    connection = listener.accept()
+                except (AuthenticationError, EOFError, OSError) as e:
+                    # A client with a wrong key or one that went away must not end the worker
+                    print(f"Connection refused: {type(e).__name__}: {e}")
+                    continue
+                with connection:
+                    try:
+                        # A client that connected and sends nothing must not hold up the clients behind it
+                        if not connection.poll(request_timeout):
+                            print(f"No request within {request_timeout} s, connection dropped")
+                            continue
+                        request = connection.recv()
+                    except (EOFError, OSError) as e:
+                        print(f"Connection lost before the request: {type(e).__name__}: {e}")
+                        continue
+                    if not isinstance(request, dict):
+                        continue
+                    if request.get("command") == "stop":
+                        connection.send({"status": "ok", "result": None, "seconds": 0.0})
+                        break
+                    answer = run_request(jobs, request)
+                    print(f"{request.get('job') or request.get('command')}: {answer['status']} "
+                          f"in {answer['seconds']:.2f} s")
+                    try:
+                        connection.send(answer)
+                    except (OSError, EOFError):
+                        pass
+        finally:
+            if os.path.exists(session_file):
+                os.remove(session_file)
+
+
+#------------ Client
+
+def _send(request, session_file=SESSION_FILE):
+    if not os.path.exists(session_file):
+        raise ConnectionError("No layout worker running, start one with: python layout_worker.py serve")
+    with open(session_file) as f:
+        session = json.load(f)
+    with Client(("127.0.0.1", session["port"]), authkey=bytes.fromhex(session["authkey"])) as connection:
+        connection.send(request)
+        return connection.recv()
+
+
+def submit(job, *args, **kwargs):
+    """Run a job in the worker and return what the tool function returned. Raises WorkerError when it failed."""
+    answer = _send({"job": job, "args": list(args), "kwargs": kwargs})
+    if answer["status"] != "ok":
+        raise WorkerError(answer["error"], answer.get("traceback", ""))
+    return answer["result"]
+
+
+def ping():
+    return _send({"command": "ping"})["result"]
+
+
+def stop():
+    _send({"command": "stop"})
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    parser = argparse.ArgumentParser(description="Warm worker for the WTG/GRID layout tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="Load the tools and wait for jobs")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument("--timeout", type=float, default=REQUEST_TIMEOUT,
+                              help="Seconds to wait for the request of a connected client")
+    run_parser = commands.add_parser("run", help="Run one job in the worker")
+    run_parser.add_argument("job", choices=sorted(JOBS))
+    run_parser.add_argument("args", nargs="?", default="[]", help="Positional arguments as a JSON list")
+    run_parser.add_argument("kwargs", nargs="?", default="{}", help="Keyword arguments as a JSON object")
+    commands.add_parser("ping", help="Check that a worker is running")
+    commands.add_parser("stop", help="Stop the running worker")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.port, request_timeout=args.timeout)
+    elif args.command == "run":
+        started = time.perf_counter()
+        try:
+            result = submit(args.job, *json.loads(args.args), **json.loads(args.kwargs))
+        except WorkerError as e:
+            print(e.remote_traceback or e, file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(result, default=str))
+        print(f"{args.job} done in {time.perf_counter() - started:.2f} s", file=sys.stderr)
+    elif args.command == "ping":
+        print(json.dumps(ping()))
+    else:
+        stop()
@@ -0,0 +1,185 @@
+"""
+Name: Orientation cache
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Cache of cable orientation results. A run is keyed by a cheap
+fingerprint of its inputs - feature count, extent and a checksum of the
+coordinates and the used fields of the WTG and cable layers - plus the
+parameters (WTG name and X/Y fields, buffer sizes, engine, J-tube
+separation). A rerun with the same key copies the Cable_Angle_* shapefile,
+Excel file and summary from the cache instead of running the orientation
+again. The least recently used entries are removed when the cache grows
+beyond its size or entry limit.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from layout_store import X_COLUMN, Y_COLUMN, LayoutStore, is_layout_store
+
+try:
+    import arcpy
+except ImportError:
+    arcpy = None
+
+CACHE_FOLDER = os.path.join(tempfile.gettempdir(), "cable_orientation_cache")
+ENTRY_FILE = "entry.json"
+
+# Files of a shapefile; not a glob on the stem, Cable_Angle_50.xlsx has the same stem as Cable_Angle_50.shp
+SHAPEFILE_SUFFIXES = (".shp", ".shx", ".dbf", ".prj", ".cpg", ".sbn", ".sbx", ".shp.xml")
+
+# Limits of the cache folder, the least recently used entries go first
+MAX_CACHE_MB = 2048
+MAX_ENTRIES = 50
+
+
+def layer_fingerprint(layer, fields=(), explode_to_points=False):
+    """Feature count, extent and a SHA-256 of the coordinates (every vertex with explode_to_points) and fields."""
+    if is_layout_store(layer):
+        # Hashed straight from the memory maps; the row number stands in for the OID
+        store = LayoutStore(layer)
+        values = {"OID@": np.arange(len(store)), "SHAPE@X": store[X_COLUMN], "SHAPE@Y": store[Y_COLUMN]}
+        values.update((field, store[field]) for field in fields)
+        return _fingerprint(values, ["OID@", "SHAPE@X", "SHAPE@Y"] + list(fields))
+    columns = ["OID@", "SHAPE@X", "SHAPE@Y"] + list(fields)
+    text_fields = {field.name for field in arcpy.ListFields(layer) if field.type == "String"}
+    values = arcpy.da.FeatureClassToNumPyArray(layer, columns, explode_to_points=explode_to_points,
+                                               null_value={field: "" if field in text_fields else np.nan
+                                                           for field in fields})
+    return _fingerprint(values, columns)
+
+
+def _fingerprint(values, columns):
+    digest = hashlib.sha256()
+    for column in columns:
+        digest.update(np.ascontiguousarray(values[column]).tobytes())
+    xs, ys = values["SHAPE@X"], values["SHAPE@Y"]
+    extent = [float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max())] if len(xs) else []
+    return {"count": len(np.unique(values["OID@"])), "extent": extent, "checksum": digest.hexdigest()}
+
+
+def orientation_key(points_layer, wtg_name, x, y, cable_layer, radii, engine, jtube_min_separation):
+    # Everything the Cable_Angle_* outputs depend on
+    fingerprint = {
+        "wtg": layer_fingerprint(points_layer, [wtg_name, x, y]),
+        "cables": layer_fingerprint(cable_layer, explode_to_points=True),
+        "parameters": {"wtg_name": wtg_name, "x": x, "y": y, "radii": [float(radius) for radius in radii],
+                       "engine": engine.upper(), "jtube_min_separation": float(jtube_min_separation)},
+    }
+    return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _output_base(path):
+    # A shapefile is the .shp plus its sidecars (SHAPEFILE_SUFFIXES), all named after its stem
+    return os.path.splitext(path)[0] if path.lower().endswith(".shp") else path
+
+
+def _output_files(path):
+    """(file, suffix) of all files of an output; file = base of the output + suffix.
+
+    A shapefile without its .shp has no files: its sidecars alone are not an output.
+    """
+    base = _output_base(path)
+    if path.lower().endswith(".shp"):
+        if not os.path.exists(path):
+            return []
+        files = [base + suffix for suffix in SHAPEFILE_SUFFIXES]
+        return [(file, file[len(base):]) for file in files if os.path.exists(file)]
+    return [(path, "")] if os.path.exists(path) else []
+
+
+class OrientationCache:
+    """Entries in folder/<key>/: copies of the output files plus entry.json {suffixes, size, created, used}."""
+
+    def __init__(self, folder=CACHE_FOLDER, max_mb=MAX_CACHE_MB, max_entries=MAX_ENTRIES):
+        self.folder = folder
+        self.max_mb = max_mb
+        self.max_entries = max_entries
+
+    def _entry_path(self, key):
+        return os.path.join(self.folder, key)
+
+    def _read_entry(self, key):
+        try:
+            with open(os.path.join(self._entry_path(key), ENTRY_FILE), encoding="utf-8") as f:
+                return json.load(f)
+        except (ValueError, OSError):
+            return None
+
+    def _write_entry(self, key, entry):
+        # Written last and replaced atomically: a folder without entry.json is not a cache entry
+        path = os.path.join(self._entry_path(key), ENTRY_FILE)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(entry, f, indent=1)
+        os.replace(path + ".tmp", path)
+
+    def restore(self, key, outputs):
+        """Copy the cached files of key to outputs (the paths the run would have written). False on a miss."""
+        entry = self._read_entry(key)
+        if entry is None or len(entry["suffixes"]) != len(outputs):
+            return False
+        folder = self._entry_path(key)
+        cached = [[(os.path.join(folder, f"output_{i}{suffix}"), suffix) for suffix in suffixes]
+                  for i, suffixes in enumerate(entry["suffixes"])]
+        if not all(os.path.exists(path) for files in cached for path, suffix in files):
+            return False
+        for output, files in zip(outputs, cached):
+            # Nothing of an earlier output may stay next to the restored one, not even a sidecar without its .shp
+            suffixes = SHAPEFILE_SUFFIXES if output.lower().endswith(".shp") else ("",)
+            for old in [_output_base(output) + suffix for suffix in suffixes]:
+                if os.path.exists(old):
+                    os.remove(old)
+            for path, suffix in files:
+                shutil.copy2(path, _output_base(output) + suffix)
+        entry["used"] = datetime.datetime.now().isoformat(timespec="microseconds")
+        self._write_entry(key, entry)
+        return True
+
+    def store(self, key, outputs):
+        """Copy the files of outputs into the cache under key and evict the least recently used entries.
+
+        Nothing is stored when an output is missing. Returns True when the entry was stored.
+        """
+        if not all(_output_files(output) for output in outputs):
+            return False
+        folder = self._entry_path(key)
+        shutil.rmtree(folder, ignore_errors=True)
+        os.makedirs(folder)
+        suffixes = []
+        size = 0
+        for i, output in enumerate(outputs):
+            files = _output_files(output)
+            suffixes.append([suffix for path, suffix in files])
+            for path, suffix in files:
+                shutil.copy2(path, os.path.join(folder, f"output_{i}{suffix}"))
+                size += os.path.getsize(path)
+        now = datetime.datetime.now().isoformat(timespec="microseconds")
+        self._write_entry(key, {"suffixes": suffixes, "size": size, "created": now, "used": now})
+        self.evict()
+        return True
+
+    def entries(self):
+        # (key, entry) of all complete entries
+        if not os.path.isdir(self.folder):
+            return []
+        found = []
+        for key in os.listdir(self.folder):
+            entry = self._read_entry(key)
+            if entry is not None:
+                found.append((key, entry))
+        return found
+
+    def evict(self):
+        entries = sorted(self.entries(), key=lambda item: item[1]["used"])
+        total_mb = sum(entry["size"] for key, entry in entries) / 2 ** 20
+        while entries and (len(entries) > self.max_entries or total_mb > self.max_mb):
+            key, entry = entries.pop(0)
+            shutil.rmtree(self._entry_path(key), ignore_errors=True)
+            total_mb -= entry["size"] / 2 ** 20
@@ -0,0 +1,124 @@
+"""
+Name: Orientation engine (spatial index)
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: In-process alternative to the Buffer + SpatialJoin + Intersect
+chain of GRID - Cable Orientation. WTG points go into a grid index, every
+cable end is snapped to the nearest WTG within the buffer size and the
+Start/End WTG and the angle from North are computed directly from the
+vertex arrays. Nothing is written to disk in between.
+"""
+
+import numpy as np
+
+from cable_angles import angle_from_north
+from spatial_index import GridIndex
+
+
+def line_lengths(vertex_x, vertex_y, first, last):
+    """Along-line distance of every vertex from the start of its line, and the line lengths.
+
+    vertex_x/vertex_y hold the vertices of all lines back to back, first/last
+    are the index of the first and last vertex of each line.
+    """
+    vertex_x = np.asarray(vertex_x, dtype="float64")
+    vertex_y = np.asarray(vertex_y, dtype="float64")
+    segment = np.hypot(np.diff(vertex_x), np.diff(vertex_y))
+    # The step from the last vertex of one line to the first vertex of the next one does not count
+    segment[last[:-1]] = 0.0
+    cumulative = np.r_[0.0, np.cumsum(segment)]
+    return cumulative, cumulative[last] - cumulative[first]
+
+
+def points_along_lines(vertex_x, vertex_y, first, last, distance, cumulative=None):
+    """Point at the given along-line distance from the start of each line (clamped to the line)."""
+    vertex_x = np.asarray(vertex_x, dtype="float64")
+    vertex_y = np.asarray(vertex_y, dtype="float64")
+    if cumulative is None:
+        cumulative, _ = line_lengths(vertex_x, vertex_y, first, last)
+    lengths = cumulative[last] - cumulative[first]
+    target = cumulative[first] + np.clip(distance, 0.0, lengths)
+
+    # Segment that contains the target, kept inside its own line
+    segment = np.searchsorted(cumulative, target, side="right") - 1
+    segment = np.clip(segment, first, np.maximum(first, last - 1))
+    following = np.minimum(segment + 1, last)
+
+    step = cumulative[following] - cumulative[segment]
+    t = np.divide(target - cumulative[segment], step, out=np.zeros_like(step), where=step > 0)
+    x = vertex_x[segment] + t * (vertex_x[following] - vertex_x[segment])
+    y = vertex_y[segment] + t * (vertex_y[following] - vertex_y[segment])
+    return x, y
+
+
+def orient_cables(wtg_x, wtg_y, vertex_x, vertex_y, first, last, radius, index=None):
+    """Snap both ends of every cable to the nearest WTG within radius and measure the angles.
+
+    One result row is emitted for every cable end that lies at a WTG, in cable
+    order (first end before last end). The angle is measured from the cable
+    end towards the point radius along the cable, i.e. the same piece of cable
+    the buffer intersect used to cut out.
+
+    Returns a dict of arrays:
+        cable, start_wtg, end_wtg (-1 when the other end has no WTG),
+        X1, Y1, X2, Y2 (rounded, X1/Y1 at the WTG), AngleFromNorth
+    """
+    return orient_cables_sweep(wtg_x, wtg_y, vertex_x, vertex_y, first, last, [radius], index)[float(radius)]
+
+
+def orient_cables_sweep(wtg_x, wtg_y, vertex_x, vertex_y, first, last, radii, index=None):
+    """orient_cables for several radii at once. Returns {radius: result} (see orient_cables).
+
+    The index, the snap query of the cable ends and the along-line distances are shared by all
+    radii: the nearest WTG within the largest radius is also the nearest within a smaller one
+    whenever its distance does not exceed that radius.
+    """
+    vertex_x = np.asarray(vertex_x, dtype="float64")
+    vertex_y = np.asarray(vertex_y, dtype="float64")
+    first = np.asarray(first, dtype="int64")
+    last = np.asarray(last, dtype="int64")
+    radii = sorted({float(radius) for radius in radii})
+    largest = radii[-1]
+    if index is None:
+        index = GridIndex(wtg_x, wtg_y, largest)
+
+    first_wtg, first_distance = index.nearest_within(vertex_x[first], vertex_y[first], largest)
+    last_wtg, last_distance = index.nearest_within(vertex_x[last], vertex_y[last], largest)
+    cumulative, lengths = line_lengths(vertex_x, vertex_y, first, last)
+
+    results = {}
+    for radius in radii:
+        results[radius] = _orient_ends(np.where(first_distance <= radius, first_wtg, -1),
+                                       np.where(last_distance <= radius, last_wtg, -1),
+                                       vertex_x, vertex_y, first, last, radius, cumulative, lengths)
+    return results
+
+
+def _orient_ends(first_wtg, last_wtg, vertex_x, vertex_y, first, last, radius, cumulative, lengths):
+    near_first_x, near_first_y = points_along_lines(vertex_x, vertex_y, first, last, radius, cumulative)
+    near_last_x, near_last_y = points_along_lines(vertex_x, vertex_y, first, last, lengths - radius, cumulative)
+
+    cables = np.arange(len(first))
+    # Row per cable end: the first ends, then the last ends, interleaved back into cable order below
+    cable = np.r_[cables, cables]
+    start_wtg = np.r_[first_wtg, last_wtg]
+    end_wtg = np.r_[last_wtg, first_wtg]
+    x1 = np.r_[vertex_x[first], vertex_x[last]]
+    y1 = np.r_[vertex_y[first], vertex_y[last]]
+    x2 = np.r_[near_first_x, near_last_x]
+    y2 = np.r_[near_first_y, near_last_y]
+
+    keep = start_wtg >= 0
+    order = np.argsort(cable[keep], kind="stable")
+    x1, y1, x2, y2 = (values[keep][order] for values in (x1, y1, x2, y2))
+    return {
+        "cable": cable[keep][order],
+        "start_wtg": start_wtg[keep][order],
+        "end_wtg": end_wtg[keep][order],
+        "X1": np.round(x1),
+        "Y1": np.round(y1),
+        "X2": np.round(x2),
+        "Y2": np.round(y2),
+        "AngleFromNorth": angle_from_north(x1, y1, x2, y2),
+    }
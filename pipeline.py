@@ -0,0 +1,98 @@
+"""
+Name: Pipeline
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Small staged pipeline for the import tools. A tool is a list of
+named stages (parse, write, enrich, metadata, alias, export, ...) that share
+one context dict. Stages can be skipped by name or declared lazy, in which
+case they only run when another stage requires them or the caller asks for
+them. Wall time and rows processed are recorded per stage; inside a RunReport
+(instrumentation.py) every stage is also a step of the run report, with its
+I/O and memory, so a slow run shows which step dominates.
+"""
+
+import time
+
+from instrumentation import span
+
+
+class Stage:
+    """One step of a pipeline.
+
+    function(context) does the work; it may return the number of rows it
+    processed. requires names stages that have to run before this one (lazy
+    stages among them are run on demand).
+    """
+
+    def __init__(self, name, function, lazy=False, requires=()):
+        self.name = name
+        self.function = function
+        self.lazy = lazy
+        self.requires = tuple(requires)
+
+
+class StageResult:
+    __slots__ = ("name", "status", "seconds", "rows")
+
+    def __init__(self, name, status, seconds=0.0, rows=None):
+        self.name = name
+        self.status = status
+        self.seconds = seconds
+        self.rows = rows
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Pipeline:
+    def __init__(self, name, stages):
+        self.name = name
+        self.stages = list(stages)
+        self._by_name = {stage.name: stage for stage in self.stages}
+        if len(self._by_name) != len(self.stages):
+            raise ValueError(f"Stage names of pipeline {name} are not unique")
+
+    def run(self, context, skip=(), run_lazy=()):
+        """Run the stages in order on context. Returns the StageResult of every stage.
+
+        skip: names of stages not to run. run_lazy: names of lazy stages to run as well.
+        A stage may set context["stop"] = True to end the run early (e.g. nothing changed).
+        """
+        unknown = (set(skip) | set(run_lazy)) - set(self._by_name)
+        if unknown:
+            raise ValueError(f"Unknown stage(s) {sorted(unknown)} in pipeline {self.name}")
+
+        results = {}
+        for stage in self.stages:
+            if stage.name in results:
+                continue
+            if stage.name in skip or context.get("stop"):
+                results[stage.name] = StageResult(stage.name, "skipped")
+            elif not stage.lazy or stage.name in run_lazy:
+                self._run_stage(stage, context, skip, results)
+
+        # Lazy stages nobody asked for
+        ordered = []
+        for stage in self.stages:
+            ordered.append(results.get(stage.name) or StageResult(stage.name, "lazy"))
+        context["stage_results"] = ordered
+        return ordered
+
+    def _run_stage(self, stage, context, skip, results):
+        # Requirements first; a skipped requirement is not forced to run
+        for name in stage.requires:
+            if name not in results and name not in skip:
+                self._run_stage(self._by_name[name], context, skip, results)
+
+        started = time.perf_counter()
+        try:
+            # Also a step of the run report when the tool runs inside one
+            with span(stage.name) as measured:
+                rows = measured.rows = stage.function(context)
+        except Exception:
+            results[stage.name] = StageResult(stage.name, "failed", time.perf_counter() - started)
+            context["stage_results"] = list(results.values())
+            raise
+        results[stage.name] = StageResult(stage.name, "done", time.perf_counter() - started, rows)
+
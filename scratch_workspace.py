@@ -0,0 +1,140 @@
+"""
+Name: Scratch workspace
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Workspace for the intermediate outputs of a tool run (buffers,
+joins, intersections). Intermediates go to the "memory" workspace by default;
+an on-disk file geodatabase in the local temp folder is used only when the
+intermediates are not expected to fit in memory or when memory runs out
+during the run. Every run gets uniquely named scratch space, which is deleted
+again when the run ends, also when it fails.
+
+Usage:
+    with ScratchWorkspace("cable_orientation", estimated_mb) as scratch:
+        buffer_output = scratch.name("Buffer")
+        ...
+"""
+
+import os
+import shutil
+import tempfile
+import uuid
+
+try:
+    import arcpy
+except ImportError:
+    arcpy = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+MEMORY = "MEMORY"
+DISK = "DISK"
+AUTO = "AUTO"
+
+# Share of the free physical memory the intermediates may take before they go to disk
+MEMORY_SHARE = 0.5
+
+# Messages of geoprocessing tools that ran out of memory (ERROR 000426: Out Of Memory)
+OUT_OF_MEMORY = ("000426", "out of memory")
+
+
+def available_memory_mb():
+    # Free physical memory, None when psutil is not installed
+    if psutil is None:
+        return None
+    return psutil.virtual_memory().available / 2 ** 20
+
+
+def is_out_of_memory(error):
+    if isinstance(error, MemoryError):
+        return True
+    text = str(error).lower()
+    return any(marker in text for marker in OUT_OF_MEMORY)
+
+
+class ScratchWorkspace:
+    """Uniquely named scratch space for one run, in memory or in a temporary file geodatabase.
+
+    mode: AUTO (memory unless estimated_mb exceeds memory_limit_mb), MEMORY or DISK.
+    memory_limit_mb defaults to MEMORY_SHARE of the free physical memory.
+    disk_folder is where the fallback geodatabase is created (local temp folder by default,
+    so intermediates never travel over a network share).
+    """
+
+    def __init__(self, prefix="scratch", estimated_mb=0, mode=AUTO, memory_limit_mb=None, disk_folder=None):
+        self.prefix = prefix
+        self.token = uuid.uuid4().hex[:8]
+        self.disk_folder = disk_folder or tempfile.gettempdir()
+        self.path = None
+        self.gdb = None
+        self._names = []
+        self._previous_workspace = None
+
+        mode = (mode or AUTO).upper()
+        if mode == AUTO:
+            limit = memory_limit_mb
+            if limit is None:
+                available = available_memory_mb()
+                limit = available * MEMORY_SHARE if available is not None else None
+            mode = DISK if limit is not None and estimated_mb > limit else MEMORY
+        if mode not in (MEMORY, DISK):
+            raise ValueError(f"Unknown scratch workspace mode {mode}, use {AUTO}, {MEMORY} or {DISK}")
+        self.mode = mode
+
+    def __enter__(self):
+        self._previous_workspace = arcpy.env.workspace
+        self._open()
+        return self
+
+    def __exit__(self, *args):
+        try:
+            self.cleanup()
+        finally:
+            arcpy.env.workspace = self._previous_workspace
+        return False
+
+    def _open(self):
+        if self.mode == MEMORY:
+            self.path = "memory"
+        else:
+            self.gdb = arcpy.management.CreateFileGDB(self.disk_folder, f"{self.prefix}_{self.token}.gdb")[0]
+            self.path = self.gdb
+        arcpy.env.workspace = self.path
+        arcpy.AddMessage(f"Scratch workspace: {self.path}")
+
+    def name(self, base):
+        """Unique name of an intermediate in this workspace; it is deleted on cleanup."""
+        name = arcpy.ValidateTableName(f"{base}_{self.token}", self.path)
+        self._names.append(name)
+        return name
+
+    def spill_to_disk(self):
+        # Memory ran out: drop what is in memory and continue in a file geodatabase
+        if self.mode == DISK:
+            return False
+        arcpy.AddWarning("Not enough memory for the intermediate outputs, continuing in a file geodatabase")
+        self.cleanup()
+        self.mode = DISK
+        self._open()
+        return True
+
+    def cleanup(self):
+        if self.mode == MEMORY:
+            for name in self._names:
+                dataset = os.path.join(self.path, name)
+                if arcpy.Exists(dataset):
+                    arcpy.management.Delete(dataset)
+        elif self.gdb:
+            # Release the workspace before deleting it, a schema lock would keep the folder
+            arcpy.env.workspace = self._previous_workspace
+            try:
+                arcpy.management.Delete(self.gdb)
+            except Exception:
+                pass
+            shutil.rmtree(self.gdb, ignore_errors=True)
+            self.gdb = None
+        self._names = []
@@ -0,0 +1,91 @@
+"""
+Name: Spatial index
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Uniform grid index over points (e.g. WTG positions) held in NumPy
+arrays. Answers "nearest point within a radius" for many query points at once,
+without writing anything to a geodatabase.
+"""
+
+import numpy as np
+
+
+class GridIndex:
+    """Points binned into square cells of cell_size map units.
+
+    Queries look at the 3 x 3 cells around each query point, so any radius up
+    to cell_size is answered exactly.
+    """
+
+    def __init__(self, xs, ys, cell_size):
+        if not cell_size > 0:
+            raise ValueError(f"cell_size must be positive, got {cell_size}")
+        self.xs = np.asarray(xs, dtype="float64")
+        self.ys = np.asarray(ys, dtype="float64")
+        self.cell_size = float(cell_size)
+
+        if len(self.xs):
+            self.x0 = self.xs.min()
+            self.y0 = self.ys.min()
+            self.nx = int((self.xs.max() - self.x0) // self.cell_size) + 1
+            self.ny = int((self.ys.max() - self.y0) // self.cell_size) + 1
+        else:
+            self.x0 = self.y0 = 0.0
+            self.nx = self.ny = 0
+
+        # Points sorted by cell key, so each cell is a contiguous slice of self.order
+        keys = self._cell_keys(self.xs, self.ys)
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+        # Counted over the occupied cells only, a far outlier must not allocate the whole empty grid
+        self.max_per_cell = int(np.unique(self.sorted_keys, return_counts=True)[1].max()) if len(keys) else 0
+
+    def __len__(self):
+        return len(self.xs)
+
+    def _cells(self, xs, ys):
+        ix = np.floor((xs - self.x0) / self.cell_size).astype("int64")
+        iy = np.floor((ys - self.y0) / self.cell_size).astype("int64")
+        return ix, iy
+
+    def _cell_keys(self, xs, ys):
+        ix, iy = self._cells(xs, ys)
+        return ix * self.ny + iy
+
+    def nearest_within(self, qx, qy, radius):
+        """Index of the nearest point within radius for every query point.
+
+        Returns (indices, distances); queries without a point in range get
+        index -1 and distance inf.
+        """
+        if radius > self.cell_size:
+            raise ValueError(f"radius {radius} is larger than the cell size {self.cell_size} of the index")
+        qx = np.asarray(qx, dtype="float64")
+        qy = np.asarray(qy, dtype="float64")
+        best = np.full(len(qx), -1, dtype="int64")
+        best_distance = np.full(len(qx), np.inf)
+        if not len(self.xs) or not len(qx):
+            return best, best_distance
+
+        ix, iy = self._cells(qx, qy)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                cx = ix + dx
+                cy = iy + dy
+                inside = (cx >= 0) & (cx < self.nx) & (cy >= 0) & (cy < self.ny)
+                keys = np.where(inside, cx * self.ny + cy, -1)
+                lo = np.searchsorted(self.sorted_keys, keys, side="left")
+                hi = np.searchsorted(self.sorted_keys, keys, side="right")
+                hi = np.where(inside, hi, lo)
+                # Walk the k-th point of every neighbour cell at once
+                for k in range(self.max_per_cell):
+                    has = lo + k < hi
+                    if not has.any():
+                        break
+                    candidate = self.order[np.where(has, lo + k, 0)]
+                    distance = np.hypot(self.xs[candidate] - qx, self.ys[candidate] - qy)
+                    better = has & (distance <= radius) & (distance < best_distance)
+                    best = np.where(better, candidate, best)
+                    best_distance = np.where(better, distance, best_distance)
+        return best, best_distance
@@ -0,0 +1,29 @@
+"""
+Name: Test setup
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Puts the tools and the arcpy stand-in (benchmarks/arcpy_standin.py)
+on the path and registers the stand-in as arcpy before any test module
+imports a tool, so the tests never touch a real geodatabase. Its in-memory
+tables are cleared after every test.
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import arcpy_standin
+
+arcpy_standin.install()
+
+
+@pytest.fixture(autouse=True)
+def clean_standin():
+    yield
+    arcpy_standin.reset()
@@ -0,0 +1,39 @@
+"""
+Name: Tests of the angle statistics
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Hand-computed angle statistics per WTG: sorting, the separation
+wrapping around past north, WTGs with one cable and cables without an angle.
+
+Usage:
+    python -m pytest -q tests
+"""
+
+import numpy as np
+
+from cable_angles import angle_statistics
+
+nan = np.nan
+
+
+#------------ angle_statistics
+
+def test_angle_statistics():
+    # WTG 1: 350, 370 (= 10) and 100 degrees; WTG 2 one cable; WTG 3 one cable plus one without an angle
+    stats = angle_statistics([1, 1, 1, 2, 3, 3], [350, 370, 100, 45, nan, 200])
+    assert stats["key"].tolist() == [1, 1, 1, 2, 3]
+    np.testing.assert_allclose(stats["angle"], [10, 100, 350, 45, 200])
+    # 10 -> 100 -> 350 -> wraps around to 10
+    np.testing.assert_allclose(stats["separation"], [90, 250, 20, nan, nan])
+    assert stats["wtg"].tolist() == [1, 2, 3]
+    assert stats["cable_count"].tolist() == [3, 1, 1]
+    np.testing.assert_allclose(stats["min_separation"], [20, nan, nan])
+    np.testing.assert_allclose(stats["max_gap"], [250, 360, 360])
+
+
+def test_angle_statistics_two_cables_across_north():
+    stats = angle_statistics([4, 4], [355, 5])
+    np.testing.assert_allclose(stats["separation"], [350, 10])
+    np.testing.assert_allclose(stats["min_separation"], [10])
+    np.testing.assert_allclose(stats["max_gap"], [350])
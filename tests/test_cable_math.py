@@ -0,0 +1,68 @@
+"""
+Name: Tests of the cable math
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Hand-computed cases for the NumPy kernels of cable_angles.py
+that need no arcpy: cable orientation and vertex grouping.
+
+Usage:
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cable_angles import first_last_vertices, orientation_kernel
+
+nan = np.nan
+
+
+#------------ orientation_kernel
+
+def test_orientation_first_point_at_wtg():
+    # First point within the tolerance of the WTG: measured first -> last, straight north; X/Y rounded
+    x1, y1, x2, y2, angle = orientation_kernel([100.4], [100], [100.4], [200], [102], [98])
+    assert (x1[0], y1[0], x2[0], y2[0]) == (100, 100, 100, 200)
+    assert angle[0] == pytest.approx(0.0)
+
+
+def test_orientation_swapped_when_last_point_at_wtg():
+    # Last point at the WTG: measured from (100, 100) back to (0, 0), south-west
+    x1, y1, x2, y2, angle = orientation_kernel([0], [0], [100], [100], [100], [101])
+    assert (x1[0], y1[0], x2[0], y2[0]) == (100, 100, 0, 0)
+    assert angle[0] == pytest.approx(225.0)
+
+
+def test_orientation_tolerance_is_inclusive():
+    # First point exactly 5 east of the WTG: at the WTG with tolerance 5, not with 4.9
+    *_, angle = orientation_kernel([5], [0], [5], [10], [0], [0], tolerance=5.0)
+    assert angle[0] == pytest.approx(0.0)
+    *_, angle = orientation_kernel([5], [0], [5], [10], [0], [0], tolerance=4.9)
+    assert angle[0] == pytest.approx(180.0)
+
+
+def test_orientation_nan_wtg_falls_back_to_swapped():
+    # No WTG coordinates: measured last -> first, from (-10, 0) east to (0, 0)
+    x1, y1, x2, y2, angle = orientation_kernel([0, 0], [0, 0], [-10, 0], [0, 10], [nan, 0], [nan, 0])
+    assert (x1[0], y1[0], x2[0], y2[0]) == (-10, 0, 0, 0)
+    np.testing.assert_allclose(angle, [90.0, 0.0])
+
+
+#------------ first_last_vertices
+
+def test_first_last_vertices():
+    oids, starts, ends = first_last_vertices([3, 3, 3, 7, 9, 9])
+    assert oids.tolist() == [3, 7, 9]
+    assert starts.tolist() == [0, 3, 4]
+    assert ends.tolist() == [2, 3, 5]
+
+
+def test_first_last_vertices_empty():
+    oids, starts, ends = first_last_vertices([])
+    assert len(oids) == len(starts) == len(ends) == 0
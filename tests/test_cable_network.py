@@ -0,0 +1,87 @@
+"""
+Name: Tests of the cable network
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: The cable graph of a small branched layout: upstream and
+downstream nodes, strings, the path to the OSS and the segment angles, and
+the round trip through the node feature class and edge table on the arcpy
+stand-in.
+
+Usage:
+    python -m pytest -q tests
+"""
+
+import os
+
+import arcpy
+import numpy as np
+import pytest
+
+from cable_network import network_from_table, read_network, write_network
+from topology_validation import cable_columns
+
+# OSS 0 at the origin. String 1: 0 -> 1 -> 2 east, branching at 1 north to 3 -> 4; string 2: 0 -> 5 south
+# Start point, Easting, Northing, Depth, End point, Easting, Northing
+BRANCHED = [(0, 0, 0, 30, 1, 100, 0),
+            (1, 100, 0, 30, 2, 200, 0),
+            (1, 100, 0, 30, 3, 100, 100),
+            (3, 100, 100, 30, 4, 100, 200),
+            (0, 0, 0, 30, 5, 0, -100)]
+
+
+@pytest.fixture
+def network():
+    return network_from_table(BRANCHED)
+
+
+def test_upstream_and_downstream(network):
+    assert network.node_ids.tolist() == [0, 1, 2, 3, 4, 5]
+    assert [network.upstream(node) for node in (0, 1, 2, 3, 4, 5)] == [None, 0, 1, 1, 3, 0]
+    assert network.downstream(0) == [1, 5]
+    assert network.downstream(1) == [2, 3]
+    assert network.downstream(4) == []
+
+
+def test_strings_and_path_to_oss(network):
+    assert [network.string_of(node) for node in (0, 1, 2, 3, 4, 5)] == [0, 1, 1, 1, 1, 2]
+    assert network.path_to_oss(4) == [4, 3, 1, 0]
+    assert network.path_to_oss(5) == [5, 0]
+    assert network.path_to_oss(0) == [0]
+    with pytest.raises(KeyError):
+        network.upstream(9)
+
+
+def test_path_to_oss_stops_on_a_loop():
+    network = network_from_table([(1, 0, 0, 30, 2, 100, 0), (2, 100, 0, 30, 1, 0, 0)])
+    assert network.path_to_oss(1) == [1, 2]
+
+
+def test_edge_lengths_and_angles(network):
+    np.testing.assert_allclose(network.edge_length, [100, 100, 100, 100, 100])
+    start_angle, end_angle = network.edge_angles()
+    # East, east, north, north, south; the other way round at the To node
+    np.testing.assert_allclose(start_angle, [90, 90, 0, 0, 180])
+    np.testing.assert_allclose(end_angle, [270, 270, 180, 180, 0])
+
+
+def test_network_from_cable_columns(network):
+    columns = network_from_table(cable_columns(BRANCHED))
+    for name in ("node_ids", "node_x", "node_y", "edge_from", "edge_to", "edge_string"):
+        np.testing.assert_array_equal(getattr(columns, name), getattr(network, name))
+    assert len(network_from_table([])) == 0
+
+
+def test_write_and_read_network(tmp_path, network):
+    output_gdb = str(tmp_path)
+    nodes_path, edges_path = write_network(network, output_gdb, "IAC", 25832)
+    assert (nodes_path, edges_path) == (os.path.join(output_gdb, "IAC_Nodes"), os.path.join(output_gdb, "IAC_Edges"))
+    with arcpy.da.SearchCursor(nodes_path, ["NodeID", "Kind", "Upstream", "Downstream"]) as cursor:
+        assert list(cursor) == [(0, "OSS", -1, 2), (1, "WTG", 0, 2), (2, "WTG", 1, 0), (3, "WTG", 1, 1),
+                                (4, "WTG", 3, 0), (5, "WTG", 0, 0)]
+
+    restored = read_network(output_gdb, "IAC")
+    for name in ("node_ids", "node_x", "node_y", "edge_from", "edge_to", "edge_string"):
+        np.testing.assert_array_equal(getattr(restored, name), getattr(network, name))
+    assert restored.path_to_oss(4) == [4, 3, 1, 0]
+    assert restored.downstream(1) == [2, 3]
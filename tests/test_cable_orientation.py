@@ -0,0 +1,75 @@
+"""
+Name: Tests of the cable orientation tool
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Engine selection of cable_orientation and the buffer sizes of
+the geoprocessing engine, with the geoprocessing chain itself replaced (the
+arcpy stand-in has no Buffer, SpatialJoin or Intersect).
+
+Usage:
+    python -m pytest -q tests
+"""
+
+import os
+
+import arcpy
+import numpy as np
+import pytest
+
+import GRID_Cable_Orientation
+from feature_writers import get_feature_writer, write_points
+
+
+class Scratch:
+    def __init__(self, folder):
+        self.folder = folder
+
+    def name(self, base):
+        return os.path.join(self.folder, base)
+
+
+@pytest.fixture
+def chain(monkeypatch):
+    # One angle row per run of the chain, and the Merge calls
+    merged = []
+
+    def orientation_with_geoprocessing(points_layer, wtg_name, x, y, cable_layer, buffer_size, output, scratch):
+        writer = get_feature_writer("arcpy", os.path.dirname(output), os.path.basename(output), "POINT",
+                                    arcpy.SpatialReference(25832), [("AngleFromNorth", "DOUBLE")])
+        writer.create()
+        write_points(writer, np.array([0.0]), np.array([0.0]), [np.array([float(buffer_size)])])
+
+    monkeypatch.setattr(GRID_Cable_Orientation, "orientation_with_geoprocessing", orientation_with_geoprocessing)
+    monkeypatch.setattr(arcpy.management, "Merge", lambda pieces, output: merged.append((list(pieces), output)),
+                        raising=False)
+    return merged
+
+
+def radii_of(feature_class):
+    with arcpy.da.SearchCursor(feature_class, ["Radius"]) as cursor:
+        return [row[0] for row in cursor]
+
+
+def test_one_buffer_size_is_not_merged(tmp_path, chain):
+    output = str(tmp_path / "Angle")
+    GRID_Cable_Orientation.orientation_sweep_with_geoprocessing("WTG", "ID", "X", "Y", "IAC", "50", output,
+                                                                Scratch(str(tmp_path)))
+    assert chain == []
+    assert radii_of(output) == [50.0]
+
+
+def test_several_buffer_sizes_are_merged(tmp_path, chain):
+    output = str(tmp_path / "Angle")
+    GRID_Cable_Orientation.orientation_sweep_with_geoprocessing("WTG", "ID", "X", "Y", "IAC", "50;10", output,
+                                                                Scratch(str(tmp_path)))
+    pieces = [str(tmp_path / "Angle_10"), str(tmp_path / "Angle_50")]
+    assert chain == [(pieces, output)]
+    assert [radii_of(piece) for piece in pieces] == [[10.0], [50.0]]
+
+
+def test_unknown_engine(tmp_path):
+    with pytest.raises(ValueError) as raised:
+        GRID_Cable_Orientation.cable_orientation("WTG", "ID", "X", "Y", "IAC", "50", str(tmp_path), "RTREE",
+                                                 use_cache=False, run_report=False)
+    assert "SPATIAL_INDEX" in str(raised.value)
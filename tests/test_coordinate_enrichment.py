@@ -0,0 +1,100 @@
+"""
+Name: Tests of the coordinate enrichment
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: enrich_coordinates on the arcpy stand-in: a known UTM 32N point
+in ETRS89, a feature class in an ESRI-only coordinate system, the rows of an
+oids filter and the fallback without pyproj; the coordinate systems of crs_of
+and authority_of.
+
+Usage:
+    python -m pytest -q tests
+"""
+
+import arcpy
+import numpy as np
+import pytest
+
+import coordinate_enrichment
+from coordinate_enrichment import (ETRS89, WGS84, authority_of, crs_of, enrich_coordinates, target_for_epsg,
+                                   transform)
+from feature_writers import get_feature_writer, write_points
+
+pytest.importorskip("pyproj")
+
+FIELDS = [("ID", "TEXT")]
+
+
+def points_feature_class(folder, crs, xs, ys):
+    writer = get_feature_writer("arcpy", folder, "WTG", "POINT", arcpy.SpatialReference(crs), FIELDS)
+    writer.create()
+    write_points(writer, np.array(xs, dtype="float64"), np.array(ys, dtype="float64"),
+                 [np.array(["A%02d" % (i + 1) for i in range(len(xs))])])
+    return writer.path
+
+
+def values_of(fc_path, fields):
+    with arcpy.da.SearchCursor(fc_path, ["OID@"] + fields) as cursor:
+        return {row[0]: row[1:] for row in cursor}
+
+
+def test_utm_point_in_etrs89(tmp_path):
+    fc_path = points_feature_class(str(tmp_path), 25832, [500000.0, 500100.0], [6000000.0, 6000050.0])
+    assert enrich_coordinates(fc_path) == 2
+    values = values_of(fc_path, ["X", "Y", "X_ETRS", "Y_ETRS"])
+    # On the central meridian of zone 32 the easting of 500 km is 9 degrees east
+    assert values[1][:2] == (500000.0, 6000000.0)
+    np.testing.assert_allclose(values[1][2:], (9.0, 54.148104105), atol=1e-9)
+    np.testing.assert_allclose(values[2][2:], (9.001531020, 54.148553480), atol=1e-9)
+    aliases = {field.name: field.aliasName for field in arcpy.ListFields(fc_path)}
+    assert (aliases["X_ETRS"], aliases["Y_ETRS"]) == (ETRS89.x_alias, ETRS89.y_alias)
+
+
+def test_esri_coordinate_system(tmp_path):
+    # World Mollweide has no EPSG code, pyproj knows it as ESRI:54009
+    fc_path = points_feature_class(str(tmp_path), 54009, [0.0, 1000000.0], [0.0, 5000000.0])
+    assert crs_of(arcpy.Describe(fc_path).spatialReference) == "ESRI:54009"
+    enrich_coordinates(fc_path, targets=[WGS84])
+    values = values_of(fc_path, ["X_WGS84", "Y_WGS84"])
+    np.testing.assert_allclose(values[1], (0.0, 0.0), atol=1e-9)
+    np.testing.assert_allclose(values[2], (11.988149505, 41.894152151), atol=1e-9)
+
+
+def test_only_the_rows_of_the_oids(tmp_path):
+    fc_path = points_feature_class(str(tmp_path), 25832, [500000.0, 500100.0], [6000000.0, 6000050.0])
+    enrich_coordinates(fc_path)
+    with arcpy.da.UpdateCursor(fc_path, ["SHAPE@XY"]) as cursor:
+        for row in cursor:
+            cursor.updateRow([(row[0][0] + 1000.0, row[0][1])])
+
+    assert enrich_coordinates(fc_path, oids=[2]) == 1
+    values = values_of(fc_path, ["X", "X_ETRS"])
+    assert values[1][0] == 500000.0
+    assert values[2][0] == 501100.0
+    assert values[2][1] > values[1][1] + 0.01
+
+    # A new field is filled in every row, whatever the oids
+    assert enrich_coordinates(fc_path, targets=[ETRS89, target_for_epsg(32631)], oids=[2]) == 2
+    assert values_of(fc_path, ["X"])[1] == (501000.0,)
+
+
+def test_without_pyproj_arcpy_projects(tmp_path, monkeypatch):
+    # The stand-in only "projects" to the coordinate system of the feature class itself
+    monkeypatch.setattr(coordinate_enrichment, "pyproj", None)
+    fc_path = points_feature_class(str(tmp_path), 4258, [9.0, 9.5], [54.0, 54.5])
+    assert enrich_coordinates(fc_path) == 2
+    assert values_of(fc_path, ["X_ETRS", "Y_ETRS"]) == {1: (9.0, 54.0), 2: (9.5, 54.5)}
+    assert crs_of(arcpy.SpatialReference(4258)) == 4258
+
+
+def test_coordinate_systems():
+    assert authority_of(25832) == ("EPSG", 25832)
+    assert authority_of(54009) == ("ESRI", 54009)
+    assert authority_of(0) is None
+    assert authority_of(99999999) is None
+    assert crs_of(arcpy.SpatialReference(25832)) == 25832
+    assert target_for_epsg(4326) is WGS84
+    assert target_for_epsg(32631).x_field == "X_32631"
+    xs, ys = transform([1.0], [2.0], 4258, 4258)
+    assert (xs.tolist(), ys.tolist()) == ([1.0], [2.0])
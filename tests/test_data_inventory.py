@@ -0,0 +1,113 @@
+"""
+Name: Tests of the data inventory
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Parsing the DATA INVENTORY sheet (first of duplicated names,
+empty cells, dates as ISO text), the index cache in memory and on disk and
+its invalidation when the size or modification time of the workbook change.
+
+Usage:
+    python -m pytest -q tests
+"""
+
+import datetime
+import os
+
+import pandas as pd
+import pytest
+
+import data_inventory
+from data_inventory import apply_metadata, load_inventory, parse_inventory
+
+ROWS = [
+    {"Full Name": "WTG_Layout", "Summary": "Turbines", "Tags": "WTG", "Description": "Rev A",
+     "Credits": "Cable Engineers", "Date Created": datetime.datetime(2024, 2, 20, 9, 30)},
+    {"Full Name": "IAC_Layout", "Summary": "Cables", "Tags": None, "Description": "Rev A",
+     "Credits": None, "Date Created": datetime.datetime(2024, 2, 27)},
+    # Second row of a name: ignored
+    {"Full Name": "WTG_Layout", "Summary": "Old turbines", "Tags": "WTG", "Description": "Rev 0",
+     "Credits": "", "Date Created": datetime.datetime(2023, 1, 1)},
+]
+
+
+def inventory(path, rows=ROWS):
+    pd.DataFrame(rows).to_excel(path, sheet_name="Inventory", index=False)
+    return str(path)
+
+
+@pytest.fixture
+def workbook(tmp_path, monkeypatch):
+    # No index of an earlier test in memory
+    monkeypatch.setattr(data_inventory, "_loaded", {})
+    return inventory(tmp_path / "DATA_INVENTORY.xlsx")
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    # Names of the workbooks parse_inventory really read
+    calls = []
+    parse = data_inventory.parse_inventory
+
+    def counting(path, sheet=0):
+        calls.append(os.path.basename(path))
+        return parse(path, sheet)
+
+    monkeypatch.setattr(data_inventory, "parse_inventory", counting)
+    return calls
+
+
+def test_parse_inventory(workbook):
+    index = parse_inventory(workbook, "Inventory")
+    assert sorted(index) == ["IAC_Layout", "WTG_Layout"]
+    assert index["WTG_Layout"] == {"Summary": "Turbines", "Tags": "WTG", "Description": "Rev A",
+                                   "Credits": "Cable Engineers", "Date Created": "2024-02-20 09:30:00"}
+    assert (index["IAC_Layout"]["Tags"], index["IAC_Layout"]["Credits"]) == ("", "")
+    assert index["IAC_Layout"]["Date Created"] == "2024-02-27 00:00:00"
+
+
+def test_cache_hit_in_memory_and_on_disk(tmp_path, workbook, parses):
+    cache_folder = str(tmp_path / "cache")
+    index = load_inventory(workbook, "Inventory", cache_folder)
+    assert load_inventory(workbook, "Inventory", cache_folder) is index
+    assert len(os.listdir(cache_folder)) == 1
+
+    # A new process: the index comes from the JSON cache, the workbook is not parsed again
+    data_inventory._loaded.clear()
+    assert load_inventory(workbook, "Inventory", cache_folder) == index
+    assert parses == ["DATA_INVENTORY.xlsx"]
+
+
+def test_cache_invalidated_by_size_and_modification_time(tmp_path, workbook, parses):
+    cache_folder = str(tmp_path / "cache")
+    load_inventory(workbook, "Inventory", cache_folder)
+
+    # Another summary: the workbook changes size
+    inventory(workbook, [dict(ROWS[0], Summary="Turbines, revision B")] + ROWS[1:])
+    assert load_inventory(workbook, "Inventory", cache_folder)["WTG_Layout"]["Summary"] == "Turbines, revision B"
+
+    # Same size, touched: parsed again as well
+    stat = os.stat(workbook)
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    data_inventory._loaded.clear()
+    load_inventory(workbook, "Inventory", cache_folder)
+    assert parses == ["DATA_INVENTORY.xlsx"] * 3
+
+
+def test_broken_cache_file_is_parsed_again(tmp_path, workbook, parses):
+    cache_folder = str(tmp_path / "cache")
+    load_inventory(workbook, "Inventory", cache_folder)
+    cache_file = os.path.join(cache_folder, os.listdir(cache_folder)[0])
+    with open(cache_file, "w", encoding="utf-8") as f:
+        f.write('{"signature": ')
+    data_inventory._loaded.clear()
+    assert sorted(load_inventory(workbook, "Inventory", cache_folder)) == ["IAC_Layout", "WTG_Layout"]
+    assert len(parses) == 2
+
+
+def test_apply_metadata_reports_missing_names(tmp_path, workbook):
+    # Loaded with a cache folder of the test, apply_metadata takes the index from memory
+    load_inventory(workbook, "Inventory", str(tmp_path / "cache"))
+    missing = apply_metadata([("Layouts.gdb/WTG_Layout", "WTG_Layout"), ("Layouts.gdb/OSS", "OSS")], workbook,
+                             "Inventory")
+    assert missing == ["OSS"]
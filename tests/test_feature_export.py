@@ -0,0 +1,121 @@
+"""
+Name: Tests of the feature export
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: export_feature_class on the arcpy stand-in: every format
+written from one feature class, a failed format leaving nothing behind,
+existing outputs skipped or overwritten, the coordinate system of the
+GeoParquet metadata and the zip archive of package_outputs.
+
+Usage:
+    python -m pytest -q tests
+"""
+
+import json
+import os
+import sqlite3
+import zipfile
+
+import arcpy
+import numpy as np
+import pytest
+
+from feature_export import export_feature_class, output_paths, package_outputs
+from feature_writers import get_feature_writer, write_points
+from layout_store import LayoutStore
+
+FIELDS = [("ID", "TEXT"), ("Depth", "DOUBLE")]
+
+
+def wtg_feature_class(folder, epsg=25832):
+    writer = get_feature_writer("arcpy", folder, "WTG", "POINT", arcpy.SpatialReference(epsg), FIELDS)
+    writer.create()
+    write_points(writer, np.array([500000.0, 500100.0]), np.array([6000000.0, 6000050.0]),
+                 [np.array(["A01", "A02"]), np.array([20.5, 21.0])])
+    return writer.path
+
+
+def statuses(results):
+    return {result.format: result.status for result in results}
+
+
+def test_every_format_written(tmp_path):
+    directory = str(tmp_path / "exports")
+    results = export_feature_class(wtg_feature_class(str(tmp_path)), "WTG", directory, ("SHP", "GPKG", "LAYOUT"))
+    assert statuses(results) == {"SHP": "done", "GPKG": "done", "LAYOUT": "done"}
+
+    paths = output_paths("WTG", directory)
+    assert os.path.isdir(os.path.dirname(paths["SHP"]))
+    with sqlite3.connect(paths["GPKG"]) as connection:
+        assert connection.execute('SELECT ID, Depth FROM "WTG" ORDER BY fid').fetchall() == [("A01", 20.5),
+                                                                                            ("A02", 21.0)]
+    store = LayoutStore(paths["LAYOUT"])
+    assert store["ID"].tolist() == ["A01", "A02"]
+    np.testing.assert_array_equal(store["SHAPE_X"], [500000.0, 500100.0])
+    store.close()
+
+
+def test_failed_format_leaves_no_output(tmp_path):
+    # The stand-in has no ExportCAD: the DWG fails, the other formats are written all the same
+    directory = str(tmp_path / "exports")
+    results = export_feature_class(wtg_feature_class(str(tmp_path)), "WTG", directory, ("DWG", "GPKG"))
+    assert statuses(results) == {"DWG": "failed", "GPKG": "done"}
+    assert not os.path.exists(os.path.dirname(output_paths("WTG", directory)["DWG"]))
+
+
+def test_existing_outputs_skipped_or_overwritten(tmp_path):
+    fc_path = wtg_feature_class(str(tmp_path))
+    directory = str(tmp_path / "exports")
+    paths = output_paths("WTG", directory)
+    export_feature_class(fc_path, "WTG", directory, ("SHP", "GPKG"))
+    with open(paths["GPKG"], "wb") as f:
+        f.write(b"stale")
+
+    results = export_feature_class(fc_path, "WTG", directory, ("SHP", "GPKG"))
+    assert statuses(results) == {"SHP": "skipped", "GPKG": "skipped"}
+    with open(paths["GPKG"], "rb") as f:
+        assert f.read() == b"stale"
+
+    results = export_feature_class(fc_path, "WTG", directory, ("SHP", "GPKG"), overwrite=True)
+    assert statuses(results) == {"SHP": "done", "GPKG": "done"}
+    with sqlite3.connect(paths["GPKG"]) as connection:
+        assert connection.execute('SELECT COUNT(*) FROM "WTG"').fetchone() == (2,)
+
+
+@pytest.mark.parametrize("epsg, authority", [(25832, "EPSG"), (54009, "ESRI")])
+def test_geoparquet_crs(tmp_path, epsg, authority):
+    pq = pytest.importorskip("pyarrow.parquet")
+    pytest.importorskip("pyproj")
+    directory = str(tmp_path / "exports")
+    results = export_feature_class(wtg_feature_class(str(tmp_path), epsg), "WTG", directory, ("PARQUET",))
+    assert statuses(results) == {"PARQUET": "done"}
+    table = pq.read_table(output_paths("WTG", directory)["PARQUET"])
+    assert table.column("ID").to_pylist() == ["A01", "A02"]
+    crs = json.loads(table.schema.metadata[b"geo"])["columns"]["geometry"]["crs"]
+    assert crs["id"] == {"authority": authority, "code": epsg}
+
+
+def test_package_outputs(tmp_path):
+    directory = str(tmp_path / "exports")
+    archive = str(tmp_path / "WTG.zip")
+    results = export_feature_class(wtg_feature_class(str(tmp_path)), "WTG", directory, ("DWG", "GPKG", "LAYOUT"),
+                                   archive=archive)
+    assert statuses(results) == {"DWG": "failed", "GPKG": "done", "LAYOUT": "done"}
+    with zipfile.ZipFile(archive) as zf:
+        names = zf.namelist()
+    # The layout store goes in as its folder, the failed DWG not at all
+    assert "WTG.gpkg" in names
+    assert "WTG.layout/ID.npy" in names
+    assert not [name for name in names if "DWG" in name]
+
+    # Shapefile sidecars are packed with their folder
+    shp_folder = os.path.dirname(output_paths("WTG", directory)["SHP"])
+    os.makedirs(shp_folder)
+    for suffix in (".shp", ".dbf"):
+        with open(os.path.join(shp_folder, "WTG" + suffix), "wb") as f:
+            f.write(b"x")
+    shp = [result._replace(format="SHP", path=os.path.join(shp_folder, "WTG.shp")) for result in results[:1]]
+    package_outputs(shp, archive)
+    with zipfile.ZipFile(archive) as zf:
+        assert zf.namelist() == ["WTG/WTG.dbf", "WTG/WTG.shp"]
@@ -0,0 +1,114 @@
+"""
+Name: Tests of the feature writers
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Round trips through both backends of feature_writers.py: the
+GeoPackage writer read back with sqlite3, the arcpy writer (SHAPE@XY for
+points, polylines) on the arcpy stand-in.
+
+Usage:
+    python -m pytest -q tests
+"""
+
+import sqlite3
+
+import arcpy
+import numpy as np
+import pytest
+
+from feature_writers import _srs_id, get_feature_writer, gpkg_blob_coordinates, iter_batches, write_points
+
+FIELDS = [("ID", "TEXT"), ("Depth", "DOUBLE")]
+
+
+#------------ GeoPackage backend
+
+def test_gpkg_points_round_trip(tmp_path):
+    path = str(tmp_path / "layout.gpkg")
+    writer = get_feature_writer("gpkg", path, "WTG", "POINT", "25832", FIELDS)
+    writer.create()
+    written = write_points(writer, np.array([500000.5, 500100.0, 500200.25]),
+                           np.array([6000000.0, 6000050.5, 6000100.0]),
+                           [np.array(["A01", "A02", "A03"]), np.array([20.5, 21.0, 22.5])], batch_size=2)
+    assert written == 3
+
+    with sqlite3.connect(path) as connection:
+        rows = connection.execute('SELECT geom, ID, Depth FROM "WTG" ORDER BY fid').fetchall()
+        contents = connection.execute("SELECT srs_id FROM gpkg_contents WHERE table_name = 'WTG'").fetchone()
+        geometry = connection.execute("SELECT geometry_type_name, srs_id FROM gpkg_geometry_columns").fetchone()
+    assert [gpkg_blob_coordinates(blob) for blob, _, _ in rows] == [(500000.5, 6000000.0), (500100.0, 6000050.5),
+                                                                    (500200.25, 6000100.0)]
+    assert [(ID, depth) for _, ID, depth in rows] == [("A01", 20.5), ("A02", 21.0), ("A03", 22.5)]
+    assert contents == (25832,)
+    assert geometry == ("POINT", 25832)
+    # srs_id of the geometry header: bytes 4-7 after magic, version and flags
+    assert int.from_bytes(rows[0][0][4:8], "little") == 25832
+
+
+def test_gpkg_linestring_round_trip_and_recreate(tmp_path):
+    path = str(tmp_path / "grid.gpkg")
+    cables = [([(0.0, 0.0), (10.0, 0.0), (10.0, 5.0)], "1", 30.0), ([(10.0, 5.0), (20.0, 5.0)], "2", 31.0)]
+    for _ in range(2):
+        # create() replaces the table, a second import does not add to the first
+        writer = get_feature_writer("gpkg", path, "IAC", "POLYLINE", None, FIELDS)
+        writer.create()
+        assert writer.write_rows(iter_batches(cables, 1)) == 2
+
+    with sqlite3.connect(path) as connection:
+        blobs = [row[0] for row in connection.execute('SELECT geom FROM "IAC" ORDER BY fid')]
+        geometry = connection.execute("SELECT geometry_type_name, srs_id FROM gpkg_geometry_columns").fetchone()
+    assert [gpkg_blob_coordinates(blob) for blob in blobs] == [cable[0] for cable in cables]
+    assert geometry == ("LINESTRING", -1)
+
+
+def test_srs_id():
+    # EPSG codes as int, text or spatial reference; anything else is the undefined cartesian SRS
+    assert _srs_id(25832) == 25832
+    assert _srs_id("4258") == 4258
+    assert _srs_id(arcpy.SpatialReference(32631)) == 32631
+    assert _srs_id(None) == -1
+    assert _srs_id("") == -1
+    assert _srs_id('PROJCS["Local grid"]') == -1
+
+
+def test_gpkg_srs_registered_under_its_authority(tmp_path):
+    pytest.importorskip("pyproj")
+    path = str(tmp_path / "layout.gpkg")
+    # EPSG, an ESRI-only WKID (World Mollweide) and a code of no known authority
+    for name, code in (("UTM", 25832), ("Mollweide", 54009), ("Unknown", 999999)):
+        writer = get_feature_writer("gpkg", path, name, "POINT", code, FIELDS)
+        writer.create()
+        write_points(writer, np.array([1.0]), np.array([2.0]), [np.array(["A01"]), np.array([20.0])])
+
+    with sqlite3.connect(path) as connection:
+        srs = connection.execute("SELECT srs_name, srs_id, organization, organization_coordsys_id "
+                                 "FROM gpkg_spatial_ref_sys WHERE srs_id > 0 ORDER BY srs_id").fetchall()
+        contents = connection.execute("SELECT table_name, srs_id FROM gpkg_contents ORDER BY table_name").fetchall()
+        blob = connection.execute('SELECT geom FROM "Unknown"').fetchone()[0]
+    assert srs == [("EPSG:25832", 25832, "EPSG", 25832), ("ESRI:54009", 54009, "ESRI", 54009)]
+    assert contents == [("Mollweide", 54009), ("UTM", 25832), ("Unknown", -1)]
+    assert int.from_bytes(blob[4:8], "little", signed=True) == -1
+
+
+#------------ arcpy backend
+
+def test_arcpy_points_written_with_shape_xy(tmp_path):
+    writer = get_feature_writer("arcpy", str(tmp_path), "WTG", "POINT", arcpy.SpatialReference(25832), FIELDS)
+    writer.create()
+    assert write_points(writer, np.array([1.5, 2.5]), np.array([10.0, 20.0]),
+                        [np.array(["A01", "A02"]), np.array([20.0, 21.0])]) == 2
+
+    with arcpy.da.SearchCursor(writer.path, ["SHAPE@XY", "ID", "Depth"]) as cursor:
+        assert list(cursor) == [((1.5, 10.0), "A01", 20.0), ((2.5, 20.0), "A02", 21.0)]
+    assert arcpy.Describe(writer.path).spatialReference.factoryCode == 25832
+
+
+def test_arcpy_polylines(tmp_path):
+    writer = get_feature_writer("arcpy", str(tmp_path), "IAC", "POLYLINE", arcpy.SpatialReference(25832), FIELDS)
+    writer.create()
+    assert writer.write_rows([[([(0.0, 0.0), (3.0, 4.0)], "1", 30.0)]]) == 1
+
+    with arcpy.da.SearchCursor(writer.path, ["SHAPE@", "ID"]) as cursor:
+        shape, ID = next(iter(cursor))
+    assert (shape.firstPoint.X, shape.lastPoint.Y, shape.length, ID) == (0.0, 4.0, 5.0, "1")
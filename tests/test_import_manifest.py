@@ -0,0 +1,88 @@
+"""
+Name: Tests of the import manifest
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: The import key (workbook bytes, import and run options) and the
+manifest file next to a geodatabase: record, lookup, forget and the
+handling of a broken file.
+
+Usage:
+    python -m pytest -q tests
+"""
+
+import json
+import os
+
+from import_manifest import ImportManifest, import_key, manifest_path, run_options
+
+OPTIONS = {"tool": "WTG", "sheet": "WTG", "columns": ["ID", "X", "Y"]}
+
+
+def workbook(tmp_path, content=b"workbook bytes", name="Layout.xlsx"):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+#------------ import_key
+
+def test_import_key_follows_bytes_and_options(tmp_path):
+    path = workbook(tmp_path)
+    key = import_key(path, OPTIONS)
+    assert import_key(path, dict(reversed(list(OPTIONS.items())))) == key
+    assert import_key(path, {**OPTIONS, "sheet": "Other"}) != key
+    workbook(tmp_path, b"workbook bytes, revision 2")
+    assert import_key(path, OPTIONS) != key
+
+
+def test_import_key_of_a_folder_covers_the_file_names(tmp_path):
+    folder = tmp_path / "Layout.layout"
+    folder.mkdir()
+    (folder / "ID.npy").write_bytes(b"ids")
+    (folder / "X.npy").write_bytes(b"xs")
+    key = import_key(str(folder), OPTIONS)
+    (folder / "X.npy").rename(folder / "Y.npy")
+    assert import_key(str(folder), OPTIONS) != key
+
+
+def test_skipped_stages_and_exports_change_the_key(tmp_path):
+    # A run without its exports is not the import a full run would do
+    path = workbook(tmp_path)
+    full = import_key(path, {**OPTIONS, **run_options((), ("SHP", "DWG"))})
+    assert import_key(path, {**OPTIONS, **run_options(("export",), ("SHP", "DWG"))}) != full
+    assert import_key(path, {**OPTIONS, **run_options((), ("SHP", "DWG", "GPKG"))}) != full
+    assert import_key(path, {**OPTIONS, **run_options((), ("SHP", "DWG"), overwrite_exports=True)}) != full
+    assert import_key(path, {**OPTIONS, **run_options((), ("SHP", "DWG"), export_archive="out.zip")}) != full
+    # The cache and manifest stages themselves and the order of the formats do not count
+    assert import_key(path, {**OPTIONS, **run_options(("cache", "manifest"), ("dwg", "shp"))}) == full
+
+
+#------------ ImportManifest
+
+def test_record_is_current_and_forget(tmp_path):
+    gdb = str(tmp_path / "Layouts.gdb")
+    path = workbook(tmp_path)
+    key = import_key(path, OPTIONS)
+    ImportManifest(gdb).record("WTG_Layout", key, "WTG", path, 120)
+
+    manifest = ImportManifest(gdb)
+    assert manifest.is_current("wtg_layout", key)
+    assert not manifest.is_current("WTG_Layout", "other key")
+    assert not manifest.is_current("IAC_Layout", key)
+    assert manifest.get("WTG_Layout")["rows"] == 120
+    assert not os.path.exists(manifest_path(gdb) + ".tmp")
+
+    manifest.forget("WTG_Layout")
+    assert ImportManifest(gdb).get("WTG_Layout") is None
+
+
+def test_broken_manifest_means_rebuild(tmp_path):
+    gdb = str(tmp_path / "Layouts.gdb")
+    with open(manifest_path(gdb), "w", encoding="utf-8") as f:
+        f.write('{"entries": {"wtg_layout": ')
+    manifest = ImportManifest(gdb)
+    assert manifest.entries == {}
+    manifest.record("WTG_Layout", "key", "WTG", workbook(tmp_path), 1)
+    with open(manifest_path(gdb), encoding="utf-8") as f:
+        assert list(json.load(f)["entries"]) == ["wtg_layout"]
@@ -0,0 +1,54 @@
+"""
+Name: Tests of the instrumentation
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Spans of a run and their traced memory peaks with the
+TRACEMALLOC profile, nested spans included, and the report path of a tool.
+
+Usage:
+    python -m pytest -q tests
+"""
+
+import json
+import os
+
+from instrumentation import TRACEMALLOC, RunReport, report_path, span
+
+MB = 2 ** 20
+
+
+def test_nested_spans_keep_the_peak_of_the_enclosing_span(tmp_path):
+    path = str(tmp_path / "run_report.json")
+    with RunReport("Test", report_path=path, profile=TRACEMALLOC):
+        with span("outer") as outer:
+            block = bytearray(40 * MB)
+            del block
+            # The inner spans start after the 40 MB were freed again
+            with span("inner") as inner:
+                small = bytearray(4 * MB)
+                del small
+            with span("second inner") as second:
+                pass
+    assert outer.peak_traced_mb >= 40
+    assert 4 <= inner.peak_traced_mb < 40
+    assert second.peak_traced_mb < 4
+    assert [item.depth for item in (outer, inner, second)] == [0, 1, 1]
+
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    assert [item["name"] for item in report["spans"]] == ["outer", "inner", "second inner"]
+    assert report["spans"][0]["peak_traced_mb"] == outer.peak_traced_mb
+
+
+def test_span_outside_a_run_measures_nothing():
+    with span("alone") as alone:
+        pass
+    assert (alone.depth, alone.peak_rss_mb, alone.peak_traced_mb, alone.status) == (0, None, None, "done")
+
+
+def test_report_path(tmp_path):
+    assert report_path(True, str(tmp_path), "IAC") == os.path.join(str(tmp_path), "IAC_run_report.json")
+    assert report_path("other.json", str(tmp_path), "IAC") == "other.json"
+    assert report_path(False, str(tmp_path), "IAC") is None
+    assert report_path(True, str(tmp_path / "missing"), "IAC") is None
@@ -0,0 +1,136 @@
+"""
+Name: Tests of the layout diff
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Matching a new layout revision against the rows of a feature
+class (diff_rows, duplicate keys) and writing the changes with
+apply_changes on the arcpy stand-in, with the change report. A WTG import
+in update mode DIFF, whose coordinates are redone for the written rows only.
+
+Usage:
+    python -m pytest -q tests
+"""
+
+import os
+
+import arcpy
+import numpy as np
+import openpyxl
+import pytest
+
+from feature_writers import get_feature_writer, write_points
+from layout_diff import (DELETE, DIFF, INSERT, UPDATE, DuplicateKeyError, changed_keys, diff_feature_class, diff_rows,
+                         keyed, read_keyed_rows, written_oids)
+from WTG_Import_layout import import_wtg_layout
+
+FIELDS = [("ID", "TEXT"), ("Point_X", "DOUBLE"), ("Point_Y", "DOUBLE")]
+
+
+def wtg_feature_class(folder, ids, xs, ys):
+    writer = get_feature_writer("arcpy", folder, "WTG_Layout", "POINT", arcpy.SpatialReference(25832), FIELDS)
+    writer.create()
+    write_points(writer, np.array(xs, dtype="float64"), np.array(ys, dtype="float64"),
+                 [np.array(ids), np.array(xs, dtype="float64"), np.array(ys, dtype="float64")])
+    return writer.path
+
+
+def rows_of(fc_path):
+    with arcpy.da.SearchCursor(fc_path, ["ID", "SHAPE@XY", "Point_X", "Point_Y"]) as cursor:
+        return sorted(cursor)
+
+
+#------------ diff_rows and keys
+
+def test_diff_rows():
+    existing = {"A": (1, (0.0, 0.0)), "B": (2, (10.0, 0.0)), "C": (3, (20.0, 0.0))}
+    # A moved by less than the tolerance, B moved, C deleted, D new
+    incoming = {"A": (0.0 + 1e-9, 0.0), "B": (10.0, 5.0), "D": (30.0, 0.0)}
+    changes = sorted(diff_rows(existing, incoming))
+    assert [(change.kind, change.key, change.oid) for change in changes] == [
+        (DELETE, "C", 3), (INSERT, "D", None), (UPDATE, "B", 2)]
+    assert [change.new for change in changes] == [None, (30.0, 0.0), (10.0, 5.0)]
+
+
+def test_keyed_rejects_duplicates():
+    assert keyed([("A", 1), ("B", 2)]) == {"A": 1, "B": 2}
+    with pytest.raises(DuplicateKeyError) as raised:
+        keyed([("A", 1), ("B", 2), ("A", 3)])
+    assert (raised.value.side, raised.value.keys) == ("new revision", ["A"])
+
+
+def test_duplicate_ids_in_the_feature_class(tmp_path):
+    fc_path = wtg_feature_class(str(tmp_path), ["A", "B", "A"], [0.0, 10.0, 20.0], [0.0, 0.0, 0.0])
+    with pytest.raises(DuplicateKeyError) as raised:
+        read_keyed_rows(fc_path, ["ID"], ["Point_X", "Point_Y"])
+    assert raised.value.side == "feature class"
+    # Nothing is written when the keys cannot be matched
+    with pytest.raises(DuplicateKeyError):
+        diff_feature_class(fc_path, ["ID"], ["Point_X", "Point_Y"], {"A": (0.0, 0.0)}, lambda key, values: values,
+                           str(tmp_path), "WTG_Layout", shape_token="SHAPE@XY")
+    assert len(rows_of(fc_path)) == 3
+
+
+#------------ apply_changes through diff_feature_class
+
+def test_diff_feature_class(tmp_path):
+    fc_path = wtg_feature_class(str(tmp_path), ["A", "B", "C"], [0.0, 10.0, 20.0], [0.0, 0.0, 0.0])
+    incoming = {"A": (0.0, 0.0), "B": (10.0, 5.0), "D": (30.0, 0.0)}
+    changes = diff_feature_class(fc_path, ["ID"], ["Point_X", "Point_Y"], incoming, lambda key, values: values,
+                                 str(tmp_path), "WTG_Layout", shape_token="SHAPE@XY")
+    assert sorted(change.kind for change in changes) == [DELETE, INSERT, UPDATE]
+    # B kept its row, D got the next one
+    assert written_oids(changes) == {2, 4}
+    assert rows_of(fc_path) == [("A", (0.0, 0.0), 0.0, 0.0), ("B", (10.0, 5.0), 10.0, 5.0),
+                                ("D", (30.0, 0.0), 30.0, 0.0)]
+    assert changed_keys(str(tmp_path / "WTG_Layout_changes.csv")) == ["B", "C", "D"]
+
+    # The same revision again changes nothing
+    assert diff_feature_class(fc_path, ["ID"], ["Point_X", "Point_Y"], incoming, lambda key, values: values,
+                              str(tmp_path), "WTG_Layout", shape_token="SHAPE@XY") == []
+
+
+#------------ WTG import in update mode DIFF
+
+def wtg_workbook(folder, rows):
+    os.makedirs(folder, exist_ok=True)
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "WTG"
+    ws.append(["WTG", "Easting", "Northing"])
+    for row in rows:
+        ws.append(list(row))
+    path = os.path.join(folder, "Layout.xlsx")
+    wb.save(path)
+    return path
+
+
+def import_wtg(path, output_gdb, update_mode):
+    return import_wtg_layout(path, "WTG", "WTG", "Easting", "Northing", 25832, output_gdb, "WTG_Layout", "",
+                             skip=("metadata", "export"), use_cache=False, update_mode=update_mode, run_report=False)
+
+
+def test_wtg_diff_enriches_the_written_rows(tmp_path):
+    pytest.importorskip("pyproj")
+    output_gdb = str(tmp_path)
+    fc_path = os.path.join(output_gdb, "WTG_Layout")
+    first = [("A", 500000.0, 6000000.0), ("B", 501000.0, 6000000.0), ("C", 502000.0, 6000000.0)]
+    assert import_wtg(wtg_workbook(str(tmp_path / "rev1"), first), output_gdb, None) == 3
+
+    # A marker in the unchanged row shows whether the enrich stage touched it again
+    with arcpy.da.UpdateCursor(fc_path, ["ID", "X_ETRS"]) as cursor:
+        for row in cursor:
+            if row[0] == "A":
+                cursor.updateRow(["A", -1.0])
+
+    # B moved north, C deleted, D new
+    second = [("A", 500000.0, 6000000.0), ("B", 501000.0, 6001000.0), ("D", 503000.0, 6000000.0)]
+    assert import_wtg(wtg_workbook(str(tmp_path / "rev2"), second), output_gdb, DIFF) == 3
+    with arcpy.da.SearchCursor(fc_path, ["ID", "Y", "X_ETRS", "Y_ETRS"]) as cursor:
+        rows = {row[0]: row[1:] for row in cursor}
+    assert sorted(rows) == ["A", "B", "D"]
+    assert rows["A"][1] == -1.0
+    assert rows["B"][0] == 6001000.0
+    assert rows["B"][2] == pytest.approx(54.15, abs=0.01)
+    assert rows["D"][1] == pytest.approx(9.05, abs=0.01)
+    assert changed_keys(str(tmp_path / "WTG_Layout_changes.csv")) == ["B", "C", "D"]
@@ -0,0 +1,75 @@
+"""
+Name: Tests of the layout store
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Writing a store through <path>.tmp, the memory map round trip,
+a failed write and reading points in another coordinate system.
+
+Usage:
+    python -m pytest -q tests
+"""
+
+import os
+
+import arcpy
+import numpy as np
+import pytest
+
+from layout_store import LayoutStore, is_layout_store, read_points, write_layout_store
+
+DTYPES = {"ID": "<U8", "SHAPE_X": "f8", "SHAPE_Y": "f8"}
+
+
+def test_create_writes_into_tmp_and_moves(tmp_path):
+    path = str(tmp_path / "Candidates.layout")
+    with LayoutStore.create(path, 3, DTYPES, 25832) as store:
+        # Nothing at path while the store is written
+        assert not os.path.exists(path)
+        assert os.path.isdir(path + ".tmp")
+        store["ID"][:] = ["A01", "A02", "A03"]
+        store["SHAPE_X"][:] = [500000.0, 500100.0, 500200.0]
+        store["SHAPE_Y"][:] = 6000000.0
+    assert is_layout_store(path)
+    assert not os.path.exists(path + ".tmp")
+
+    store = LayoutStore(path)
+    assert (len(store), store.spatial_reference, store.names) == (3, 25832, ["ID", "SHAPE_X", "SHAPE_Y"])
+    assert isinstance(store["SHAPE_X"], np.memmap)
+    assert store["ID"].tolist() == ["A01", "A02", "A03"]
+    np.testing.assert_array_equal(store["SHAPE_X"], [500000.0, 500100.0, 500200.0])
+    np.testing.assert_array_equal(store["SHAPE_Y"], [6000000.0] * 3)
+    store.close()
+
+
+def test_failed_write_keeps_the_earlier_store(tmp_path):
+    path = write_layout_store(str(tmp_path / "Layout.layout"), {"SHAPE_X": [1.0], "SHAPE_Y": [2.0]})
+    with pytest.raises(RuntimeError):
+        with LayoutStore.create(path, 2, DTYPES) as store:
+            store["SHAPE_X"][:] = [5.0, 6.0]
+            raise RuntimeError("interrupted")
+    assert not os.path.exists(path + ".tmp")
+    store = LayoutStore(path)
+    assert store["SHAPE_X"].tolist() == [1.0]
+    store.close()
+
+
+def test_columns_need_a_fixed_dtype(tmp_path):
+    with pytest.raises(ValueError):
+        LayoutStore.create(str(tmp_path / "Layout.layout"), 1, {"ID": object})
+    with pytest.raises(KeyError):
+        LayoutStore(write_layout_store(str(tmp_path / "Layout.layout"), {"SHAPE_X": [1.0]}))["Missing"]
+
+
+def test_read_points_in_another_coordinate_system(tmp_path):
+    pytest.importorskip("pyproj")
+    path = write_layout_store(str(tmp_path / "Layout.layout"),
+                              {"SHAPE_X": [500000.0], "SHAPE_Y": [6000000.0], "ID": ["A01"]}, 25832)
+    native = read_points(path, ["ID"])
+    assert isinstance(native["SHAPE@X"], np.memmap)
+    assert native["ID"].tolist() == ["A01"]
+
+    # UTM zone 32N: easting 500000 is the central meridian, 9 degrees east
+    projected = read_points(path, ["ID"], arcpy.SpatialReference(4258))
+    assert projected["SHAPE@X"][0] == pytest.approx(9.0)
+    assert projected["SHAPE@Y"][0] == pytest.approx(54.14, abs=0.01)
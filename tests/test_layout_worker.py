@@ -0,0 +1,92 @@
+"""
+Name: Tests of the layout worker
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Requests and answers between a client and a worker serving on
+a free local port in a thread, with small jobs in place of the tools: ping,
+a job, a failing and an unknown job, a client with a wrong key, an idle
+client that is dropped, and stop.
+
+Usage:
+    python -m pytest -q tests
+"""
+
+import json
+import os
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+
+import pytest
+
+import layout_worker
+from layout_worker import _send
+
+
+def add(a, b, scale=1):
+    return (a + b) * scale
+
+
+def fail():
+    raise ValueError("no layout")
+
+
+@pytest.fixture
+def worker(tmp_path, monkeypatch):
+    # The session file of the running worker; port 0 takes a free one
+    session_file = str(tmp_path / "layout_worker.json")
+    monkeypatch.setattr(layout_worker, "load_jobs", lambda: {"add": add, "fail": fail})
+    thread = threading.Thread(target=layout_worker.serve, args=(0, session_file, 0.2), daemon=True)
+    thread.start()
+    for _ in range(100):
+        if os.path.exists(session_file):
+            break
+        time.sleep(0.05)
+    yield session_file
+    if thread.is_alive():
+        _send({"command": "stop"}, session_file)
+    thread.join(5)
+    assert not thread.is_alive()
+    assert not os.path.exists(session_file)
+
+
+def test_requests_and_answers(worker):
+    assert _send({"command": "ping"}, worker)["result"] == {"pid": os.getpid(), "jobs": ["add", "fail"]}
+
+    answer = _send({"job": "add", "args": [1, 2], "kwargs": {"scale": 10}}, worker)
+    assert (answer["status"], answer["result"]) == ("ok", 30)
+    assert answer["seconds"] >= 0
+
+    answer = _send({"job": "fail"}, worker)
+    assert (answer["status"], answer["error"]) == ("failed", "ValueError: no layout")
+    assert "raise ValueError" in answer["traceback"]
+
+    answer = _send({"job": "orientation"}, worker)
+    assert answer["status"] == "failed"
+    assert answer["error"].startswith("Unknown job orientation")
+
+
+def test_idle_and_refused_clients_do_not_block_the_worker(worker):
+    with open(worker) as f:
+        session = json.load(f)
+    with pytest.raises(AuthenticationError):
+        Client(("127.0.0.1", session["port"]), authkey=b"wrong key")
+
+    idle = Client(("127.0.0.1", session["port"]), authkey=bytes.fromhex(session["authkey"]))
+    started = time.perf_counter()
+    # Answered once the worker gave up waiting for the idle client
+    assert _send({"job": "add", "args": [1, 2]}, worker)["result"] == 3
+    assert time.perf_counter() - started < 5
+    with pytest.raises(EOFError):
+        idle.recv()
+    idle.close()
+
+
+def test_stop(worker):
+    assert _send({"command": "stop"}, worker)["status"] == "ok"
+    with pytest.raises(ConnectionError):
+        for _ in range(100):
+            _send({"command": "ping"}, worker)
+            time.sleep(0.05)
@@ -0,0 +1,79 @@
+"""
+Name: Tests of the orientation cache
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Store and restore of cable orientation outputs (a shapefile with
+its sidecars next to an Excel file of the same stem) and the eviction of
+the least recently used entries by count and size.
+
+Usage:
+    python -m pytest -q tests
+"""
+
+import os
+
+from orientation_cache import OrientationCache
+
+
+def outputs(folder, content=b"run 1"):
+    # Cable_Angle_50 as shapefile (.shp, .shx, .dbf) and Excel file, like one orientation run
+    os.makedirs(folder, exist_ok=True)
+    for suffix in (".shp", ".shx", ".dbf", ".xlsx"):
+        with open(os.path.join(folder, "Cable_Angle_50" + suffix), "wb") as f:
+            f.write(content + suffix.encode())
+    return [os.path.join(folder, "Cable_Angle_50.shp"), os.path.join(folder, "Cable_Angle_50.xlsx")]
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_store_and_restore(tmp_path):
+    cache = OrientationCache(str(tmp_path / "cache"))
+    assert cache.store("key", outputs(str(tmp_path / "run")))
+
+    target = str(tmp_path / "rerun")
+    paths = outputs(target, b"stale")
+    # A sidecar the cached shapefile does not have must not stay next to the restored one
+    with open(os.path.join(target, "Cable_Angle_50.prj"), "wb") as f:
+        f.write(b"stale")
+    assert cache.restore("key", paths)
+    assert read(os.path.join(target, "Cable_Angle_50.dbf")) == b"run 1.dbf"
+    assert read(os.path.join(target, "Cable_Angle_50.xlsx")) == b"run 1.xlsx"
+    assert not os.path.exists(os.path.join(target, "Cable_Angle_50.prj"))
+
+
+def test_miss_and_incomplete_outputs(tmp_path):
+    cache = OrientationCache(str(tmp_path / "cache"))
+    paths = outputs(str(tmp_path / "run"))
+    assert not cache.restore("key", paths)
+    os.remove(paths[1])
+    assert not cache.store("key", paths)
+    assert cache.entries() == []
+
+
+def test_least_recently_used_evicted_by_count(tmp_path):
+    cache = OrientationCache(str(tmp_path / "cache"), max_entries=2)
+    paths = outputs(str(tmp_path / "run"))
+    cache.store("a", paths)
+    cache.store("b", paths)
+    # a is used again, so b is the least recently used when c comes in
+    assert cache.restore("a", paths)
+    cache.store("c", paths)
+    assert sorted(key for key, entry in cache.entries()) == ["a", "c"]
+    assert not os.path.exists(os.path.join(cache.folder, "b"))
+
+
+def test_least_recently_used_evicted_by_size(tmp_path):
+    folder = str(tmp_path / "run")
+    os.makedirs(folder)
+    path = os.path.join(folder, "summary.xlsx")
+    with open(path, "wb") as f:
+        f.write(b"x" * 2 ** 19)
+    # Half a megabyte per entry, one megabyte allowed: two entries fit
+    cache = OrientationCache(str(tmp_path / "cache"), max_mb=1.0)
+    for key in ("a", "b", "c"):
+        cache.store(key, [path])
+    assert sorted(key for key, entry in cache.entries()) == ["b", "c"]
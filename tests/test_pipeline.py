@@ -0,0 +1,107 @@
+"""
+Name: Tests of the pipeline
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Stage order, skipped and lazy stages, requirements run on
+demand, the early stop of a stage and the results left behind by a failing
+stage.
+
+Usage:
+    python -m pytest -q tests
+"""
+
+import pytest
+
+from pipeline import Pipeline, Stage
+
+
+def recording(name, rows=None, stop=False, error=None):
+    # A stage that notes its name in context["ran"]
+    def function(context):
+        context["ran"].append(name)
+        if error is not None:
+            raise error
+        if stop:
+            context["stop"] = True
+        return rows
+
+    return Stage(name, function)
+
+
+def statuses(results):
+    return [(result.name, result.status) for result in results]
+
+
+def test_stages_run_in_order():
+    pipeline = Pipeline("Test", [recording("parse", rows=3), recording("write", rows=3), recording("enrich")])
+    context = {"ran": []}
+    results = pipeline.run(context)
+    assert context["ran"] == ["parse", "write", "enrich"]
+    assert statuses(results) == [("parse", "done"), ("write", "done"), ("enrich", "done")]
+    assert [result.rows for result in results] == [3, 3, None]
+    assert all(result.seconds >= 0 for result in results)
+    assert context["stage_results"] == results
+    assert results[0].as_dict() == {"name": "parse", "status": "done", "seconds": results[0].seconds, "rows": 3}
+
+
+def test_skip_and_lazy_stages():
+    export = recording("export")
+    export.lazy = True
+    stages = [recording("parse"), recording("enrich"), recording("metadata"), export]
+
+    context = {"ran": []}
+    results = Pipeline("Test", stages).run(context, skip=("enrich",))
+    assert context["ran"] == ["parse", "metadata"]
+    assert statuses(results) == [("parse", "done"), ("enrich", "skipped"), ("metadata", "done"), ("export", "lazy")]
+
+    context = {"ran": []}
+    Pipeline("Test", stages).run(context, run_lazy=("export",))
+    assert context["ran"] == ["parse", "enrich", "metadata", "export"]
+
+
+def test_requirements_run_first():
+    alias = recording("alias")
+    alias.lazy = True
+    metadata = recording("metadata")
+    metadata.requires = ("alias",)
+    pipeline = Pipeline("Test", [recording("parse"), metadata, alias])
+
+    context = {"ran": []}
+    results = pipeline.run(context)
+    # The lazy requirement runs on demand, once
+    assert context["ran"] == ["parse", "alias", "metadata"]
+    assert statuses(results) == [("parse", "done"), ("metadata", "done"), ("alias", "done")]
+
+    # A skipped requirement is not forced to run
+    context = {"ran": []}
+    results = pipeline.run(context, skip=("alias",))
+    assert context["ran"] == ["parse", "metadata"]
+    assert statuses(results)[2] == ("alias", "skipped")
+
+
+def test_stop_ends_the_run():
+    pipeline = Pipeline("Test", [recording("diff", stop=True), recording("write"), recording("enrich")])
+    context = {"ran": []}
+    results = pipeline.run(context)
+    assert context["ran"] == ["diff"]
+    assert statuses(results) == [("diff", "done"), ("write", "skipped"), ("enrich", "skipped")]
+
+
+def test_failing_stage():
+    pipeline = Pipeline("Test", [recording("parse"), recording("write", error=RuntimeError("locked")),
+                                 recording("enrich")])
+    context = {"ran": []}
+    with pytest.raises(RuntimeError, match="locked"):
+        pipeline.run(context)
+    assert context["ran"] == ["parse", "write"]
+    # The results up to the failed stage stay in the context for the error report
+    assert statuses(context["stage_results"]) == [("parse", "done"), ("write", "failed")]
+
+
+def test_unknown_and_duplicate_stage_names():
+    pipeline = Pipeline("Test", [recording("parse")])
+    with pytest.raises(ValueError, match="export"):
+        pipeline.run({"ran": []}, skip=("export",))
+    with pytest.raises(ValueError, match="not unique"):
+        Pipeline("Test", [recording("parse"), recording("parse")])
@@ -0,0 +1,39 @@
+"""
+Name: Tests of the spatial index
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Hand-computed nearest-point queries on the grid index of
+spatial_index.py, at and beyond the search radius.
+
+Usage:
+    python -m pytest -q tests
+"""
+
+import numpy as np
+import pytest
+
+from spatial_index import GridIndex
+
+
+
+#------------ GridIndex.nearest_within
+
+def test_nearest_within():
+    index = GridIndex([0, 10, 0], [0, 0, 10], 5)
+    # Near the first point, near the second, between all three, left of the grid at exactly the radius
+    best, distance = index.nearest_within([1, 9, 5, -3], [1, 0, 5, 0], 3)
+    assert best.tolist() == [0, 1, -1, 0]
+    np.testing.assert_allclose(distance, [np.sqrt(2), 1, np.inf, 3])
+
+
+def test_nearest_within_picks_the_nearest_of_several():
+    index = GridIndex([0, 2, 4], [0, 0, 0], 5)
+    best, distance = index.nearest_within([2.6], [0], 5)
+    assert best.tolist() == [1]
+    assert distance[0] == pytest.approx(0.6)
+
+
+def test_nearest_within_radius_larger_than_cell():
+    with pytest.raises(ValueError):
+        GridIndex([0], [0], 5).nearest_within([0], [0], 6)
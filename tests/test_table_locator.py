@@ -0,0 +1,185 @@
+"""
+Name: Tests of the IAC table locator
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: The one streaming pass over a workbook that finds the "Start
+point" tables (WorkbookScan, StreamedTable, iter_tables_in_excel): tables
+side by side and below each other, over several sheets, the end of a table
+and the order in which the tables have to be read. Merging the tables and
+importing them in the MERGED and SEPARATE table modes on the arcpy stand-in.
+
+Usage:
+    python -m pytest -q tests
+"""
+
+import os
+
+import arcpy
+import openpyxl
+import pytest
+
+from GRID_import_layout import (MERGED, SEPARATE, find_all_tables_in_excel, find_table_in_excel, import_grid_layout,
+                                iter_tables_in_excel, merge_tables)
+
+HEADERS = ["Start point", "Easting", "Northing"]
+IAC_HEADERS = ["Start point", "Easting [m]", "Northing [m]", "Depth to LAT [m]",
+               "End point", "Easting [m]", "Northing [m]", "Depth to LAT [m]"]
+
+
+def workbook(tmp_path, sheets, name="IAC.xlsx"):
+    # sheets: {sheet name: rows}, the rows written from A1 on
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for sheet, rows in sheets.items():
+        ws = wb.create_sheet(sheet)
+        for row in rows:
+            ws.append(list(row))
+    path = str(tmp_path / name)
+    wb.save(path)
+    return path
+
+
+def read_all(path):
+    # Every table read before the next one is asked for
+    return [(sheet, headers, list(rows)) for sheet, headers, rows in iter_tables_in_excel(path, "Start point")]
+
+
+@pytest.fixture
+def layout(tmp_path):
+    # Sheet A: two tables next to each other, the right one ending first, and a third table below;
+    # sheet B: one table that does not start in column A
+    return workbook(tmp_path, {
+        "A": [["IAC schedule"],
+              HEADERS + [None, "Start point", "Easting"],
+              [1, 10, 20, None, 7, 70],
+              [2, 11, 21, None, 8, 80],
+              [3, 12, 22, None, None, "no start point, the right table ends here"],
+              [4, 13, 23, None, 99, 990],
+              [],
+              HEADERS,
+              [5, 14, 24]],
+        "B": [[None] + HEADERS,
+              [None, 6, 15, 25]],
+    })
+
+
+#------------ iter_tables_in_excel
+
+def test_tables_side_by_side_below_and_on_several_sheets(layout):
+    assert read_all(layout) == [
+        ("A", HEADERS, [(1, 10, 20), (2, 11, 21), (3, 12, 22), (4, 13, 23)]),
+        ("A", ["Start point", "Easting"], [(7, 70), (8, 80)]),
+        ("A", HEADERS, [(5, 14, 24)]),
+        ("B", HEADERS, [(6, 15, 25)]),
+    ]
+
+
+def test_table_ends_at_the_first_empty_start_cell(tmp_path):
+    # Values further down the start column, after the empty cell, are not rows of the table
+    path = workbook(tmp_path, {"IAC": [HEADERS, [0, 1, 2], [1, 3], [None, 5, 6], [2, 7, 8]]})
+    # Short rows are filled up to the width of the header row
+    assert read_all(path) == [("IAC", HEADERS, [(0, 1, 2), (1, 3, None)])]
+
+
+def test_header_row_ends_at_the_first_empty_cell(tmp_path):
+    path = workbook(tmp_path, {"IAC": [HEADERS + [None, "Comment"], [0, 1, 2, None, "x"]]})
+    assert read_all(path) == [("IAC", HEADERS, [(0, 1, 2)])]
+
+
+def test_tables_are_read_once_and_in_order(layout):
+    tables = iter_tables_in_excel(layout, "Start point")
+    first = next(tables)
+    second = next(tables)
+    # Asking for the second table dropped the first one
+    with pytest.raises(RuntimeError):
+        list(first[2])
+    assert list(second[2]) == [(7, 70), (8, 80)]
+    # A table is iterated once
+    with pytest.raises(RuntimeError):
+        list(second[2])
+    tables.close()
+
+
+#------------ find_table_in_excel and find_all_tables_in_excel
+
+def test_find_table_in_excel(layout):
+    sheet, headers, rows = find_table_in_excel(layout, "Start point")
+    assert (sheet, headers, list(rows)) == ("A", HEADERS, [(1, 10, 20), (2, 11, 21), (3, 12, 22), (4, 13, 23)])
+
+
+def test_no_table_found(tmp_path):
+    path = workbook(tmp_path, {"IAC": [["Cable", "Length"], ["C1", 100]]})
+    with pytest.raises(ValueError):
+        find_table_in_excel(path, "Start point")
+    with pytest.raises(ValueError):
+        list(find_all_tables_in_excel(path, "Start point"))
+    assert read_all(path) == []
+
+
+def test_find_all_tables_in_excel(layout):
+    tables = [(sheet, list(rows)) for sheet, headers, rows in find_all_tables_in_excel(layout, "Start point")]
+    assert [sheet for sheet, rows in tables] == ["A", "A", "A", "B"]
+    assert [len(rows) for sheet, rows in tables] == [4, 2, 1, 1]
+
+
+#------------ merge_tables
+
+def test_merge_tables_groups(layout):
+    tables = (table for table in iter_tables_in_excel(layout, "Start point") if table[1] == HEADERS)
+    sheet, headers, rows, groups = merge_tables(tables)
+    assert (sheet, headers) == ("A", HEADERS + ["Source sheet", "Source table"])
+    # The groups are known once the rows are read
+    assert groups == []
+    assert list(rows) == [(1, 10, 20, "A", 1), (2, 11, 21, "A", 1), (3, 12, 22, "A", 1), (4, 13, 23, "A", 1),
+                          (5, 14, 24, "A", 2), (6, 15, 25, "B", 3)]
+    assert groups == [(0, 4), (4, 5), (5, 6)]
+
+
+def test_merge_tables_with_other_columns(layout):
+    sheet, headers, rows, groups = merge_tables(iter_tables_in_excel(layout, "Start point"))
+    with pytest.raises(ValueError):
+        list(rows)
+
+
+#------------ import_grid_layout with several tables
+
+def cable(start, end, x1, x2):
+    return [start, x1, 6000000.0, -30.0, end, x2, 6000000.0, -31.0]
+
+
+@pytest.fixture
+def two_sheets(tmp_path):
+    # Sheet North: one string of two cables; sheet South: two strings of one cable, next to each other
+    return workbook(tmp_path, {
+        "North": [IAC_HEADERS, cable(0, 1, 400000.0, 401000.0), cable(1, 2, 401000.0, 402000.0)],
+        "South": [IAC_HEADERS + [None] + IAC_HEADERS,
+                  cable(0, 3, 400000.0, 403000.0) + [None] + cable(0, 4, 400000.0, 404000.0)],
+    })
+
+
+def import_iac(path, output_gdb, table_mode):
+    return import_grid_layout(path, 25832, output_gdb, "IAC", "", 0, skip=("metadata", "export"), use_cache=False,
+                              table_mode=table_mode, run_report=False)
+
+
+def test_import_merged(tmp_path, two_sheets):
+    output_gdb = str(tmp_path)
+    assert import_iac(two_sheets, output_gdb, MERGED) == 4
+    with arcpy.da.SearchCursor(os.path.join(output_gdb, "IAC"),
+                               ["Source_sheet", "Source_table", "String_number", "End_point"]) as cursor:
+        # The string numbers run on over the merged tables
+        assert list(cursor) == [("North", 1, 1, 1), ("North", 1, 1, 2), ("South", 2, 2, 3), ("South", 3, 3, 4)]
+    assert not arcpy.Exists(os.path.join(output_gdb, "IAC_North"))
+
+
+def test_import_separate(tmp_path, two_sheets):
+    output_gdb = str(tmp_path)
+    assert import_iac(two_sheets, output_gdb, SEPARATE) == 4
+    assert not arcpy.Exists(os.path.join(output_gdb, "IAC"))
+    # One feature class per table, numbered from the second table of a sheet on
+    counts = {}
+    for name in ("IAC_North", "IAC_South", "IAC_South_2"):
+        with arcpy.da.SearchCursor(os.path.join(output_gdb, name), ["End_point"]) as cursor:
+            counts[name] = [row[0] for row in cursor]
+    assert counts == {"IAC_North": [1, 2], "IAC_South": [3], "IAC_South_2": [4]}
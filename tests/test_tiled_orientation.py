@@ -0,0 +1,41 @@
+"""
+Name: Tests of the tiled orientation
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: The tiled engine of tiled_orientation.py against one untiled run
+of the sweep engine on a random layout cut into many small tiles.
+
+Usage:
+    python -m pytest -q tests
+"""
+
+import numpy as np
+
+from orientation_engine import orient_cables_sweep
+from tiled_orientation import orient_cables_tiled
+
+
+
+#------------ orient_cables_tiled
+
+def test_tiled_orientation_matches_one_run():
+    # 300 cables of 2-5 vertices among 200 WTGs, cut into many small tiles
+    rng = np.random.default_rng(7)
+    wtg_x, wtg_y = rng.uniform(0, 5000, 200), rng.uniform(0, 5000, 200)
+    counts = rng.integers(2, 6, 300)
+    last = np.cumsum(counts) - 1
+    first = last - counts + 1
+    start = rng.integers(0, 200, 300)
+    vertex_x = np.repeat(wtg_x[start], counts) + rng.normal(0, 300, counts.sum()).cumsum() % 400
+    vertex_y = np.repeat(wtg_y[start], counts) + rng.normal(0, 300, counts.sum()).cumsum() % 400
+    radii = [50.0, 150.0]
+
+    tiled = orient_cables_tiled(wtg_x, wtg_y, vertex_x, vertex_y, first, last, radii, workers=1, tile_size=600.0)
+    untiled = orient_cables_sweep(wtg_x, wtg_y, vertex_x, vertex_y, first, last, radii)
+    for radius in radii:
+        assert tiled[radius].keys() == untiled[radius].keys()
+        for key in ("cable", "start_wtg", "end_wtg"):
+            np.testing.assert_array_equal(tiled[radius][key], untiled[radius][key])
+        for key in ("X1", "Y1", "X2", "Y2", "AngleFromNorth"):
+            np.testing.assert_allclose(tiled[radius][key], untiled[radius][key], rtol=1e-9, atol=1e-9)
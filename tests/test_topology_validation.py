@@ -0,0 +1,73 @@
+"""
+Name: Tests of the topology validation
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Hand-computed IAC tables for every issue kind of
+validate_topology, from rows and from cable_columns.
+
+Usage:
+    python -m pytest -q tests
+"""
+
+import numpy as np
+
+from topology_validation import ERROR, WARNING, cable_columns, validate_topology
+
+
+
+#------------ validate_topology
+
+# Start point, Easting, Northing, Depth, End point, Easting, Northing
+STRING = [(0, 0, 0, 30, 1, 100, 0),
+          (1, 100, 0, 30, 2, 200, 0),
+          (2, 200, 0, 30, 3, 300, 0)]
+
+
+def kinds(issues):
+    return sorted((issue.kind, issue.severity, issue.row, issue.node) for issue in issues)
+
+
+def test_topology_clean_string():
+    assert validate_topology(STRING) == []
+
+
+def test_topology_missing_value_and_self_loop():
+    rows = STRING + [(None, 0, 0, 30, 4, 400, 0), (3, 300, 0, 30, 3, 300, 0)]
+    assert kinds(validate_topology(rows)) == [("MISSING_VALUE", ERROR, 4, -1), ("SELF_LOOP", ERROR, 5, 3)]
+
+
+def test_topology_duplicate_edge_in_either_direction():
+    rows = STRING + [(2, 200, 0, 30, 1, 100, 0)]
+    assert kinds(validate_topology(rows)) == [("DUPLICATE_EDGE", ERROR, 4, 1)]
+
+
+def test_topology_fed_twice_closes_a_loop():
+    # 0 -> 1, 0 -> 2, 2 -> 1: WTG 1 is fed twice and the third segment closes the loop 0-1-2
+    rows = [(0, 0, 0, 30, 1, 100, 0), (0, 0, 0, 30, 2, 0, 100), (2, 0, 100, 30, 1, 100, 0)]
+    assert kinds(validate_topology(rows)) == [("FED_TWICE", ERROR, -1, 1), ("LOOP", ERROR, 3, 1)]
+
+
+def test_topology_not_fed_wtg():
+    # 0 -> 1, 2 -> 1, 2 -> 3: the string 2 -> 3 hangs from WTG 2 as from a second source, connected to the OSS
+    rows = [(0, 0, 0, 30, 1, 100, 0), (2, 200, 0, 30, 1, 100, 0), (2, 200, 0, 30, 3, 300, 0)]
+    assert kinds(validate_topology(rows)) == [("FED_TWICE", ERROR, -1, 1), ("NOT_FED", ERROR, -1, 2)]
+
+
+def test_topology_disconnected_and_moved_wtg():
+    # WTGs 5 and 6 have no path to the OSS; WTG 2 is 50 m further north in its second row
+    rows = STRING[:1] + [(1, 100, 0, 30, 2, 200, 0), (2, 200, 50, 30, 3, 300, 0), (5, 500, 0, 30, 6, 600, 0)]
+    issues = validate_topology(rows)
+    assert kinds(issues) == [("COORDINATE_MISMATCH", WARNING, -1, 2), ("DISCONNECTED", ERROR, -1, 5),
+                             ("NOT_FED", ERROR, -1, 5)]
+    assert "2 WTGs" in [issue.detail for issue in issues if issue.kind == "DISCONNECTED"][0]
+
+
+def test_topology_of_cable_columns():
+    # Text in a number column is a missing value, in the rows and in their cable_columns alike
+    rows = STRING + [(3, 300, 0, 30, "x", 400, 0)]
+    columns = cable_columns(rows)
+    assert columns.shape == (4, 7)
+    assert np.isnan(columns[3, 4])
+    assert validate_topology(columns) == validate_topology(rows)
+    assert kinds(validate_topology(columns)) == [("MISSING_VALUE", ERROR, 4, -1)]
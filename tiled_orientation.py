@@ -0,0 +1,132 @@
+"""
+Name: Tiled orientation
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Cable orientation of very large grids (cluster studies with
+several farms, hundreds of thousands of segments) over a process pool. The
+extent is cut into square tiles; every cable belongs to the tile of its
+first vertex, and a tile gets its own cables plus all WTGs within the
+largest buffer size of their ends (the halo). Tiles are oriented
+independently with orient_cables_sweep and the results are mapped back to
+the global cable and WTG numbers. WTGs in a halo are shared by several tiles
+but every cable is measured by exactly one, so merging the tiles in cable
+order gives the rows of one run over the whole grid: the same cables and
+WTGs, the coordinates and angles equal within floating-point tolerance (the
+along-line distances are summed per tile, not over the whole grid).
+
+No arcpy needed, the workers only get NumPy arrays.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from orientation_engine import orient_cables_sweep
+
+# Cables per tile aimed at; the tiling does not depend on the number of workers, so the
+# result is the same whatever pool it ran on (and equal to one untiled run within floating-point tolerance)
+CABLES_PER_TILE = 25000
+
+# Below this many cables the pool costs more than it saves
+MIN_PARALLEL_CABLES = 20000
+
+
+def tile_numbers(xs, ys, tile_size):
+    # Tile of every point, numbered row by row from the lower left corner of the extent
+    ix = np.floor((xs - xs.min()) / tile_size).astype("int64")
+    iy = np.floor((ys - ys.min()) / tile_size).astype("int64")
+    return iy * (int(ix.max()) + 1) + ix
+
+
+def default_tile_size(xs, ys, radius):
+    # About CABLES_PER_TILE cables per tile over the extent, never smaller than the halo
+    extent = max(float(xs.max() - xs.min()), float(ys.max() - ys.min()), 1.0)
+    per_side = max(1, math.ceil(math.sqrt(len(xs) / CABLES_PER_TILE)))
+    return max(extent / per_side, 2.0 * radius)
+
+
+def cable_vertices(first, last):
+    # Vertex indexes of the given cables, back to back, and their new first/last index
+    counts = last - first + 1
+    new_first = np.r_[0, np.cumsum(counts)[:-1]].astype("int64")
+    vertex = np.repeat(first - new_first, counts) + np.arange(int(counts.sum()))
+    return vertex, new_first, new_first + counts - 1
+
+
+def split_tiles(wtg_x, wtg_y, vertex_x, vertex_y, first, last, radius, tile_size):
+    """One job per non-empty tile: (cables, wtgs, arrays of the tile), cables and wtgs as global indexes."""
+    tiles = tile_numbers(vertex_x[first], vertex_y[first], tile_size)
+    order = np.argsort(tiles, kind="stable")
+    starts = np.flatnonzero(np.r_[True, tiles[order][1:] != tiles[order][:-1]]) if len(order) else []
+    bounds = np.r_[starts, len(order)]
+
+    jobs = []
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        cables = np.sort(order[lo:hi])
+        # Halo: every WTG within radius of an end of the cables of the tile
+        end_x = np.r_[vertex_x[first[cables]], vertex_x[last[cables]]]
+        end_y = np.r_[vertex_y[first[cables]], vertex_y[last[cables]]]
+        wtgs = np.flatnonzero((wtg_x >= end_x.min() - radius) & (wtg_x <= end_x.max() + radius)
+                              & (wtg_y >= end_y.min() - radius) & (wtg_y <= end_y.max() + radius))
+        vertex, tile_first, tile_last = cable_vertices(first[cables], last[cables])
+        jobs.append((cables, wtgs, (wtg_x[wtgs], wtg_y[wtgs], vertex_x[vertex], vertex_y[vertex],
+                                    tile_first, tile_last)))
+    return jobs
+
+
+def _orient_tile(arrays, radii):
+    return orient_cables_sweep(*arrays, radii)
+
+
+def merge_tiles(jobs, tile_results, radii):
+    """The results of all tiles as one {radius: result} in global cable and WTG numbers, in cable order."""
+    merged = {}
+    for radius in radii:
+        parts = []
+        for (cables, wtgs, arrays), results in zip(jobs, tile_results):
+            result = dict(results[radius])
+            result["cable"] = cables[result["cable"]]
+            result["start_wtg"] = wtgs[result["start_wtg"]]
+            result["end_wtg"] = np.where(result["end_wtg"] >= 0, wtgs[np.maximum(result["end_wtg"], 0)], -1)
+            parts.append(result)
+        keys = parts[0].keys() if parts else ["cable", "start_wtg", "end_wtg", "X1", "Y1", "X2", "Y2", "AngleFromNorth"]
+        combined = {key: np.concatenate([part[key] for part in parts]) if parts else np.zeros(0) for key in keys}
+        # Cable order, the first end before the last end, as in one run over the whole grid
+        order = np.argsort(combined["cable"], kind="stable")
+        merged[radius] = {key: values[order] for key, values in combined.items()}
+    return merged
+
+
+def orient_cables_tiled(wtg_x, wtg_y, vertex_x, vertex_y, first, last, radii, workers=None, tile_size=None):
+    """orient_cables_sweep over spatial tiles in a process pool. Returns {radius: result} (see orient_cables).
+
+    workers defaults to the number of CPUs; with one worker, or fewer than MIN_PARALLEL_CABLES cables,
+    the tiles are run one after the other in this process. tile_size defaults to about
+    CABLES_PER_TILE cables per tile over the extent.
+    """
+    wtg_x = np.asarray(wtg_x, dtype="float64")
+    wtg_y = np.asarray(wtg_y, dtype="float64")
+    vertex_x = np.asarray(vertex_x, dtype="float64")
+    vertex_y = np.asarray(vertex_y, dtype="float64")
+    first = np.asarray(first, dtype="int64")
+    last = np.asarray(last, dtype="int64")
+    radii = sorted({float(radius) for radius in radii})
+    workers = workers or os.cpu_count() or 1
+    if not len(first):
+        return orient_cables_sweep(wtg_x, wtg_y, vertex_x, vertex_y, first, last, radii)
+
+    tile_size = tile_size or default_tile_size(vertex_x[first], vertex_y[first], radii[-1])
+    jobs = split_tiles(wtg_x, wtg_y, vertex_x, vertex_y, first, last, radii[-1], tile_size)
+
+    if workers == 1 or len(first) < MIN_PARALLEL_CABLES:
+        tile_results = [_orient_tile(arrays, radii) for cables, wtgs, arrays in jobs]
+    else:
+        # Largest tiles first, results come back in job order for a deterministic merge
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            by_size = sorted(range(len(jobs)), key=lambda job: -len(jobs[job][0]))
+            futures = {job: pool.submit(_orient_tile, jobs[job][2], radii) for job in by_size}
+            tile_results = [futures[job].result() for job in range(len(jobs))]
+    return merge_tiles(jobs, tile_results, radii)
@@ -0,0 +1,188 @@
+"""
+Name: Topology validation
+Autor: Andrea Sulova
+Date: 16th Oct 2026
+
+Description: Checks the cable strings of an IAC table before anything is
+exported: missing ids or coordinates, segments from a WTG to itself,
+duplicated segments, loops, WTGs fed by more than one cable or by none,
+groups of WTGs not connected to the OSS and WTGs with different coordinates
+in different rows. Degrees are counted with NumPy and connectivity is tracked with a
+union-find over the segment end points, so the run time stays linear in the
+number of segments (O(n a(n))).
+"""
+
+import os
+from collections import namedtuple
+
+import numpy as np
+
+try:
+    import arcpy
+except ImportError:
+    arcpy = None
+
+OSS_ID = 0
+
+# Start point, Easting, Northing, Depth, End point, Easting, Northing
+CABLE_COLUMNS = 7
+
+ERROR = "ERROR"
+WARNING = "WARNING"
+
+ISSUES_SUFFIX = "_Issues"
+
+# Same WTG id in two rows with coordinates further apart than this (map units) is reported
+COORDINATE_TOLERANCE = 1.0
+
+ISSUE_FIELDS = [("IssueType", "TEXT", "Issue type"), ("Severity", "TEXT", "Severity"),
+                ("TableRow", "LONG", "Row in the table"), ("NodeID", "LONG", "Node ID"), ("Detail", "TEXT", "Detail")]
+
+# One finding; row is the 1-based row of the table (-1 when it concerns a node only)
+Issue = namedtuple("Issue", ["kind", "severity", "row", "node", "detail"])
+
+
+class TopologyError(ValueError):
+    """The cable strings have topology errors; issues holds all findings."""
+
+    def __init__(self, message, issues):
+        super().__init__(message)
+        self.issues = issues
+
+
+class UnionFind:
+    """Disjoint sets over 0..size-1 with path halving and union by size."""
+
+    def __init__(self, size):
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, item):
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a, b):
+        # False when a and b were connected already
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        return True
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def cable_columns(table_rows):
+    """The first seven columns of a "Start point" table (Start point, Easting, Northing, Depth, End point, Easting,
+    Northing) as an (n, 7) float array, from one pass over any iterable of rows.
+
+    Empty cells and text become NaN. 56 bytes per cable, whatever the rows were read from.
+    """
+    values = np.fromiter((tuple(_number(row[i]) if len(row) > i else np.nan for i in range(CABLE_COLUMNS))
+                          for row in table_rows), dtype=("float64", CABLE_COLUMNS))
+    return values.reshape(-1, CABLE_COLUMNS)
+
+
+def validate_topology(table_rows, tolerance=COORDINATE_TOLERANCE):
+    """All topology issues of the rows of a "Start point" table (or their cable_columns), as a list of Issue."""
+    issues = []
+    columns = table_rows if isinstance(table_rows, np.ndarray) else cable_columns(table_rows)
+    start_ids, start_x, start_y = columns[:, 0], columns[:, 1], columns[:, 2]
+    end_ids, end_x, end_y = columns[:, 4], columns[:, 5], columns[:, 6]
+    rows = np.arange(1, len(columns) + 1)
+
+    #----- Rows that cannot be part of the graph at all
+    missing = np.isnan(start_ids) | np.isnan(end_ids) | np.isnan(start_x) | np.isnan(start_y) \
+        | np.isnan(end_x) | np.isnan(end_y)
+    for row in rows[missing].tolist():
+        issues.append(Issue("MISSING_VALUE", ERROR, row, -1, "Start/End point id or coordinates are empty or not a number"))
+
+    self_loop = ~missing & (start_ids == end_ids)
+    for row, node in zip(rows[self_loop].tolist(), start_ids[self_loop].astype("int64").tolist()):
+        issues.append(Issue("SELF_LOOP", ERROR, row, node, f"Segment from {node} to itself"))
+
+    valid = ~missing & ~self_loop
+    rows = rows[valid]
+    start = start_ids[valid].astype("int64")
+    end = end_ids[valid].astype("int64")
+
+    #----- Duplicated segments (in either direction), only the repeats are reported
+    low, high = np.minimum(start, end), np.maximum(start, end)
+    pairs = np.stack([low, high], axis=1)
+    _, first = np.unique(pairs, axis=0, return_index=True)
+    duplicate = np.ones(len(rows), dtype=bool)
+    duplicate[first] = False
+    for row, a, b in zip(rows[duplicate].tolist(), low[duplicate].tolist(), high[duplicate].tolist()):
+        issues.append(Issue("DUPLICATE_EDGE", ERROR, row, a, f"Segment {a} - {b} is in the table more than once"))
+
+    #----- Degree counting: every WTG is fed by exactly one cable
+    node_ids, inverse = np.unique(np.concatenate([start, end]), return_inverse=True)
+    from_index, to_index = inverse[:len(start)], inverse[len(start):]
+    in_degree = np.bincount(to_index[~duplicate], minlength=len(node_ids))
+    for node, count in zip(node_ids[in_degree > 1].tolist(), in_degree[in_degree > 1].tolist()):
+        issues.append(Issue("FED_TWICE", ERROR, -1, node, f"WTG {node} is the End point of {count} segments"))
+    if np.any(node_ids == OSS_ID) and in_degree[np.searchsorted(node_ids, OSS_ID)] > 0:
+        issues.append(Issue("FED_TWICE", ERROR, -1, OSS_ID, "The OSS is the End point of a segment"))
+    # Every node but the OSS is fed: a WTG that is never an End point starts a string of its own
+    not_fed = (in_degree == 0) & (node_ids != OSS_ID)
+    for node in node_ids[not_fed].tolist():
+        issues.append(Issue("NOT_FED", ERROR, -1, node, f"WTG {node} is the End point of no segment, no cable feeds it"))
+
+    #----- Union-find: a segment joining two nodes that are connected already closes a loop
+    sets = UnionFind(len(node_ids))
+    for row, a, b in zip(rows[~duplicate].tolist(), from_index[~duplicate].tolist(), to_index[~duplicate].tolist()):
+        if not sets.union(a, b):
+            issues.append(Issue("LOOP", ERROR, row, int(node_ids[b]),
+                                f"Segment {node_ids[a]} - {node_ids[b]} closes a loop"))
+
+    # Components without the OSS are not connected to the grid
+    roots = np.array([sets.find(i) for i in range(len(node_ids))], dtype="int64")
+    oss_root = roots[np.searchsorted(node_ids, OSS_ID)] if np.any(node_ids == OSS_ID) else -1
+    for root in np.unique(roots[roots != oss_root]).tolist():
+        members = node_ids[roots == root]
+        shown = ", ".join(str(node) for node in members[:10].tolist()) + (" ..." if len(members) > 10 else "")
+        issues.append(Issue("DISCONNECTED", ERROR, -1, int(members[0]),
+                            f"{len(members)} WTGs not connected to the OSS: {shown}"))
+
+    #----- The same id with different coordinates in different rows
+    xs = np.concatenate([start_x[valid], end_x[valid]])
+    ys = np.concatenate([start_y[valid], end_y[valid]])
+    spread_x = np.zeros(len(node_ids))
+    spread_y = np.zeros(len(node_ids))
+    # Spread = max - min of the coordinates per node, via reduceat on the sorted ids
+    order = np.argsort(inverse, kind="stable")
+    offsets = np.flatnonzero(np.r_[True, np.diff(inverse[order]) != 0])
+    if len(order):
+        spread_x = np.maximum.reduceat(xs[order], offsets) - np.minimum.reduceat(xs[order], offsets)
+        spread_y = np.maximum.reduceat(ys[order], offsets) - np.minimum.reduceat(ys[order], offsets)
+    moved = np.hypot(spread_x, spread_y) > tolerance
+    for node, distance in zip(node_ids[moved].tolist(), np.hypot(spread_x, spread_y)[moved].tolist()):
+        issues.append(Issue("COORDINATE_MISMATCH", WARNING, -1, node,
+                            f"Coordinates of {node} differ by {distance:.1f} m between rows"))
+    return issues
+
+
+def write_issues(issues, output_gdb, output_fc):
+    """Store the issues as the table <output_fc>_Issues (removed when there are none). Returns its path or None."""
+    issues_path = os.path.join(output_gdb, output_fc + ISSUES_SUFFIX)
+    if arcpy.Exists(issues_path):
+        arcpy.management.Delete(issues_path)
+    if not issues:
+        return None
+    arcpy.management.CreateTable(output_gdb, output_fc + ISSUES_SUFFIX)
+    arcpy.management.AddFields(issues_path, [list(field) for field in ISSUE_FIELDS])
+    with arcpy.da.InsertCursor(issues_path, [field[0] for field in ISSUE_FIELDS]) as cursor:
+        for issue in issues:
+            cursor.insertRow([issue.kind, issue.severity, issue.row, issue.node, issue.detail])
+    return issues_path